@@ -69,39 +69,40 @@ class BotExecutor(Bot):
         wait_cnt = 0
 
         while True:
-            # Course-specific waiting tile – throttle actions when in a waiting state
-            if self._get_color_tile(self.cfg.wait_tile.value):
-                self.log.debug('Still waiting...')
-                time.sleep(1)
-                wait_cnt += 1
-                if wait_cnt > self.cfg.wait_check_limit.value:
+            with self.tick():
+                # Course-specific waiting tile – throttle actions when in a waiting state
+                if self._get_color_tile(self.cfg.wait_tile.value):
+                    self.log.debug('Still waiting...')
+                    time.sleep(1)
+                    wait_cnt += 1
+                    if wait_cnt > self.cfg.wait_check_limit.value:
+                        wait_cnt = 0
+                        continue
+                else:
                     wait_cnt = 0
+
+                # Safety timeout
+                self._timeout_check(start)
+
+                # Propose framework-driven break
+                self.control.propose_break()
+
+                # Attempt next obstacle
+                if self._click_tile(self.cfg.next_tile.value, self.cfg.action_keywords.value):
+                    fails = 0
+                    self._maybe_sleep()
                     continue
-            else:
-                wait_cnt = 0
-
-            # Safety timeout
-            self._timeout_check(start)
-
-            # Propose framework-driven break
-            self.control.propose_break()
-
-            # Attempt next obstacle
-            if self._click_tile(self.cfg.next_tile.value, self.cfg.action_keywords.value):
-                fails = 0
-                self._maybe_sleep()
-                continue
-            else:
-                fails += 1
-                if fails % 2 == 0:
-                    self.client.move_off_window()
-                if fails > self.cfg.fail_max.value:
-                    self.log.error('Too many failures in a row; stopping agility loop.')
-                    return
-                time.sleep(1)
-
-            # Try to pick up mark of grace opportunistically
-            self._click_tile(self.cfg.grace_tile.value, ['take', 'grace'])
+                else:
+                    fails += 1
+                    if fails % 2 == 0:
+                        self.client.move_off_window()
+                    if fails > self.cfg.fail_max.value:
+                        self.log.error('Too many failures in a row; stopping agility loop.')
+                        return
+                    time.sleep(1)
+
+                # Try to pick up mark of grace opportunistically
+                self._click_tile(self.cfg.grace_tile.value, ['take', 'grace'])
 
     # --- Internals ---
     def _get_color_tile(self, tile_color, tol=None):
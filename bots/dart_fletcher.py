@@ -126,8 +126,7 @@ class BotExecutor(Bot):
     def ensure_inventory_tab(self):
         """Ensure we're on the inventory tab"""
         try:
-            current_tab = self.client.toolplane.get_active_tab(self.client.get_screenshot())
-            if current_tab != ToolplaneTab.INVENTORY:
+            if self.client.active_tab() != ToolplaneTab.INVENTORY.value:
                 self.client.click_toolplane(ToolplaneTab.INVENTORY)
                 time.sleep(0.5)
         except Exception as e:
@@ -81,8 +81,7 @@ class BotExecutor(Bot):
         return natty_count, item_count
     
     def get_active_tab(self) -> ToolplaneTab:
-        tab = self.client.toolplane.get_active_tab(self.client.get_screenshot())
-        return tab
+        return self.client.active_tab()
     
     def get_overlap_point(self):
         try:
@@ -188,13 +188,20 @@ class BotExecutor(Bot):
         def crafted_so_far() -> int:
             return max(0, self._inv_count(self.cfg.result_item_name.value) - result_before)
 
+        # taken before each count, so a craft landing mid-count still shows as a change
+        baseline = self.client.inventory_occupancy()
         crafted = crafted_so_far()
         while crafted < target_pairs:
             if time.time() - start_time > max_wait:
                 self.log.error("Crafting timed out.")
                 return False
             self.log.info(f"Crafted {crafted}/{target_pairs} so far")
-            time.sleep(3)
+            # only recount (template/hash scan) once some slot actually changed
+            if not self.client.wait_for_inventory_change(timeout=3, baseline=baseline):
+                if time.time() - last_progress > stall_timeout:
+                    return False
+                continue
+            baseline = self.client.inventory_occupancy()
             new_crafted = crafted_so_far()
             if new_crafted > crafted:
                 crafted = new_crafted
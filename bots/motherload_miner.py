@@ -93,17 +93,18 @@ class BotExecutor(Bot):
                 # Mine and deposit cycle (repeat X times)
                 for cycle in range(self.loop_cnt):
                     self.log.info(f"Starting mining cycle {cycle+1}/{self.loop_cnt}")
-                    if not self.mine_until_full():
-                        self.log.warning("Failed to complete mining cycle. Trying to recover...")
-                        if not self.detect_location() or not self.upstairs:
-                            self.log.error("Unable to continue mining. Restarting mining cycle.")
-                            break
-                    
-                    if not self.deposit_paydirt():
-                        self.log.warning("Failed to deposit pay-dirt. Trying to recover...")
-                        if not self.detect_location() or not self.upstairs:
-                            self.log.error("Unable to deposit pay-dirt. Restarting mining cycle.")
-                            break
+                    with self.tick('mining_cycle'):
+                        if not self.mine_until_full():
+                            self.log.warning("Failed to complete mining cycle. Trying to recover...")
+                            if not self.detect_location() or not self.upstairs:
+                                self.log.error("Unable to continue mining. Restarting mining cycle.")
+                                break
+
+                        if not self.deposit_paydirt():
+                            self.log.warning("Failed to deposit pay-dirt. Trying to recover...")
+                            if not self.detect_location() or not self.upstairs:
+                                self.log.error("Unable to deposit pay-dirt. Restarting mining cycle.")
+                                break
                 
                 # After X cycles, go down to collect and bank
                 if not self.climb_down_ladder():
@@ -115,12 +116,13 @@ class BotExecutor(Bot):
                 # Search sack, bank, climb up - repeat X times
                 for cycle in range(self.loop_cnt):
                     self.log.info(f"Starting banking cycle {cycle+1}/{self.loop_cnt}")
-                    if not self.search_sack():
-                        raise RuntimeError("Failed to search sack for processed ore")
-                    
-                    if not self.bank_ore():
-                        self.log.warning("Failed to bank ore. Trying to recover...")
-                        raise RuntimeError("Banking failed")
+                    with self.tick('banking_cycle'):
+                        if not self.search_sack():
+                            raise RuntimeError("Failed to search sack for processed ore")
+
+                        if not self.bank_ore():
+                            self.log.warning("Failed to bank ore. Trying to recover...")
+                            raise RuntimeError("Banking failed")
                     
                 if not self.climb_up_ladder():
                     self.log.warning("Failed to climb up ladder. Trying to recover...")
@@ -275,7 +277,11 @@ class BotExecutor(Bot):
             # Make sure inventory tab is active
             self.client.click_toolplane(ToolplaneTab.INVENTORY)
             time.sleep(0.5)
-            
+
+            # Fewer than 27 filled slots can't hold 27 Pay-dirt
+            if self.client.inventory_occupancy().occupied < 27:
+                return False
+
             # Get all Pay-dirt in inventory
             pay_dirt = self.client.get_inv_items(["Pay-dirt"], min_confidence=0.9)
             count = len(pay_dirt)
@@ -191,7 +191,11 @@ class BotExecutor(Bot):
             # Click inventory tab to ensure we can see items
             self.client.click_toolplane(ToolplaneTab.INVENTORY)
             time.sleep(0.5)
-            
+
+            # Cheap occupancy check first; only identify items when it could be full
+            if self.client.inventory_occupancy().occupied < self.cfg.inv_full_at.value:
+                return False
+
             # Try to find logs in inventory
             logs = self.client.get_inv_items([self.cfg.log_type.value], min_confidence=0.9)
             
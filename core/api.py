@@ -1,9 +1,12 @@
-from flask import Flask, jsonify, request, send_file
+from flask import Flask, jsonify, request, send_file, Response
 from flask_cors import CORS
 import time
 import io
 import threading
 from core.control import ScriptControl
+from core import tracing
+from core import profiler
+from core import cv_debug
 from core.logger import get_logger
 
 class BotAPI:
@@ -12,6 +15,7 @@ class BotAPI:
         CORS(self.app)  # Enable CORS for all routes
         self.control = ScriptControl()
         self.client = client  # Reference to RuneLiteClient instance
+        self.startup = None  # StartupGraph that built the bot, if any
         self.log = get_logger("API")
         self.start_time = time.time()
         self.thread = None
@@ -79,17 +83,94 @@ class BotAPI:
                 'started_at': self.start_time
             })
     
+        # Perception snapshot endpoint (never captures or OCRs)
+        @self.app.route('/api/state', methods=['GET'])
+        def get_state():
+            """
+            Latest published client perception.
+            Send If-None-Match with the last ETag and ?wait=N to long-poll
+            up to N seconds for a newer snapshot (304 if nothing changed).
+            """
+            if not self.client:
+                return jsonify({'error': 'Client not available'}), 503
+            state = self.client.state
+            wait = min(request.args.get('wait', 0, type=float), 60)
+            etag = request.headers.get('If-None-Match', '').strip('"')
+            if etag.isdigit() and int(etag) >= state.version:
+                if not wait or not state.wait_for_change(int(etag), wait):
+                    return Response(status=304, headers={'ETag': f'"{state.version}"'})
+            body = state.to_dict()
+            resp = jsonify(body)
+            resp.headers['ETag'] = f'"{body["version"]}"'
+            resp.headers['Cache-Control'] = 'no-cache'
+            return resp
+
+        # Metrics endpoint
+        @self.app.route('/api/metrics', methods=['GET'])
+        def get_metrics():
+            if not self.client:
+                return jsonify({'error': 'Client not available'}), 503
+            metrics = {
+                'executor': self.client.executor.stats(),
+                'focus': dict(self.client.focus_stats),
+            }
+            if self.startup:
+                metrics['startup'] = self.startup.report()
+                if self.client.first_action_at and self.startup.started_at:
+                    metrics['startup']['time_to_first_action'] = \
+                        self.client.first_action_at - self.startup.started_at
+            return jsonify(metrics)
+
+        # Tracing endpoint
+        @self.app.route('/api/trace', methods=['GET'])
+        def get_trace():
+            """Chrome/Perfetto trace of recent spans. ?seconds=N limits the window, ?clear=1 resets."""
+            seconds = request.args.get('seconds', type=float)
+            trace = tracing.export_chrome(seconds)
+            if request.args.get('clear', '0') == '1':
+                tracing.clear()
+            return jsonify(trace)
+
+        @self.app.route('/api/trace', methods=['POST'])
+        def set_trace():
+            if request.json.get('enabled', True):
+                tracing.enable()
+            else:
+                tracing.disable()
+            return jsonify({'enabled': tracing.is_enabled()})
+    
+        # Profiling endpoint
+        @self.app.route('/api/profile', methods=['POST'])
+        def run_profile():
+            """
+            Sample all thread stacks for ?seconds=N (default 5).
+            ?interval=ms sets the sample period, ?top=N the table size,
+            ?format=collapsed returns plain flamegraph input.
+            """
+            seconds = request.args.get('seconds', 5, type=float)
+            interval = request.args.get('interval', 5, type=float) / 1000
+            top_n = request.args.get('top', 25, type=int)
+            try:
+                result = profiler.sample(seconds, interval)
+            except RuntimeError as e:
+                return jsonify({'error': str(e)}), 409
+            if request.args.get('format') == 'collapsed':
+                return Response(result.collapsed(), mimetype='text/plain')
+            return jsonify(result.to_dict(top_n))
+    
     def start(self, port=5432):
         """Start the API server in a background thread"""
         if self.thread and self.thread.is_alive():
             self.log.warning("API server is already running")
             return
             
+        cv_debug.disable_flask_logging()
+
         def run_server():
             self.log.info(f"Starting API server on port {port}")
             self.app.run(host='0.0.0.0', port=port, threaded=True)
             
-        self.thread = threading.Thread(target=run_server, daemon=True)
+        self.thread = threading.Thread(target=run_server, name='api-server', daemon=True)
         self.thread.start()
         
     def stop(self):
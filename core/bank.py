@@ -2,23 +2,114 @@ from core.osrs_client import RuneLiteClient
 from core.item_db import ItemLookup
 from core import tools
 from core import ocr
+from core import templates
 from core.logger import get_logger
+from core.inventory import IconIndex
+from core.region_match import MatchResult
 from PIL import Image
+import numpy as np
 import keyboard
 from core.input.mouse_control import ClickType
 import time
 import random
-from typing import List
+from dataclasses import dataclass
+from functools import cached_property
+from typing import List, Optional, Tuple
 
 # load into memory now for faster loads
-BANK_BR = Image.open('data/ui/bank-bottom-right.png')
-BANK_TL = Image.open('data/ui/bank-top-left.png')
-BANK_DEPO_INV = Image.open('data/ui/bank-deposit-inv.png')
-BANK_SEARCH = Image.open('data/ui/bank-search.png')
-BANK_CLOSE = Image.open('data/ui/close-ui-element.png')
-BANK_TAB = Image.open('data/ui/bank-tab.png')
-BANK_ARROW_UP = Image.open('data/ui/bank-scroll-up.png')
-BANK_ARROW_DOWN = BANK_ARROW_UP.rotate(180)
+# template paths; decoded on first use through core.templates
+BANK_BR = 'data/ui/bank-bottom-right.png'
+BANK_TL = 'data/ui/bank-top-left.png'
+BANK_DEPO_INV = 'data/ui/bank-deposit-inv.png'
+BANK_SEARCH = 'data/ui/bank-search.png'
+BANK_CLOSE = 'data/ui/close-ui-element.png'
+BANK_TAB = 'data/ui/bank-tab.png'
+BANK_ARROW_UP = 'data/ui/bank-scroll-up.png'
+
+# visible item grid, relative to the BANK_TL match
+BANK_COLS = 8
+BANK_SLOT_W, BANK_SLOT_H = 36, 32
+BANK_PITCH_X, BANK_PITCH_Y = 48, 36
+BANK_GRID_OFFSET = (51, 77)
+# space below the last visible row (search / deposit buttons)
+BANK_GRID_BOTTOM = 40
+# mean per-channel difference allowed when re-checking the corners at known bounds
+CORNER_TOLERANCE = 8
+
+
+@dataclass(frozen=True)
+class BankSlot:
+    index: int                      # row-major among the visible slots
+    match: MatchResult              # slot rectangle in window coordinates
+    item_id: Optional[int] = None
+    name: Optional[str] = None
+    confidence: float = 0.0
+
+
+class BankView:
+    """
+    One capture of the bank: bounds, tab buttons and the visible slot grid.
+    Slots are identified through the icon-hash index on first use, so a view
+    that is only asked `is_open` costs a corner check.
+    """
+
+    def __init__(
+            self,
+            frame: Image.Image,
+            bounds: Optional[MatchResult],
+            tabs: Tuple[MatchResult, ...],
+            slot_rects: Tuple[MatchResult, ...],
+            index: Optional[IconIndex]
+        ):
+        self.frame = frame
+        self.bounds = bounds
+        self.tabs = tabs
+        self.slot_rects = slot_rects
+        self.timestamp = time.time()
+        self._index = index
+
+    @property
+    def is_open(self) -> bool:
+        return self.bounds is not None
+
+    @property
+    def grid_bounds(self) -> Optional[MatchResult]:
+        if not self.slot_rects:
+            return None
+        first, last = self.slot_rects[0], self.slot_rects[-1]
+        return MatchResult(first.start_x, first.start_y, last.end_x, last.end_y)
+
+    @cached_property
+    def slots(self) -> Tuple[BankSlot, ...]:
+        if not self.slot_rects or self._index is None:
+            return ()
+        rgb = np.asarray(self.frame)
+        out = []
+        for i, rect in enumerate(self.slot_rects):
+            item, score = self._index.identify(rgb[rect.start_y:rect.end_y, rect.start_x:rect.end_x])
+            if item is None:
+                out.append(BankSlot(i, rect, confidence=score))
+            else:
+                out.append(BankSlot(i, rect, item.id, item.name, score))
+        return tuple(out)
+
+    def find(self, item: str | int) -> List[BankSlot]:
+        resolved = ItemLookup().get_item(item)
+        if not resolved:
+            return []
+        return [s for s in self.slots if s.item_id == resolved.id]
+
+    def locate(self, item: str | int) -> Optional[MatchResult]:
+        """Slot rectangle of the first visible stack of `item`, or None."""
+        found = self.find(item)
+        return found[0].match.copy() if found else None
+
+    def count(self, item: str | int) -> Optional[int]:
+        """Stack count of `item` from this frame; None when it isn't visible or unreadable."""
+        found = self.find(item)
+        if not found:
+            return None
+        return ocr.read_stack_count(self.frame, found[0].match)
 
 class BankInterface:
     def __init__(self,client:RuneLiteClient,itemdb:ItemLookup):
@@ -27,14 +118,76 @@ class BankInterface:
         self.bank_match: tools.MatchResult = None
         self.last_custom_quanity = 0
         self.log = get_logger('bank')
+        # bounds/tabs are stable while the window layout is unchanged
+        self._geometry_key = None
+        self._tabs: Tuple[MatchResult, ...] = ()
+        self._align: Tuple[int, int] = (0, 0)
 
     @property
     def is_open(self):
-        try:
-            self.get_match()
-            return True
-        except:
-            return False
+        return self.view().is_open
+
+    def view(self, sc: Image.Image = None) -> BankView:
+        """
+        Capture once and describe the bank. Bounds found by a full template
+        search are re-checked cheaply (corner pixels only) on later calls; the
+        bank always opens in the same place for a given layout, so failing that
+        check means it is closed.
+        """
+        sc = sc or self.client.get_screenshot()
+        known = self._geometry_key is not None and self._geometry_key[0] == self.client.layout_version
+        bounds = self._cached_bounds(sc) if known else None
+        if bounds is None and known:
+            return BankView(sc, None, (), (), None)
+        if bounds is None:
+            try:
+                bounds = self.get_match(sc)
+            except ValueError:
+                return BankView(sc, None, (), (), None)
+            self._geometry_key = (self.client.layout_version, bounds.start_x, bounds.start_y,
+                                  bounds.end_x, bounds.end_y)
+            self._tabs = tuple(self._find_tabs(sc))
+        return BankView(sc, bounds, self._tabs, self._slot_rects(bounds),
+                        self.client.inventory.build_index())
+
+    def _cached_bounds(self, sc: Image.Image) -> Optional[MatchResult]:
+        b = self.bank_match
+        tl, br = templates.get(BANK_TL), templates.get(BANK_BR)
+        if (self._corner_diff(sc, tl, b.start_x, b.start_y) > CORNER_TOLERANCE or
+                self._corner_diff(sc, br, b.end_x - br.width, b.end_y - br.height) > CORNER_TOLERANCE):
+            return None
+        return b
+
+    @staticmethod
+    def _corner_diff(sc: Image.Image, template: Image.Image, x: int, y: int) -> float:
+        if x < 0 or y < 0 or x + template.width > sc.width or y + template.height > sc.height:
+            return float('inf')
+        crop = np.asarray(sc.crop((x, y, x + template.width, y + template.height)).convert('RGB'), dtype=np.int16)
+        return float(np.abs(crop - np.asarray(template.convert('RGB'), dtype=np.int16)).mean())
+
+    def _slot_rects(self, bounds: MatchResult) -> Tuple[MatchResult, ...]:
+        x0 = bounds.start_x + BANK_GRID_OFFSET[0] + self._align[0]
+        y0 = bounds.start_y + BANK_GRID_OFFSET[1] + self._align[1]
+        rows = max(0, (bounds.end_y - BANK_GRID_BOTTOM - y0) // BANK_PITCH_Y)
+        return tuple(
+            MatchResult(
+                x0 + c * BANK_PITCH_X, y0 + r * BANK_PITCH_Y,
+                x0 + c * BANK_PITCH_X + BANK_SLOT_W, y0 + r * BANK_PITCH_Y + BANK_SLOT_H
+            )
+            for r in range(rows) for c in range(BANK_COLS)
+        )
+
+    def _realign(self, item_match: MatchResult, icon_offset: Tuple[int, int], top_crop: int):
+        """Nudge the grid onto a slot found by template search when BANK_GRID_OFFSET is off."""
+        x0 = self.bank_match.start_x + BANK_GRID_OFFSET[0] + self._align[0]
+        y0 = self.bank_match.start_y + BANK_GRID_OFFSET[1] + self._align[1]
+        rx = item_match.start_x - icon_offset[0] - x0
+        ry = item_match.start_y - top_crop - icon_offset[1] - y0
+        dx = (rx + BANK_PITCH_X // 2) % BANK_PITCH_X - BANK_PITCH_X // 2
+        dy = (ry + BANK_PITCH_Y // 2) % BANK_PITCH_Y - BANK_PITCH_Y // 2
+        if (dx or dy) and abs(dx) <= 6 and abs(dy) <= 6:
+            self._align = (self._align[0] + dx, self._align[1] + dy)
+            self.log.info(f'Bank grid realigned by ({dx}, {dy}) -> {self._align}')
         
     @property
     def bank_sc(self) -> Image.Image:
@@ -51,7 +204,7 @@ class BankInterface:
     def deposit_inv(self):
         if not self.is_open: raise ValueError('Bank is not open')
         btn = self.client.find_in_window(
-            BANK_DEPO_INV, min_scale=1,max_scale=1
+            templates.get(BANK_DEPO_INV), min_scale=1,max_scale=1
         )
         if btn.confidence > .9:
             self.client.click(btn)
@@ -59,7 +212,7 @@ class BankInterface:
     def search(self, item_name:str):
         if not self.is_open: raise ValueError('Bank is not open')
         search_box = self.client.find_in_window(
-            BANK_SEARCH, min_scale=1,max_scale=1
+            templates.get(BANK_SEARCH), min_scale=1,max_scale=1
         )
         if search_box.confidence > .9:
             time.sleep(random.uniform(1,1.3))
@@ -70,7 +223,7 @@ class BankInterface:
     def close(self):
         if not self.is_open: return
         close_btn = self.client.find_in_window(
-            BANK_CLOSE, min_scale=1,max_scale=1
+            templates.get(BANK_CLOSE), min_scale=1,max_scale=1
         )
         if close_btn.confidence > .9:
             while self.is_open:
@@ -85,14 +238,19 @@ class BankInterface:
         hover_verify:bool=True
         
         ) -> int:
-        if not self.is_open: raise ValueError('Bank is not open')
+        view = self.view()
+        if not view.is_open: raise ValueError('Bank is not open')
+        sc = view.frame
 
-        sc = self.client.get_screenshot()
-        
         item = self.itemdb.get_item(item_id) # verify it exists
         
         if not item: raise ValueError(f'Item {item_id} not found in itemdb')
 
+        if not hover_verify and view.find(item.id):
+            count = view.count(item.id)
+            if count is not None:
+                return count
+
         item_match = self.client.smart_find_item(
             item=item,
             parent_match=self.bank_match,
@@ -117,19 +275,27 @@ class BankInterface:
                 match, click_type=ClickType.RIGHT, 
                 after_click_settle_chance=0, rand_move_chance=0
             )
+            menu = self.client.context_menu
             if amount == 5:
-                self.client.choose_right_click_opt(f'{action}-5')
+                menu.choose(f'{action}-5')
             elif amount == 10:
-                self.client.choose_right_click_opt(f'{action}-10')
+                menu.choose(f'{action}-10')
             elif amount == -1:
-                self.client.choose_right_click_opt(f'{action}-All')
+                menu.choose(f'{action}-All')
             else:
-                if self.last_custom_quanity == amount:
+                # the menu lists the last custom amount; read it rather than trusting memory
+                options = menu.read()
+                custom = menu.find(options, f'{action}-{amount}', exact=True)
+                if custom is not None:
                     self.log.info(f'Custom quantity match - {amount}')
-                    self.client.choose_right_click_opt(f'{action}-{amount}')
+                    self.client.click(custom.match, rand_move_chance=0)
+                    self.last_custom_quanity = amount
                 else:
                     self.log.info(f'Withdrawing custom amount: {amount}')
-                    self.client.choose_right_click_opt(f'{action}-X')
+                    x_opt = menu.find(options, f'{action}-X')
+                    if x_opt is None:
+                        raise ValueError(f'Option "{action}-X" not in menu: {[o.text for o in options]}')
+                    self.client.click(x_opt.match, rand_move_chance=0)
                     time.sleep(random.uniform(1,1.3))
                     keyboard.write(str(amount),delay=.2)
                     keyboard.press('enter')
@@ -137,11 +303,14 @@ class BankInterface:
 
                 
     def get_bank_tabs(self) -> List[tools.MatchResult]:
-        if not self.is_open: raise ValueError('Bank is not open')
-        
+        view = self.view()
+        if not view.is_open: raise ValueError('Bank is not open')
+        return list(view.tabs)
+
+    def _find_tabs(self, sc: Image.Image) -> List[tools.MatchResult]:
         matches = tools.find_subimages(
-            self.bank_match.crop_in(self.client.get_screenshot()),
-            BANK_TAB,
+            self.bank_match.crop_in(sc),
+            templates.get(BANK_TAB),
             min_scale=1,max_scale=1,
             min_confidence=.99
         )
@@ -166,23 +335,31 @@ class BankInterface:
 
         if not item: raise ValueError(f'Item {item_id} not found in itemdb')
 
-        item_ico = item.icon.crop((0,13,item.icon.width,item.icon.height))
+        view = self.view()
+        if not view.is_open: raise ValueError('Bank is not open')
 
-        item_match = self.client.find_in_window(
-            item_ico,
-            min_scale=.9,
-            max_scale=1.1,
-            min_confidence=.1,
-            sub_match=self.bank_match
-        )
-        self.client.move_to(
-            item_match
-        )
-        likelihood = self.client.compare_hover_match(item.name)
+        # identified by icon hash + pixel verification; no hover round trip needed
+        item_match = view.locate(item.id)
+        if item_match is None:
+            top_crop = 13
+            item_ico = item.icon.crop((0,top_crop,item.icon.width,item.icon.height))
+            item_match = self.client.find_in_window(
+                item_ico,
+                view.frame,
+                min_scale=1,
+                max_scale=1,
+                min_confidence=.1,
+                sub_match=view.grid_bounds or self.bank_match
+            )
+            self.client.move_to(
+                item_match
+            )
+            likelihood = self.client.compare_hover_match(item.name)
 
-        self.log.info(f'Item {item.name} likelihood: {likelihood:.2f}')
-        if likelihood < .6:
-            raise ValueError(f'Item {item.name} not found in bank')
+            self.log.info(f'Item {item.name} likelihood: {likelihood:.2f}')
+            if likelihood < .6:
+                raise ValueError(f'Item {item.name} not found in bank')
+            self._realign(item_match, item.icon_offset, top_crop)
         
         # self.client.click(
         #     item_match,click_type=ClickType.RIGHT,
@@ -196,10 +373,11 @@ class BankInterface:
 
 
 
-    def get_match(self) -> tools.MatchResult:
-        sc = self.client.get_screenshot()
-        tl = self.client.find_in_window(BANK_TL, sc, min_scale=1,max_scale=1)
-        br = self.client.find_in_window(BANK_BR, sc, min_scale=1,max_scale=1)
+    def get_match(self, sc: Image.Image = None) -> tools.MatchResult:
+        """Full-window search for the bank corners. Raises ValueError when closed."""
+        sc = sc or self.client.get_screenshot()
+        tl = self.client.find_in_window(templates.get(BANK_TL), sc, min_scale=1,max_scale=1)
+        br = self.client.find_in_window(templates.get(BANK_BR), sc, min_scale=1,max_scale=1)
 
         for m in [tl,br]:
             if m.confidence < .96:
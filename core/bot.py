@@ -6,18 +6,47 @@ from bots.core.cfg_types import BreakCfgParam
 from core.movement import MovementOrchestrator
 from core.api import BotAPI
 from core.logger import get_logger
+from core.startup import StartupGraph
+from core import tracing, templates
 
 class Bot:
     def __init__(self, user='', break_cfg: BreakCfgParam = None):
         self.log = get_logger("Bot")
-        self.client = RuneLiteClient(user)
-        self.itemdb = ItemLookup()
-        self.bank = BankInterface(self.client, self.itemdb)
-        self.mover = MovementOrchestrator(self.client)
         self.control = ScriptControl()
+        self.control.start_listener()
+        self.tick_cnt = 0
+
+        def start_api():
+            api = BotAPI()
+            api.start(port=5432)
+            return api
+
+        # independent stages run concurrently; the client only waits on template decoding
+        self.startup = StartupGraph('Bot')
+        self.startup.add('itemdb', ItemLookup)
+        self.startup.add('templates', templates.preload)
+        self.startup.add('api', start_api)
+        self.startup.add('client', lambda _: RuneLiteClient(user), deps=('templates',))
+        self.startup.add('bank', BankInterface, deps=('client', 'itemdb'))
+        self.startup.add('mover', MovementOrchestrator, deps=('client',))
+        self.startup.add('inventory', lambda client, _: client.inventory.build_index(), deps=('client', 'itemdb'))
+        stages = self.startup.run()
+
+        self.client: RuneLiteClient = stages['client']
+        self.itemdb: ItemLookup = stages['itemdb']
+        self.bank: BankInterface = stages['bank']
+        self.mover: MovementOrchestrator = stages['mover']
+        self.api: BotAPI = stages['api']
+        self.api.client = self.client
+        self.api.startup = self.startup
 
         if break_cfg:
             self.control.break_config = break_cfg
-        
-        self.api = BotAPI(self.client)
-        self.api.start(port=5432)
\ No newline at end of file
+
+    def tick(self, name: str = 'tick', **args):
+        """
+        Open a trace span for one iteration of a bot loop.
+        Client calls made inside the `with` block are recorded as children.
+        """
+        self.tick_cnt += 1
+        return tracing.span(name, cat='tick', tick=self.tick_cnt, **args)
@@ -0,0 +1,246 @@
+"""
+Incremental reader for the chat box.
+
+Chat messages sit on fixed-height lines, so the chat sector is cut into line
+bands counted up from the input line. Each band is digested and only OCR'd
+when its pixels are new (a message scrolling up one band reuses the text
+memoized for its pixels). The visible lines are diffed against the previous
+read and only the lines that arrived since are appended to a timestamped,
+rolling history, so waits look at new lines instead of rescanning the box.
+
+Anything drawn over the messages (NPC dialogue, another chat tab, scrolling)
+replaces every line at once. So the diff is taken against each recently seen
+screen of lines, and the smallest arrival wins: when the overlay goes away,
+the messages come back matching the screen from before it and only lines
+that really arrived meanwhile are recorded.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Deque, List, Optional, Pattern, Tuple, Union, TYPE_CHECKING
+
+import numpy as np
+from PIL import Image
+
+from core import ocr, textmatch
+from core.logger import get_logger
+from core.region_match import MatchResult
+from core.tools import text_similarity, timeit
+
+if TYPE_CHECKING:
+    from core.osrs_client import RuneLiteClient
+
+# default chat font line pitch, and the box's insets around the message lines
+LINE_H = 14
+TEXT_LEFT, TEXT_TOP = 6, 6
+# input line and tab buttons below the last message line
+BOTTOM_PAD = 38
+# per-channel spread below which a band holds no text
+BLANK_SPREAD = 24
+HISTORY = 500
+# earlier screens of lines kept to diff against, and for how long
+RECENT_SCREENS = 8
+RECENT_FOR = 300.0
+MEMO_SIZE = 256
+
+
+@dataclass(frozen=True)
+class ChatLine:
+    seq: int
+    text: str
+    timestamp: float
+
+
+class ChatReader:
+    """Reads the chat box of a RuneLiteClient into a rolling line history."""
+
+    def __init__(self, client: 'RuneLiteClient', history: int = HISTORY):
+        self.client = client
+        self.log = get_logger('ChatReader')
+        self.history: Deque[ChatLine] = deque(maxlen=history)
+        self._lock = threading.Lock()
+        self._bands_key = None
+        self._bands: List[MatchResult] = []
+        self._digests: List[int] = []
+        self._visible: List[str] = []
+        # (band digests, lines, when last shown) of recently seen screens
+        self._recent: Deque[Tuple[Tuple[int, ...], List[str], float]] = deque(maxlen=RECENT_SCREENS)
+        self._memo: 'OrderedDict[int, str]' = OrderedDict()
+        self._seq = 0
+        self.stats = {'reads': 0, 'ocr': 0, 'memo_hits': 0}
+
+    @property
+    def last_seq(self) -> int:
+        return self._seq
+
+    def _layout(self) -> List[MatchResult]:
+        """Line bands relative to the chat sector, top to bottom."""
+        key = self.client.layout_version
+        if self._bands_key != key:
+            chat = self.client.sectors.chat
+            w, h = chat.end_x - chat.start_x, chat.end_y - chat.start_y
+            bottom = h - BOTTOM_PAD
+            n = max(0, (bottom - TEXT_TOP) // LINE_H)
+            self._bands = [
+                MatchResult(TEXT_LEFT, bottom - (n - i) * LINE_H, w - TEXT_LEFT, bottom - (n - i - 1) * LINE_H)
+                for i in range(n)
+            ]
+            self._digests = []
+            self._bands_key = key
+        return self._bands
+
+    def _band_text(self, band: Image.Image) -> str:
+        rgb = np.asarray(band)
+        if int(rgb.max()) - int(rgb.min()) < BLANK_SPREAD:
+            return ''
+        digest = hash(band.tobytes())
+        text = self._memo.get(digest)
+        if text is not None:
+            self._memo.move_to_end(digest)
+            self.stats['memo_hits'] += 1
+            return text
+        self.stats['ocr'] += 1
+        text = ocr.execute(
+            band,
+            font=ocr.FontChoice.RUNESCAPE_PLAIN_12,
+            psm=ocr.TessPsm.SINGLE_LINE,
+            raise_on_blank=False,
+            preprocess=True
+        ).strip()
+        self._memo[digest] = text
+        if len(self._memo) > MEMO_SIZE:
+            self._memo.popitem(last=False)
+        return text
+
+    @staticmethod
+    def _arrived(old: List[str], new: List[str]) -> List[str]:
+        """Lines of `new` after the longest tail of `old` it starts with."""
+        for k in range(len(old) + 1):
+            overlap = len(old) - k
+            if old[k:] == new[:overlap]:
+                return new[overlap:]
+        return new
+
+    def _new_lines(self, digests: List[int], visible: List[str], now: float) -> List[str]:
+        """Arrivals against the closest recently seen screen (all lines on the first read)."""
+        while self._recent and now - self._recent[0][2] > RECENT_FOR:
+            self._recent.popleft()
+        arrived = visible
+        for _, lines, _ in self._recent:
+            candidate = self._arrived(lines, visible)
+            if len(candidate) < len(arrived):
+                arrived = candidate
+        key = tuple(digests)
+        self._recent = deque(
+            (r for r in self._recent if r[0] != key), maxlen=RECENT_SCREENS
+        )
+        self._recent.append((key, visible, now))
+        return arrived
+
+    def _capture_bands(self, sc: Image.Image = None) -> Tuple[List[Image.Image], List[int]]:
+        chat = self.client.sectors.chat
+        bands = self._layout()
+        box = chat.crop_in(sc) if sc is not None else self.client.capture_region(chat)
+        crops = [band.crop_in(box) for band in bands]
+        return crops, [hash(c.tobytes()) for c in crops]
+
+    @timeit
+    def update(self, sc: Image.Image = None) -> List[ChatLine]:
+        """
+        Read the chat box (cropped from `sc`, or just the chat sector captured)
+        and return the lines that arrived since the previous read.
+        """
+        with self._lock:
+            self.stats['reads'] += 1
+            crops, digests = self._capture_bands(sc)
+            if digests == self._digests:
+                return []
+            self._digests = digests
+            visible = [t for t in (self._band_text(c) for c in crops) if t]
+            now = time.time()
+            arrived = self._new_lines(digests, visible, now)
+            self._visible = visible
+            lines = []
+            for text in arrived:
+                self._seq += 1
+                lines.append(ChatLine(self._seq, text, now))
+            self.history.extend(lines)
+        if lines:
+            self.client.state.publish('chat.line', lines[-1])
+        return lines
+
+    def visible(self, refresh: bool = True) -> List[str]:
+        """Text lines currently shown in the chat box, top to bottom."""
+        if refresh:
+            self.update()
+        return list(self._visible)
+
+    def lines(self, since: int = 0) -> List[ChatLine]:
+        """History lines with a sequence number above `since`."""
+        return [line for line in list(self.history) if line.seq > since]
+
+    @staticmethod
+    def _matches(line: str, pattern: Union[str, Pattern], confidence: float) -> bool:
+        if isinstance(pattern, str):
+            return text_similarity(line.lower(), pattern.lower()) >= confidence
+        return pattern.search(line) is not None
+
+    def contains(self, pattern: Union[str, Pattern], confidence: float = .7) -> Optional[str]:
+        """Visible line matching `pattern`: the most similar for strings, the first found for regexes."""
+        visible = self.visible()
+        if isinstance(pattern, str):
+            i, score = textmatch.best_match([line.lower() for line in visible], pattern.lower())
+            return visible[i] if score >= confidence else None
+        for line in visible:
+            if pattern.search(line):
+                return line
+        return None
+
+    def wait_for(
+            self,
+            pattern: Union[str, Pattern],
+            timeout: float = 10,
+            since: Optional[int] = None,
+            confidence: float = .7,
+            interval: float = 0.1
+        ) -> Optional[ChatLine]:
+        """
+        Block until a line matching `pattern` arrives after `since` (default:
+        lines arriving from now on). Each line is checked once. None on timeout.
+        """
+        if since is None:
+            # whatever is on screen already doesn't count
+            self.update()
+            since = self._seq
+        deadline = time.time() + timeout
+        while True:
+            for line in self.lines(since):
+                if self._matches(line.text, pattern, confidence):
+                    return line
+                since = line.seq
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return None
+            time.sleep(min(interval, remaining))
+            self.update()
+
+    def wait_for_change(self, timeout: float = 1, interval: float = 0.1) -> bool:
+        """
+        Block until any chat band's pixels change; False on timeout.
+        Only band digests are compared, nothing is OCR'd.
+        """
+        with self._lock:
+            _, before = self._capture_bands()
+        deadline = time.time() + timeout
+        while True:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return False
+            time.sleep(min(interval, remaining))
+            with self._lock:
+                _, digests = self._capture_bands()
+            if digests != before:
+                return True
@@ -0,0 +1,215 @@
+"""
+Right-click (context) menu reader.
+
+The game opens the menu horizontally centred on the click point with its
+header at the click height, so only a box around the last right click is
+grabbed and searched for the header and bottom-right corner. Below the
+header every option is a fixed-height row, so the menu is sliced into rows
+and each row is decoded once with the bold-font glyph templates (tesseract
+as fallback), memoized by pixel digest. Menus pushed up against the bottom
+of the viewport fall back to a full-window search.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Optional, Tuple, TYPE_CHECKING
+
+import numpy as np
+from PIL import Image
+
+from core import ocr, templates
+from core.logger import get_logger
+from core.ocr import glyphs
+from core.region_match import MatchResult
+from core.tools import find_subimage, mask_above_color_value, text_similarity, timeit
+
+if TYPE_CHECKING:
+    from core.osrs_client import RuneLiteClient
+
+MENU_HEADER = 'data/ui/right-click-header.png'
+MENU_END = 'data/ui/right-click-menu-end.png'
+HEADER_H, ROW_H = 19, 15
+BORDER = 2
+# how far the header can sit from the click point, and how large a menu gets
+SEARCH_UP, SEARCH_DOWN = 10, 10
+MAX_MENU_W, MAX_MENU_H = 360, HEADER_H + 20 * ROW_H
+MIN_CONFIDENCE = 0.95
+TEXT_THRESHOLD = 150
+MEMO_SIZE = 256
+
+
+@dataclass(frozen=True)
+class MenuOption:
+    text: str
+    match: MatchResult  # the option's row, window coordinates
+    index: int
+
+
+class ContextMenu:
+    """Reads the open right-click menu of a RuneLiteClient as a list of options."""
+
+    def __init__(self, client: 'RuneLiteClient'):
+        self.client = client
+        self.log = get_logger('ContextMenu')
+        self._lock = threading.Lock()
+        self._memo: 'OrderedDict[int, str]' = OrderedDict()
+        self.stats = {'reads': 0, 'rows': 0, 'memo_hits': 0, 'fallbacks': 0, 'tesseract': 0}
+
+    # ---- locating ----------------------------------------------------
+    def _capture(self) -> Tuple[Image.Image, MatchResult, int, int]:
+        """Crop around the last right click (or the cursor), its window offset and the anchor inside it."""
+        a_x, a_y = self.client.last_right_click or self.client.mouse_position()
+        win = self.client.window_match
+        area = MatchResult(
+            max(0, a_x - MAX_MENU_W // 2), max(0, a_y - SEARCH_UP),
+            min(win.end_x - win.start_x, a_x + MAX_MENU_W // 2),
+            min(win.end_y - win.start_y, a_y + MAX_MENU_H)
+        )
+        return self.client.capture_region(area), area, a_x - area.start_x, a_y - area.start_y
+
+    @staticmethod
+    def _find(img: Image.Image, template: Image.Image, area: MatchResult) -> Optional[MatchResult]:
+        area = MatchResult(
+            max(0, area.start_x), max(0, area.start_y),
+            min(img.width, area.end_x), min(img.height, area.end_y)
+        )
+        if area.end_x - area.start_x < template.width or area.end_y - area.start_y < template.height:
+            return None
+        found = find_subimage(area.crop_in(img), template, min_scale=1, max_scale=1)
+        if found.confidence < MIN_CONFIDENCE:
+            return None
+        return found.transform(area.start_x, area.start_y)
+
+    def _bounds(self, img: Image.Image, ax: int, ay: int) -> Optional[MatchResult]:
+        """Menu rectangle in `img`, searching near (ax, ay) when given."""
+        header = templates.get(MENU_HEADER)
+        end = templates.get(MENU_END)
+        if ax is None:
+            near = MatchResult(0, 0, img.width, img.height)
+        else:
+            near = MatchResult(
+                ax - MAX_MENU_W // 2, ay - SEARCH_UP,
+                ax + header.width, ay + SEARCH_DOWN + header.height
+            )
+        top_left = self._find(img, header, near)
+        if top_left is None:
+            return None
+        corner = MatchResult(
+            top_left.start_x, top_left.start_y + HEADER_H,
+            top_left.start_x + MAX_MENU_W, top_left.start_y + MAX_MENU_H
+        )
+        bottom_right = self._find(img, end, corner)
+        if bottom_right is None:
+            return None
+        return MatchResult(top_left.start_x, top_left.start_y, bottom_right.end_x, bottom_right.end_y)
+
+    def locate(self) -> Optional[Tuple[Image.Image, MatchResult]]:
+        """The menu image and its rectangle in window coordinates, or None when no menu is open."""
+        crop, area, ax, ay = self._capture()
+        bounds = self._bounds(crop, ax, ay)
+        if bounds is not None:
+            return bounds.crop_in(crop), bounds.transform(area.start_x, area.start_y)
+        # clamped against the viewport edge, so not where it was opened
+        self.stats['fallbacks'] += 1
+        sc = self.client.get_screenshot()
+        bounds = self._bounds(sc, None, None)
+        if bounds is None:
+            return None
+        return bounds.crop_in(sc), bounds
+
+    # ---- decoding ----------------------------------------------------
+    def _decode(self, row: Image.Image) -> str:
+        ink = np.asarray(mask_above_color_value(row, threshold=TEXT_THRESHOLD)) > 0
+        found, gaps = glyphs.segments(ink)
+        text = glyphs.decode(found, glyphs.TEXT, gaps, font=glyphs.BOLD_12)
+        if text is not None:
+            return text
+        self.stats['tesseract'] += 1
+        text = ocr.execute(
+            Image.fromarray(ink.astype(np.uint8) * 255, 'L'),
+            font=ocr.FontChoice.RUNESCAPE_BOLD_12,
+            psm=ocr.TessPsm.SINGLE_LINE,
+            raise_on_blank=False,
+            preprocess=False
+        ) or ''
+        # this charset has near-twins (I/l/!, o/p); learn at most one new glyph per verified read
+        glyphs.learn(found, text, glyphs.TEXT, font=glyphs.BOLD_12, max_unknown=1)
+        return text
+
+    def _row_text(self, row: Image.Image) -> str:
+        self.stats['rows'] += 1
+        digest = hash(row.tobytes())
+        text = self._memo.get(digest)
+        if text is not None:
+            self._memo.move_to_end(digest)
+            self.stats['memo_hits'] += 1
+            return text
+        text = self._decode(row).strip()
+        self._memo[digest] = text
+        if len(self._memo) > MEMO_SIZE:
+            self._memo.popitem(last=False)
+        return text
+
+    @timeit
+    def read(self, timeout: float = 0.6) -> List[MenuOption]:
+        """
+        Options of the open menu, top to bottom. Waits up to `timeout` for the
+        menu to be drawn after a right click; empty when none appears.
+        """
+        deadline = time.time() + timeout
+        with self._lock:
+            self.stats['reads'] += 1
+            while True:
+                located = self.locate()
+                if located is not None:
+                    break
+                if time.time() >= deadline:
+                    return []
+                time.sleep(0.03)
+            menu, bounds = located
+            n_rows = (menu.height - HEADER_H) // ROW_H
+            options = []
+            for i in range(n_rows):
+                row = MatchResult(BORDER, HEADER_H + i * ROW_H, menu.width - BORDER, HEADER_H + (i + 1) * ROW_H)
+                text = self._row_text(row.crop_in(menu))
+                options.append(MenuOption(text, row.transform(bounds.start_x, bounds.start_y), i))
+            return options
+
+    @staticmethod
+    def find(
+            options: List[MenuOption],
+            option: str,
+            min_similarity: float = 0.8,
+            exact: bool = False
+        ) -> Optional[MenuOption]:
+        """
+        Best row for `option`: a row whose action is exactly `option` wins
+        (so 'Withdraw-1' doesn't pick 'Withdraw-10'), then, unless `exact`,
+        the closest by text similarity; the topmost row wins ties.
+        """
+        target = option.lower()
+        best, best_score = None, min_similarity
+        for opt in options:
+            text = opt.text.lower()
+            if text == target or text.startswith(target + ' '):
+                return opt
+            if exact:
+                continue
+            score = text_similarity(text, target)
+            if score > best_score:
+                best, best_score = opt, score
+        return best
+
+    def choose(self, option: str, min_similarity: float = 0.8, timeout: float = 0.6) -> MenuOption:
+        """Click `option` in the open menu. ValueError when the menu or option isn't found."""
+        options = self.read(timeout)
+        if not options:
+            raise ValueError('Right-click menu not found')
+        picked = self.find(options, option, min_similarity)
+        if picked is None:
+            raise ValueError(f'Option "{option}" not in menu: {[o.text for o in options]}')
+        self.client.click(picked.match, rand_move_chance=0)
+        return picked
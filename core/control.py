@@ -1,4 +1,5 @@
 import time
+import threading
 from functools import wraps
 from bots.core.cfg_types import BreakCfgParam
 from core.logger import get_logger
@@ -15,19 +16,38 @@ class SingletonMeta(type):
         return cls._instances[cls]
 
 class ScriptControl(metaclass=SingletonMeta):
+    """
+    Central pause/terminate/break state.
+
+    State changes notify a condition variable, so guarded calls that are
+    waiting on a pause or break wake up as soon as it is lifted or a
+    termination is requested.
+    """
     def __init__(self):
         self._terminate = False
         self._pause = False
-        self.break_until: float = 0
+        self._break_until: float = 0
+        self._cond = threading.Condition()
         self.break_config: BreakCfgParam = None
         self.log = get_logger("ScriptControl")
-        self.start_listener()
+        # hotkeys are registered on first guarded call (or an explicit start_listener())
+        self._listener_started = False
+        self._listener_lock = threading.Lock()
 
     
     def start_listener(self):
-        """Start a thread to listen for termination and pause requests."""
-        import threading
-        threading.Thread(target=self._listen_for_control, daemon=True).start()
+        """Register hotkeys for termination (page up) and pause toggle (page down). Idempotent."""
+        with self._listener_lock:
+            if self._listener_started:
+                return
+            self._listener_started = True
+        try:
+            import keyboard
+            keyboard.add_hotkey('page up', self._on_terminate_key)
+            # fire on release so holding the key doesn't toggle repeatedly
+            keyboard.add_hotkey('page down', self._on_pause_key, trigger_on_release=True)
+        except Exception as e:
+            self.log.warning(f"Control hotkeys unavailable: {e}")
 
 
     def propose_break(self):
@@ -41,19 +61,16 @@ class ScriptControl(metaclass=SingletonMeta):
                 self.log.info(f"Sleeping for {sec} seconds.")
         else:
             self.log.warning("Break proposed but no break configuration set.")
-    def _listen_for_control(self):
-        """Thread function to listen for control signals."""
-        import keyboard
-        while True:
-            if keyboard.is_pressed('page up'):
-                self.terminate = True
-                return
-            if keyboard.is_pressed('page down'):
-                self.pause = not self.pause
-                while keyboard.is_pressed('page down'):
-                    # Wait until the key is released
-                    time.sleep(0.1)
-            time.sleep(0.05)
+
+    def _on_terminate_key(self):
+        self.terminate = True
+
+    def _on_pause_key(self):
+        self.pause = not self.pause
+
+    def _notify(self):
+        with self._cond:
+            self._cond.notify_all()
 
     @property
     def terminate(self):
@@ -64,6 +81,7 @@ class ScriptControl(metaclass=SingletonMeta):
         if self._terminate != value:
             self.log.info(f"Terminate set to {value}")
         self._terminate = value
+        self._notify()
 
     @property
     def pause(self):
@@ -74,25 +92,52 @@ class ScriptControl(metaclass=SingletonMeta):
         if self._pause != value:
             self.log.info(f"Pause {'enabled' if value else 'disabled'}")
         self._pause = value
+        self._notify()
+
+    @property
+    def break_until(self) -> float:
+        return self._break_until
+
+    @break_until.setter
+    def break_until(self, value: float):
+        self._break_until = value
+        self._notify()
 
     def initialize_break(self, seconds: int):
         """Set the break duration without causing the caller to sleep."""
         self.break_until = time.time() + int(seconds)
 
+    def wait_if_held(self):
+        """
+        Block while paused or on break.
+        Raises ScriptTerminationException as soon as termination is requested.
+        """
+        if not self._listener_started:
+            self.start_listener()
+        # lock-free fast path for the common case
+        if not (self._terminate or self._pause or time.time() < self._break_until):
+            return
+        with self._cond:
+            while True:
+                if self._terminate:
+                    raise ScriptTerminationException()
+                remaining = self._break_until - time.time()
+                if self._pause:
+                    self._cond.wait()
+                elif remaining > 0:
+                    self._cond.wait(remaining)
+                else:
+                    return
+
     def guard(self, func):
         """
         Decorator to enforce termination and break logic.
-        Raises RuntimeError if termination is requested.
-        Waits if a break is active.
+        Raises ScriptTerminationException if termination is requested.
+        Waits if paused or a break is active.
         """
         @wraps(func)
         def wrapper(*args, **kwargs):
-            while time.time() < self.break_until or self.pause:
-                if self.terminate:
-                    raise ScriptTerminationException()
-                time.sleep(1)
-            if self.terminate:
-                raise ScriptTerminationException()
+            self.wait_if_held()
             return func(*args, **kwargs)
         return wrapper
 
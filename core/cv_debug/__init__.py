@@ -3,7 +3,6 @@ import time
 import json
 import base64
 import logging
-import click
 import io
 from typing import Optional, Dict, Any, Tuple
 from collections import deque
@@ -121,6 +120,7 @@ _worker_thread: Optional[threading.Thread] = None
 
 def _create_app():
     from flask import Flask, jsonify, Response, request
+    disable_flask_logging()
 
     app = Flask(__name__)
 
@@ -334,6 +334,8 @@ def disable_flask_logging() -> None:
     Overrides click's echo and secho functions to suppress output and
     sets Werkzeug's logger level to ERROR to reduce log verbosity.
     """
+    import click
+
     def override_click_logging():
         # pylint: disable=unused-argument
         def secho(text, file=None, nl=None, err=None, color=None, **styles):
@@ -349,6 +351,3 @@ def disable_flask_logging() -> None:
     werkzeug_log.setLevel(logging.ERROR)
 
     override_click_logging()
-
-
-disable_flask_logging()
\ No newline at end of file
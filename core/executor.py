@@ -0,0 +1,137 @@
+"""
+Shared, bounded thread pools for client-side parallel work.
+
+Work is split into lanes so a burst of template searches can't starve OCR
+or the short blocking reads (e.g. a delayed screen read):
+
+    CV   - template / colour searches (numpy + OpenCV release the GIL)
+    OCR  - tesseract and digit-template reads
+    IO   - waits, sleeps and other mostly-idle work
+
+Lane pools are created once per client and reused for every call.
+"""
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from enum import Enum
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from core import tracing
+
+CPU_COUNT = os.cpu_count() or 2
+
+
+class Lane(Enum):
+    CV = "cv"
+    OCR = "ocr"
+    IO = "io"
+
+
+DEFAULT_LANE_SIZES: Dict[Lane, int] = {
+    Lane.CV: max(2, CPU_COUNT),
+    Lane.OCR: max(2, CPU_COUNT // 2),
+    Lane.IO: 4,
+}
+
+_local = threading.local()
+
+
+class _LaneStats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.submitted = 0
+        self.started = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.inline = 0
+        self.max_queue_depth = 0
+
+
+class ExecutorService:
+    """Client-owned set of named, bounded thread pools with queue-depth metrics."""
+
+    def __init__(self, sizes: Dict[Lane, int] | None = None, name: str = "rl"):
+        sizes = {**DEFAULT_LANE_SIZES, **(sizes or {})}
+        self.sizes = sizes
+        self._pools: Dict[Lane, ThreadPoolExecutor] = {
+            lane: ThreadPoolExecutor(max_workers=n, thread_name_prefix=f"{name}-{lane.value}")
+            for lane, n in sizes.items()
+        }
+        self._stats: Dict[Lane, _LaneStats] = {lane: _LaneStats() for lane in sizes}
+
+    def submit(self, lane: Lane, fn: Callable, *args, **kwargs) -> Future:
+        """
+        Submit `fn` to `lane`. Calls made from a worker of the same lane run
+        inline, so nested fan-out (on_resize -> toolplane search) can't
+        deadlock a saturated pool.
+        """
+        stats = self._stats[lane]
+        fn = tracing.propagate(fn)
+
+        if getattr(_local, "lane", None) is lane:
+            with stats.lock:
+                stats.inline += 1
+            fut: Future = Future()
+            try:
+                fut.set_result(fn(*args, **kwargs))
+            except BaseException as e:
+                fut.set_exception(e)
+            return fut
+
+        def _run():
+            with stats.lock:
+                stats.started += 1
+            _local.lane = lane
+            try:
+                return fn(*args, **kwargs)
+            except BaseException:
+                with stats.lock:
+                    stats.failed += 1
+                raise
+            finally:
+                _local.lane = None
+                with stats.lock:
+                    stats.completed += 1
+
+        with stats.lock:
+            stats.submitted += 1
+            depth = stats.submitted - stats.started - stats.cancelled
+            if depth > stats.max_queue_depth:
+                stats.max_queue_depth = depth
+        fut = self._pools[lane].submit(_run)
+        fut.add_done_callback(lambda f: self._on_done(stats, f))
+        return fut
+
+    @staticmethod
+    def _on_done(stats: _LaneStats, fut: Future):
+        if fut.cancelled():
+            with stats.lock:
+                stats.cancelled += 1
+
+    def run_all(self, lane: Lane, jobs: Iterable[Tuple[Callable, tuple]]) -> List:
+        """Run (fn, args) jobs on `lane` and return their results in order."""
+        futures = [self.submit(lane, fn, *args) for fn, args in jobs]
+        return [f.result() for f in futures]
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Per-lane counters; `queued` is work submitted but not yet picked up."""
+        out = {}
+        for lane, s in self._stats.items():
+            with s.lock:
+                out[lane.value] = {
+                    "workers": self.sizes[lane],
+                    "queued": s.submitted - s.started - s.cancelled,
+                    "active": s.started - s.completed,
+                    "submitted": s.submitted,
+                    "completed": s.completed,
+                    "failed": s.failed,
+                    "cancelled": s.cancelled,
+                    "inline": s.inline,
+                    "max_queue_depth": s.max_queue_depth,
+                }
+        return out
+
+    def shutdown(self, wait: bool = False):
+        for pool in self._pools.values():
+            pool.shutdown(wait=wait, cancel_futures=True)
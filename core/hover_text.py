@@ -0,0 +1,149 @@
+"""
+Hover-text (mouse tooltip) reader that works on a small capture around the cursor.
+
+The tooltip bar always opens just below-right of the cursor, so only that
+rectangle is grabbed. The bar's left edge is looked for first where it was
+last time (relative to the cursor), then by template search inside the crop;
+the right edge is searched only along the bar's row. The text itself is
+decoded with glyph templates for the game font (tesseract as fallback) and
+memoized by pixel digest, since the same tooltip is read over and over
+while hovering a target.
+"""
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple, TYPE_CHECKING
+
+import numpy as np
+from PIL import Image
+
+from core import ocr, templates
+from core.logger import get_logger
+from core.ocr import glyphs
+from core.region_match import MatchResult
+from core.tools import find_subimage, mask_above_color_value, timeit
+
+if TYPE_CHECKING:
+    from core.osrs_client import RuneLiteClient
+
+ACTION_HOVER = 'data/ui/action-hover.png'
+EDGE_W = 10
+# where the bar can start relative to the cursor, and how long it can get
+SEARCH_LEFT, SEARCH_UP, SEARCH_RIGHT, SEARCH_DOWN = 45, 20, 20, 45
+MAX_BAR_W, BAR_H = 350, 25
+BORDER = 2
+MIN_CONFIDENCE = 0.95
+# mean per-channel difference for the cached left-edge position to count as a hit
+ANCHOR_TOLERANCE = 6
+TEXT_THRESHOLD = 150
+MEMO_SIZE = 256
+
+
+class HoverTextReader:
+    """Reads the tooltip under the cursor of a RuneLiteClient."""
+
+    def __init__(self, client: 'RuneLiteClient'):
+        self.client = client
+        self.log = get_logger('HoverTextReader')
+        self._lock = threading.Lock()
+        # bar start relative to the cursor from the last successful read
+        self._anchor: Optional[Tuple[int, int]] = None
+        self._memo: 'OrderedDict[int, str]' = OrderedDict()
+        self.stats = {'reads': 0, 'memo_hits': 0, 'anchor_hits': 0, 'tesseract': 0}
+
+    def _edges(self) -> Tuple[Image.Image, Image.Image, np.ndarray]:
+        bar = templates.get(ACTION_HOVER)
+        start = bar.crop((0, 0, EDGE_W, bar.height))
+        end = bar.crop((bar.width - EDGE_W, 0, bar.width, bar.height))
+        return start, end, np.asarray(start.convert('RGB'), dtype=np.int16)
+
+    def _capture(self) -> Optional[Tuple[Image.Image, int, int]]:
+        """Crop around the cursor, with the cursor position inside the crop (None off-window)."""
+        c_x, c_y = self.client.mouse_position()
+        win = self.client.window_match
+        x0, y0 = max(0, c_x - SEARCH_LEFT), max(0, c_y - SEARCH_UP)
+        x1 = min(win.end_x - win.start_x, c_x + SEARCH_RIGHT + MAX_BAR_W)
+        y1 = min(win.end_y - win.start_y, c_y + SEARCH_DOWN + BAR_H)
+        if x1 <= x0 or y1 <= y0:
+            return None
+        crop = self.client.capture_region(MatchResult(x0, y0, x1, y1))
+        return crop, c_x - x0, c_y - y0
+
+    def _find_start(self, crop: Image.Image, cx: int, cy: int) -> Optional[Tuple[int, int]]:
+        start, _, start_rgb = self._edges()
+        h, w = start_rgb.shape[:2]
+        if self._anchor is not None:
+            x, y = cx + self._anchor[0], cy + self._anchor[1]
+            if 0 <= x and 0 <= y and x + w <= crop.width and y + h <= crop.height:
+                px = np.asarray(crop.crop((x, y, x + w, y + h)), dtype=np.int16)
+                if np.abs(px - start_rgb).mean() <= ANCHOR_TOLERANCE:
+                    self.stats['anchor_hits'] += 1
+                    return x, y
+        area = MatchResult(
+            max(0, cx - SEARCH_LEFT), max(0, cy - SEARCH_UP),
+            min(crop.width, cx + SEARCH_RIGHT + w), min(crop.height, cy + SEARCH_DOWN + h)
+        )
+        found = find_subimage(area.crop_in(crop), start, min_scale=1, max_scale=1)
+        if found.confidence < MIN_CONFIDENCE:
+            return None
+        x, y = area.start_x + found.start_x, area.start_y + found.start_y
+        self._anchor = (x - cx, y - cy)
+        return x, y
+
+    def _find_end(self, crop: Image.Image, x: int, y: int) -> Optional[int]:
+        _, end, _ = self._edges()
+        row = MatchResult(x, y, min(crop.width, x + MAX_BAR_W), min(crop.height, y + end.height))
+        found = find_subimage(row.crop_in(crop), end, min_scale=1, max_scale=1)
+        if found.confidence < MIN_CONFIDENCE:
+            return None
+        return x + found.end_x
+
+    def _decode(self, bar: Image.Image) -> str:
+        # drop the bar's border so it doesn't segment as glyphs
+        bar = bar.crop((BORDER, BORDER, bar.width - BORDER, bar.height - BORDER))
+        ink = np.asarray(mask_above_color_value(bar, threshold=TEXT_THRESHOLD)) > 0
+        found, gaps = glyphs.segments(ink)
+        text = glyphs.decode(found, glyphs.TEXT, gaps)
+        if text is not None:
+            return text
+        self.stats['tesseract'] += 1
+        text = ocr.execute(
+            Image.fromarray(ink.astype(np.uint8) * 255, 'L'),
+            font=ocr.FontChoice.RUNESCAPE_PLAIN_11,
+            psm=ocr.TessPsm.SINGLE_LINE,
+            raise_on_blank=False,
+            preprocess=False
+        ) or ''
+        # this charset has near-twins (I/l/!, o/p); learn at most one new glyph per verified read
+        glyphs.learn(found, text, glyphs.TEXT, max_unknown=1)
+        return text
+
+    @timeit
+    def read(self) -> Optional[str]:
+        """Tooltip text under the cursor, or None when no tooltip is showing."""
+        with self._lock:
+            self.stats['reads'] += 1
+            captured = self._capture()
+            if captured is None:
+                return None
+            crop, cx, cy = captured
+            start = self._find_start(crop, cx, cy)
+            if start is None:
+                return None
+            end_x = self._find_end(crop, *start)
+            if end_x is None:
+                return None
+            x, y = start
+            bar = crop.crop((x, y, end_x, min(crop.height, y + BAR_H)))
+            digest = hash(bar.tobytes())
+            text = self._memo.get(digest)
+            if text is not None:
+                self._memo.move_to_end(digest)
+                self.stats['memo_hits'] += 1
+                return text
+            text = self._decode(bar)
+            self._memo[digest] = text
+            if len(self._memo) > MEMO_SIZE:
+                self._memo.popitem(last=False)
+            return text
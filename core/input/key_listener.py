@@ -1,49 +1,64 @@
 import threading
-import time
 import keyboard  # Requires admin privileges on some systems
 
 
 class KeyListener:
     def __init__(self, interval=0.1):
+        # interval is kept for backwards compatibility; key presses are
+        # delivered by keyboard hooks instead of polling.
         self.interval = interval
         self.listeners = {}  # key: list of callbacks
         self.running = False
-        self.thread = threading.Thread(target=self._run, daemon=True)
+        self._held = set()   # keys currently down, used to ignore auto-repeat
+        self._hooks = []
+        self._stopped = threading.Event()
 
     def add_listener(self, key: str, callback):
         """Register a callback for a key."""
         if key not in self.listeners:
             self.listeners[key] = []
+            if self.running:
+                self._hook(key)
         self.listeners[key].append(callback)
 
     def start(self):
-        """Start the listener thread."""
+        """Start listening for key events."""
         if not self.running:
             self.running = True
-            if not self.thread.is_alive():
-                self.thread = threading.Thread(target=self._run, daemon=True)
-                self.thread.start()
+            self._stopped.clear()
+            print("[KeyListener] Listening for keypresses...")
+            for key in self.listeners:
+                self._hook(key)
 
     def stop(self):
-        """Stop the listener thread."""
+        """Stop listening for key events."""
         self.running = False
+        for hook in self._hooks:
+            try:
+                keyboard.unhook(hook)
+            except (KeyError, ValueError):
+                pass
+        self._hooks.clear()
+        self._held.clear()
+        self._stopped.set()
 
     def wait_for_term(self):
         """Wait for the listener to terminate."""
-        self.thread.join()
+        self._stopped.wait()
 
-    def _run(self):
-        print("[KeyListener] Listening for keypresses...")
-        while self.running:
-            for key, callbacks in self.listeners.items():
-                if keyboard.is_pressed(key):
-                    for callback in callbacks:
-                        try:
-                            callback()
-                        except Exception as e:
-                            print(f"[KeyListener] Error in callback for '{key}': {e}")
-                    time.sleep(0.3)  # debounce to avoid repeat spam
-            time.sleep(self.interval)
+    def _hook(self, key: str):
+        self._hooks.append(keyboard.on_press_key(key, lambda _e: self._on_press(key)))
+        self._hooks.append(keyboard.on_release_key(key, lambda _e: self._held.discard(key)))
+
+    def _on_press(self, key: str):
+        if not self.running or key in self._held:
+            return  # held down - ignore auto-repeat
+        self._held.add(key)
+        for callback in list(self.listeners.get(key, [])):
+            try:
+                callback()
+            except Exception as e:
+                print(f"[KeyListener] Error in callback for '{key}': {e}")
     
     
 
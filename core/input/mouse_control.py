@@ -13,7 +13,7 @@ if __name__ == "__main__":
         )
     )
 import ctypes, math, random, time
-import pyautogui, keyboard
+import pyautogui
 from core.tools import MatchResult          # your class
 from core.control import ScriptControl
 from enum import Enum
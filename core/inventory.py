@@ -0,0 +1,407 @@
+"""
+Slot-grid inventory reader.
+
+The inventory is a fixed 4x7 grid inside the toolplane, so the 28 slot
+rectangles are derived from the calibrated toolplane position instead of
+searching the whole panel once per item type.
+
+Each slot is identified by hashing a handful of icon pixels below the
+stack-count band and looking the hash up in an index built once from the
+ItemLookup icons. Hash candidates are verified against the full icon;
+only slots that still miss fall back to template matching.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, replace
+from typing import Collection, Dict, Iterable, List, Optional, Sequence, Tuple, TYPE_CHECKING
+
+import numpy as np
+from PIL import Image
+
+from core import ocr, tools
+from core.item_db import Item, ItemLookup
+from core.logger import get_logger
+from core.region_match import MatchResult
+from core.tools import timeit
+
+if TYPE_CHECKING:
+    from core.osrs_client import RuneLiteClient
+
+COLS, ROWS = 4, 7
+SLOT_COUNT = COLS * ROWS
+SLOT_W, SLOT_H = 36, 32
+PITCH_X, PITCH_Y = 42, 36
+# top rows of a slot that may hold the stack count
+COUNT_BAND = 13
+
+# top-left of the first slot relative to the toolplane sector, per UI type
+GRID_OFFSET: Dict[str, Tuple[int, int]] = {
+    'modern': (22, 14),
+    'classic': (38, 8),
+    'fixed': (38, 8),
+}
+
+# slot-relative pixels hashed to identify an icon (all below COUNT_BAND)
+PROBES: Tuple[Tuple[int, int], ...] = (
+    (10, 17), (18, 17), (26, 17),
+    (10, 25), (18, 25), (26, 25),
+)
+# low bits dropped from each channel before hashing
+QUANT_BITS = 3
+# per-channel tolerance and share of icon pixels that must agree to accept a hash hit
+PIXEL_TOLERANCE = 8
+MIN_VERIFY = 0.9
+# a slot is occupied when more than this share of its pixels falls outside
+# the luminance range of the panel background (sampled between slots)
+OCCUPIED_FRACTION = 0.06
+BACKGROUND_MARGIN = 12
+
+
+def _pack(rgb: np.ndarray, bits: int = 0) -> np.ndarray:
+    """Pack (..., 3) uint8 colours into one int per pixel, dropping `bits` low bits."""
+    rgb = rgb.astype(np.int32) >> bits
+    shift = 8 - bits
+    return (rgb[..., 0] << (2 * shift)) | (rgb[..., 1] << shift) | rgb[..., 2]
+
+
+@dataclass(frozen=True)
+class InventorySlot:
+    index: int
+    match: MatchResult          # slot rectangle in window coordinates
+    item_id: Optional[int] = None
+    name: Optional[str] = None
+    count: int = 0
+    confidence: float = 0.0
+    empty: bool = False
+
+
+@dataclass(frozen=True)
+class InventorySnapshot:
+    slots: Tuple[InventorySlot, ...]
+    timestamp: float
+
+    def find(self, item: str | int) -> List[InventorySlot]:
+        """Slots holding `item` (id or case-insensitive name), in slot order."""
+        if isinstance(item, int):
+            return [s for s in self.slots if s.item_id == item]
+        name = item.lower()
+        return [s for s in self.slots if s.name and s.name.lower() == name]
+
+    def count(self, item: str | int) -> int:
+        """Total quantity of `item` across all slots."""
+        return sum(s.count for s in self.find(item))
+
+    @property
+    def empty_slots(self) -> List[InventorySlot]:
+        return [s for s in self.slots if s.empty]
+
+    @property
+    def unknown_slots(self) -> List[InventorySlot]:
+        return [s for s in self.slots if not s.empty and s.item_id is None]
+
+    def items(self) -> Dict[str, int]:
+        """Quantity per item name."""
+        totals: Dict[str, int] = {}
+        for s in self.slots:
+            if s.name:
+                totals[s.name] = totals.get(s.name, 0) + s.count
+        return totals
+
+
+@dataclass(frozen=True)
+class InventoryOccupancy:
+    mask: int                   # bit i set when slot i holds something
+    digests: Tuple[int, ...]    # per-slot pixel digest; changes when the slot changes
+    timestamp: float
+
+    @property
+    def occupied(self) -> int:
+        return bin(self.mask).count('1')
+
+    @property
+    def free(self) -> int:
+        return SLOT_COUNT - self.occupied
+
+    @property
+    def full(self) -> bool:
+        return self.occupied == SLOT_COUNT
+
+    def is_occupied(self, slot: int) -> bool:
+        return bool(self.mask >> slot & 1)
+
+    def changed_slots(self, other: 'InventoryOccupancy') -> List[int]:
+        """Slots whose contents differ between this and `other`."""
+        return [i for i, (a, b) in enumerate(zip(self.digests, other.digests)) if a != b]
+
+
+@dataclass
+class _Grid:
+    slots: List[MatchResult]
+    box: Tuple[int, int, int, int]      # grid bounds in window coordinates
+    gaps: np.ndarray                    # True between slots (always panel background)
+    ys: np.ndarray                      # (28, SLOT_H, 1) slot rows within the box
+    xs: np.ndarray                      # (28, 1, SLOT_W) slot columns within the box
+
+    def region(self, sc: Image.Image) -> np.ndarray:
+        x0, y0, x1, y1 = self.box
+        if x0 < 0 or y0 < 0 or x1 > sc.width or y1 > sc.height:
+            raise ValueError(f'Inventory grid {self.box} is outside the {sc.size} screenshot')
+        return np.asarray(sc.convert('RGB') if sc.mode != 'RGB' else sc)[y0:y1, x0:x1]
+
+
+class IconIndex:
+    """
+    Probe-pixel hashes of every item icon.
+
+    Icons are grouped by which PROBES they cover (transparent pixels show the
+    slot background, so they can't be part of the key); a lookup hashes the
+    slot once per group.
+    """
+
+    def __init__(self, items: Iterable[Item]):
+        self._groups: Dict[Tuple[int, ...], Dict[Tuple[int, ...], List[int]]] = {}
+        # slot-relative (ys, xs, rgb) of each verified icon's opaque pixels
+        self._pixels: Dict[int, Tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+        self.indexed = 0
+        self.unindexed = 0
+        for item in items:
+            self._add(item)
+
+    def _add(self, item: Item):
+        if not item.icon_b64:
+            return
+        try:
+            rgba = np.asarray(item.icon.convert('RGBA'))
+        except Exception:
+            self.unindexed += 1
+            return
+        ox, oy = item.icon_offset
+        h, w = rgba.shape[:2]
+        positions, key = [], []
+        for i, (px, py) in enumerate(PROBES):
+            ix, iy = px - ox, py - oy
+            if 0 <= ix < w and 0 <= iy < h and rgba[iy, ix, 3] > 0:
+                positions.append(i)
+                key.append(int(_pack(rgba[iy, ix, :3], QUANT_BITS)))
+        if not positions:
+            # too small to cover any probe; only found through the template fallback
+            self.unindexed += 1
+            return
+        self._groups.setdefault(tuple(positions), {}).setdefault(tuple(key), []).append(item.id)
+        self.indexed += 1
+
+    def candidates(self, probe_values: Sequence[int]) -> List[int]:
+        out: List[int] = []
+        for positions, table in self._groups.items():
+            ids = table.get(tuple(probe_values[i] for i in positions))
+            if ids:
+                out.extend(ids)
+        return out
+
+    def _icon_pixels(self, item: Item) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        cached = self._pixels.get(item.id)
+        if cached is None:
+            rgba = np.asarray(item.icon.convert('RGBA'))
+            ys, xs = np.nonzero(rgba[..., 3] > 0)
+            ox, oy = item.icon_offset
+            sy, sx = ys + oy, xs + ox
+            keep = (sy >= COUNT_BAND) & (sy < SLOT_H) & (sx < SLOT_W)
+            cached = (sy[keep], sx[keep], rgba[ys[keep], xs[keep], :3].astype(np.int16))
+            self._pixels[item.id] = cached
+        return cached
+
+    def verify(self, item: Item, slot_rgb: np.ndarray) -> float:
+        """Share of the icon's opaque pixels (below the count band) that match the slot."""
+        ys, xs, rgb = self._icon_pixels(item)
+        if not len(ys):
+            return 0.0
+        diff = np.abs(slot_rgb[ys, xs].astype(np.int16) - rgb)
+        return float(np.mean(np.all(diff <= PIXEL_TOLERANCE, axis=1)))
+
+    def identify(
+            self, slot_rgb: np.ndarray, prefer: Collection[int] = ()
+        ) -> Tuple[Optional[Item], float]:
+        """
+        Best verified item for a (SLOT_H, SLOT_W, 3) slot crop, or (None, score)
+        when no hash candidate reaches MIN_VERIFY. Items sharing a sprite (charge
+        variants like Amulet of glory(1)..(6)) score the same; ties go to an id
+        in `prefer`.
+        """
+        db = ItemLookup()
+        probe_values = [int(_pack(slot_rgb[py, px], QUANT_BITS)) for px, py in PROBES]
+        best, best_key = None, (0.0, False)
+        for item_id in self.candidates(probe_values):
+            item = db.get_item_by_id(item_id)
+            key = (self.verify(item, slot_rgb), item_id in prefer)
+            if key > best_key:
+                best, best_key = item, key
+        best_score = best_key[0]
+        if best_score < MIN_VERIFY:
+            return None, best_score
+        return best, best_score
+
+
+class InventoryReader:
+    """Reads all 28 inventory slots of a RuneLiteClient in one pass."""
+
+    def __init__(self, client: 'RuneLiteClient'):
+        self.client = client
+        self.log = get_logger('InventoryReader')
+        self._index: Optional[IconIndex] = None
+        self._index_lock = threading.Lock()
+        # correction learned from template fallbacks when GRID_OFFSET is off by a few px
+        self._align: Tuple[int, int] = (0, 0)
+        self._grid_key = None
+        self._grid: Optional[_Grid] = None
+
+    # ---- index -------------------------------------------------------
+    def build_index(self) -> IconIndex:
+        """Build the icon-hash index (once). Safe to call from a startup stage."""
+        if self._index is None:
+            with self._index_lock:
+                if self._index is None:
+                    start = time.time()
+                    index = IconIndex(ItemLookup().items())
+                    self.log.info(
+                        f'Indexed {index.indexed} item icons in {time.time() - start:.2f}s '
+                        f'({index.unindexed} template-only)'
+                    )
+                    self._index = index
+        return self._index
+
+    # ---- geometry ----------------------------------------------------
+    def slot_matches(self) -> List[MatchResult]:
+        """The 28 slot rectangles in window coordinates, row-major."""
+        return self._layout().slots
+
+    def _layout(self) -> _Grid:
+        key = (self.client.layout_version, self.client.ui_type, self._align)
+        if self._grid_key != key:
+            tp = self.client.sectors.toolplane
+            ox, oy = GRID_OFFSET[self.client.ui_type.value]
+            x0 = tp.start_x + ox + self._align[0]
+            y0 = tp.start_y + oy + self._align[1]
+            slots = [
+                MatchResult(
+                    x0 + c * PITCH_X, y0 + r * PITCH_Y,
+                    x0 + c * PITCH_X + SLOT_W, y0 + r * PITCH_Y + SLOT_H
+                )
+                for r in range(ROWS) for c in range(COLS)
+            ]
+            box = (x0, y0, x0 + (COLS - 1) * PITCH_X + SLOT_W, y0 + (ROWS - 1) * PITCH_Y + SLOT_H)
+            # pixels between slots are always panel background
+            gaps = np.ones((box[3] - box[1], box[2] - box[0]), dtype=bool)
+            for m in slots:
+                gaps[m.start_y - y0:m.end_y - y0, m.start_x - x0:m.end_x - x0] = False
+            # gather indices so all 28 slots are pulled out of a frame in one operation
+            rows = np.array([m.start_y - y0 for m in slots])[:, None, None] + np.arange(SLOT_H)[None, :, None]
+            cols = np.array([m.start_x - x0 for m in slots])[:, None, None] + np.arange(SLOT_W)[None, None, :]
+            self._grid = _Grid(slots, box, gaps, rows, cols)
+            self._grid_key = key
+        return self._grid
+
+    # ---- occupancy ---------------------------------------------------
+    def _occupancy(self, grid: _Grid, region: np.ndarray) -> Tuple[InventoryOccupancy, np.ndarray]:
+        lum = region.sum(axis=2, dtype=np.int16)
+        lo, hi = np.percentile(lum[grid.gaps], (1, 99))
+        slots = lum[grid.ys, grid.xs]
+        outside = ((slots < lo - BACKGROUND_MARGIN) | (slots > hi + BACKGROUND_MARGIN)).mean(axis=(1, 2))
+        occupied = np.flatnonzero(outside > OCCUPIED_FRACTION)
+        mask = sum(1 << int(i) for i in occupied)
+        digests = tuple(hash(slots[i, ::2, ::2].tobytes()) for i in range(SLOT_COUNT))
+        return InventoryOccupancy(mask, digests, time.time()), outside
+
+    def occupancy(self, sc: Image.Image = None) -> InventoryOccupancy:
+        """
+        Which slots are filled, from pixel statistics only (no item identification).
+        Assumes the inventory tab is open. Note the cursor is part of the capture,
+        so keep it off the inventory when comparing digests.
+        """
+        sc = sc or self.client.get_screenshot()
+        grid = self._layout()
+        return self._occupancy(grid, grid.region(sc))[0]
+
+    # ---- reading -----------------------------------------------------
+    @timeit
+    def read(
+            self,
+            sc: Image.Image = None,
+            candidates: Sequence[str | int] = (),
+            read_counts: bool = True,
+            min_confidence: float = 0.97
+        ) -> InventorySnapshot:
+        """
+        Identify every inventory slot. Assumes the inventory tab is open.
+
+        Args:
+            sc: Window screenshot; captured if not given.
+            candidates: Items expected in the inventory: preferred when several
+                items share a sprite, and tried by template match for slots
+                the hash index can't identify.
+            read_counts: Read stack counts of stackable items (others count 1).
+            min_confidence: Template-match threshold for the fallback.
+        """
+        sc = sc or self.client.get_screenshot()
+        index = self.build_index()
+        db = ItemLookup()
+        grid = self._layout()
+        region = grid.region(sc)
+        occupancy, outside = self._occupancy(grid, region)
+        wanted = [i for i in (db.get_item(c) for c in candidates) if i]
+        prefer = {i.id for i in wanted}
+        fallback = [i for i in wanted if i.icon_b64]
+
+        out: List[InventorySlot] = []
+        stacks: List[int] = []
+        for idx, m in enumerate(grid.slots):
+            if not occupancy.is_occupied(idx):
+                out.append(InventorySlot(idx, m, confidence=1 - float(outside[idx]), empty=True))
+                continue
+            sx, sy = m.start_x - grid.box[0], m.start_y - grid.box[1]
+            best, best_score = index.identify(region[sy:sy + SLOT_H, sx:sx + SLOT_W], prefer)
+            if best is None:
+                best, best_score = self._template_fallback(sc, m, fallback, min_confidence)
+                if best is None:
+                    out.append(InventorySlot(idx, m, confidence=best_score))
+                    continue
+
+            if best.stackable or best.noted:
+                stacks.append(idx)
+            out.append(InventorySlot(idx, m, best.id, best.name, 1, best_score))
+
+        if read_counts and stacks:
+            # every count band from this frame in one pass
+            counts = ocr.read_stack_counts(sc, [out[i].match for i in stacks])
+            for i, count in zip(stacks, counts):
+                if count is None:
+                    self.log.debug(f'Failed to read stack count in slot {i}')
+                    continue
+                out[i] = replace(out[i], count=count)
+
+        return InventorySnapshot(tuple(out), time.time())
+
+    def _template_fallback(
+            self, sc: Image.Image, slot: MatchResult,
+            items: List[Item], min_confidence: float
+        ) -> Tuple[Optional[Item], float]:
+        pad = 4
+        area = slot.scale_px(pad)
+        crop = area.crop_in(sc)
+        best, best_match = None, None
+        for item in items:
+            match = tools.find_subimage(crop, item.icon, min_scale=1, max_scale=1)
+            if best_match is None or match.confidence > best_match.confidence:
+                best, best_match = item, match
+        if best is None or best_match.confidence < min_confidence:
+            return None, best_match.confidence if best_match else 0.0
+
+        # the match tells us where the slot really is; keep the grid aligned with it
+        ox, oy = best.icon_offset
+        dx = best_match.start_x - (pad + ox)
+        dy = best_match.start_y - (pad + oy)
+        if (dx or dy) and abs(dx) <= pad and abs(dy) <= pad:
+            self._align = (self._align[0] + dx, self._align[1] + dy)
+            self.log.info(f'Inventory grid realigned by ({dx}, {dy}) -> {self._align}')
+        return best, best_match.confidence
@@ -1,14 +1,19 @@
+from __future__ import annotations
+
 import json
+import threading
 from dataclasses import dataclass
-from typing import Dict, Optional, Any
-from core.logger import get_logger
-from PIL import Image
+from typing import Dict, List, Optional, Any, Tuple, TYPE_CHECKING
 from io import BytesIO
 import base64
-from core import tools
-from core import ocr
 from core.logger import get_logger
 
+# PIL/cv2/tesseract are only needed for icons and stack counts, so they are
+# imported on use; item lookups stay cheap to import for standalone tools.
+if TYPE_CHECKING:
+    from PIL import Image
+    from core.region_match import MatchResult
+
 @dataclass
 class Item:
     """
@@ -27,6 +32,8 @@ class Item:
     lowalch: int
     highalch: int
     icon_b64: Optional[str] = None
+    # top-left of the (border-cropped) icon within the 36x32 inventory sprite
+    icon_offset: Tuple[int, int] = (0, 0)
     log = get_logger('Item')
 
     @property
@@ -35,64 +42,52 @@ class Item:
         Returns the icon image of the item.
         """
         if self.icon_b64:
+            from PIL import Image
             return Image.open(BytesIO(base64.b64decode(self.icon_b64)))
         return None
     
-    def get_count(self, item_match: tools.MatchResult, sc: Image.Image) -> int:
+    def get_count(self, item_match: MatchResult, sc: Image.Image) -> int:
         """
         Extracts and returns the item count from the provided screenshot and match area.
         """
-        center = item_match.get_center()
-
-        match = tools.MatchResult(
-            start_x=center[0]-14,
-            start_y=center[1]-30,
-            end_x=center[0]+25,
-            end_y=center[1]-5
-        )
-        #match.debug_draw(sc).show()
-        
-        scc = match.crop_in(sc)
-        num_img = tools.mask_colors(scc, [
-            (255, 255, 0), # < 100k
-            # TODO: actually handle these
-            # (255,255,255), # > 100k
-            # (0, 255, 128)  # > 10M
-        ], tolerance=5)
-
-        try:
-            return ocr.get_number(
-                num_img,
-                ocr.FontChoice.RUNESCAPE_PLAIN_11,
-            )
-        except Exception as e:
-            self.log.error(f'Failed to get count for item: {self.name} - {str(e)}')
-            match.debug_draw(sc).show()
+        from core import ocr
+        # the match covers the border-cropped icon; the count band is placed from the slot's corner
+        ox, oy = self.icon_offset
+        count = ocr.read_stack_count(sc, item_match.transform(-ox, -oy))
+        if count is None:
+            self.log.error(f'Failed to get count for item: {self.name} at {item_match}')
             return 0
+        return count
 
 class ItemLookup:
     """
     Singleton class for looking up items in the OSRS database.
     """
     _instance = None
+    # guards the one-time load when startup stages construct it concurrently
+    _init_lock = threading.Lock()
 
     def __new__(cls, *args, **kwargs):
-        if not cls._instance:
-            cls._instance = super(ItemLookup, cls).__new__(cls)
+        with cls._init_lock:
+            if not cls._instance:
+                cls._instance = super(ItemLookup, cls).__new__(cls)
         return cls._instance
 
     def __init__(self):
-        if not hasattr(self, "_items_by_id"):
-            self.log = get_logger('ItemLookup')
-            self.log.info("Initializing ItemLookup...")
-            self._items_by_id: Dict[int, Item] = {}
-            self._items_by_name: Dict[str, Item] = {}
-            self._load_data()
-            self.log.info(f"Loaded {len(self._items_by_id)} items into cache.")
+        with self._init_lock:
+            if not hasattr(self, "_items_by_id"):
+                self.log = get_logger('ItemLookup')
+                self.log.info("Initializing ItemLookup...")
+                items_by_id: Dict[int, Item] = {}
+                items_by_name: Dict[str, Item] = {}
+                self._load_data(items_by_id, items_by_name)
+                self._items_by_name = items_by_name
+                self._items_by_id = items_by_id
+                self.log.info(f"Loaded {len(self._items_by_id)} items into cache.")
 
-    def _load_data(self):
+    def _load_data(self, items_by_id: Dict[int, Item], items_by_name: Dict[str, Item]):
         """
-        Loads data from JSON files, filters out duplicates, and populates the item cache.
+        Loads data from JSON files, filters out duplicates, and populates the given lookups.
         """
         try:
             with open("data/items/items-cache-data.json", "r") as f:
@@ -106,15 +101,19 @@ class ItemLookup:
 
             for item in items_data.values():
                 # Filter out duplicates: only include items with linked_id_item=None and linked_id_placeholder!=None
-                if (item["linked_id_item"] is None and item["linked_id_placeholder"] is not None) or item["id"] not in self._items_by_id.keys():
+                if (item["linked_id_item"] is None and item["linked_id_placeholder"] is not None) or item["id"] not in items_by_id.keys():
                     icon_b64 = icons_data.get(str(item["id"]))
+                    icon_offset = (0, 0)
 
                     # Crop transparent borders if icon exists
                     if icon_b64:
                         try:
-                            img = base64_to_image(icon_b64)
+                            img = base64_to_image(icon_b64).convert("RGBA")
+                            bbox = img.getchannel("A").getbbox()
                             cropped = crop_transparent_border(img)
                             icon_b64 = image_to_base64(cropped, fmt="PNG")
+                            if bbox:
+                                icon_offset = (bbox[0], bbox[1])
                         except Exception as e:
                             # Keep original icon if something goes wrong, but log once
                             self.log.debug(f"Icon crop failed for item {item['id']} - {item['name']}: {e}")
@@ -133,12 +132,13 @@ class ItemLookup:
                         cost=item["cost"],
                         lowalch=item["lowalch"],
                         highalch=item["highalch"],
-                        icon_b64=icon_b64
+                        icon_b64=icon_b64,
+                        icon_offset=icon_offset
                     )
 
                     # Populate lookup dictionaries
-                    self._items_by_id[item_obj.id] = item_obj
-                    self._items_by_name[item_obj.name.lower()] = item_obj
+                    items_by_id[item_obj.id] = item_obj
+                    items_by_name[item_obj.name.lower()] = item_obj
 
         except Exception as e:
             raise RuntimeError(f"Failed to load item data: {e}")
@@ -168,6 +168,12 @@ class ItemLookup:
             return self.get_item_by_name(item)
         return None
 
+    def items(self) -> List[Item]:
+        """
+        Returns every loaded item.
+        """
+        return list(self._items_by_id.values())
+
     def search_items(self, query: str) -> Dict[int, Item]:
         """
         Searches for items whose names contain the query string (case-insensitive).
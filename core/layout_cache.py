@@ -0,0 +1,98 @@
+"""
+Persisted UI layout calibration.
+
+Locating the minimap, toolplane icons and chat box is fully determined by
+the window size and UI type, so the calibrated geometry is saved to disk
+and reused on the next start. The client spot-checks a few cached regions
+before trusting an entry and falls back to a full search if they fail.
+"""
+import json
+import threading
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from core.region_match import MatchResult
+from core.logger import get_logger
+
+CACHE_PATH = Path('data/cache/ui_layout.json')
+
+log = get_logger('LayoutCache')
+
+
+def serialize_context(ctx: Any) -> Dict[str, Dict]:
+    """All MatchResult attributes of a UI context (MinimapContext, ToolplaneContext, UISectors)."""
+    return {
+        name: asdict(value)
+        for name, value in vars(ctx).items()
+        if isinstance(value, MatchResult)
+    }
+
+
+def restore_context(ctx: Any, data: Dict[str, Dict]) -> None:
+    for name, fields in data.items():
+        setattr(ctx, name, MatchResult(**fields))
+
+
+class LayoutCache:
+    """JSON file of calibrated layouts keyed by username, window size and UI type."""
+
+    def __init__(self, path: Path = CACHE_PATH):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(username: str, size: Tuple[int, int], ui_type: str) -> str:
+        return f"{username}|{size[0]}x{size[1]}|{ui_type}"
+
+    def _read(self) -> Dict[str, Dict]:
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            log.warning(f"Ignoring unreadable layout cache {self.path}: {e}")
+            return {}
+
+    def candidates(self, username: str, size: Tuple[int, int]) -> List[Dict]:
+        """Cached entries for this user and window size, newest first (any UI type)."""
+        prefix = f"{username}|{size[0]}x{size[1]}|"
+        with self._lock:
+            data = self._read()
+        entries = [v for k, v in data.items() if k.startswith(prefix)]
+        return sorted(entries, key=lambda e: e.get('saved_at', 0), reverse=True)
+
+    def store(self, username: str, size: Tuple[int, int], ui_type: str,
+              minimap: Any, toolplane: Any, sectors: Any) -> None:
+        entry = {
+            'ui_type': ui_type,
+            'size': list(size),
+            'saved_at': time.time(),
+            'minimap': serialize_context(minimap),
+            'toolplane': serialize_context(toolplane),
+            'sectors': serialize_context(sectors),
+        }
+        with self._lock:
+            data = self._read()
+            data[self.key(username, size, ui_type)] = entry
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = self.path.with_suffix('.tmp')
+                with open(tmp, 'w') as f:
+                    json.dump(data, f)
+                tmp.replace(self.path)
+            except OSError as e:
+                log.warning(f"Failed to save layout cache: {e}")
+
+    def invalidate(self, username: str, size: Tuple[int, int], ui_type: str) -> None:
+        with self._lock:
+            data = self._read()
+            if data.pop(self.key(username, size, ui_type), None) is None:
+                return
+            try:
+                with open(self.path, 'w') as f:
+                    json.dump(data, f)
+            except OSError as e:
+                log.warning(f"Failed to update layout cache: {e}")
@@ -1,13 +1,18 @@
+from __future__ import annotations
+
 import logging
 from logging import StreamHandler
 from logging.handlers import RotatingFileHandler
-from typing import Optional
+from typing import Optional, TYPE_CHECKING
 import threading
-import asyncio
 import json
-import websockets
 import time  # Add time module import
 
+# asyncio/websockets are only needed once the WebSocket server starts
+if TYPE_CHECKING:
+    import asyncio
+    import websockets
+
 # Track when the application started
 _start_time = time.time()
 
@@ -25,6 +30,10 @@ _ws_event_loop: asyncio.AbstractEventLoop | None = None
 _ws_start_lock = threading.Lock()
 _ws_server_started = False
 
+# Server thread, started by the first log record (see _ensure_ws_thread_started)
+_ws_thread: threading.Thread | None = None
+_ws_thread_lock = threading.Lock()
+
 # Function to get logger names - will be set by LoggerWrapper
 _get_logger_names = None
 
@@ -117,6 +126,7 @@ class WebSocketLogHandler(logging.Handler):
         return f"{hours:02}:{minutes:02}:{seconds:02}"
 
     def emit(self, record: logging.LogRecord) -> None:
+        _ensure_ws_thread_started()
         try:
             # Build a dictionary containing all the context we want:
             payload = {
@@ -136,6 +146,7 @@ class WebSocketLogHandler(logging.Handler):
 
         # Schedule sending to clients on the websocket event loop
         if _ws_event_loop and _ws_event_loop.is_running():
+            import asyncio
             asyncio.run_coroutine_threadsafe(self._broadcast(text, record.name), _ws_event_loop)
 
     async def _broadcast(self, text: str, logger_name: str) -> None:
@@ -180,6 +191,9 @@ def _start_websocket_server(host: str = "0.0.0.0", port: int = 8765) -> None:
             return  # already running
         _ws_server_started = True
 
+    import asyncio
+    import websockets
+
     # Create and set a fresh event loop for this thread
     loop = asyncio.new_event_loop()
     asyncio.set_event_loop(loop)
@@ -312,11 +326,15 @@ def _start_websocket_server(host: str = "0.0.0.0", port: int = 8765) -> None:
 def _ensure_ws_thread_started():
     """
     Guarantee that the WebSocket server thread is up and running.
+    Called on the first emitted record rather than at import time.
     """
-    global _ws_server_started
-    if not _ws_server_started:
-        t = threading.Thread(target=_start_websocket_server, daemon=True)
-        t.start()
+    global _ws_thread
+    if _ws_thread is not None:
+        return
+    with _ws_thread_lock:
+        if _ws_thread is None:
+            _ws_thread = threading.Thread(target=_start_websocket_server, name='logger-ws', daemon=True)
+            _ws_thread.start()
 
 
 # ------------------------------------------------------------------------------
@@ -347,8 +365,7 @@ class LoggerWrapper:
         global _get_logger_names, _set_logger_level
         _get_logger_names = self.get_logger_names
         _set_logger_level = self.set_logger_level
-        # Kick off the WebSocket server thread on first use:
-        _ensure_ws_thread_started()
+        # The WebSocket server thread starts with the first emitted record
         # Configure root logger to WARNING to reduce noise from external libraries
         logging.basicConfig(level=logging.WARNING)  # Changed from DEBUG to WARNING
     
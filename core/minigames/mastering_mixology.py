@@ -5,10 +5,12 @@ from core.logger import get_logger
 from pathlib import Path
 from enum import Enum
 from core import tools
+from core import templates
 from typing import List, Tuple
 import time
 import random
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import as_completed
+from core.executor import Lane
 import threading
 from core.region_match import MatchResult, MatchShape
 import cv2
@@ -20,11 +22,12 @@ AGA = (0, 230, 118)
 LYE = (233, 30, 99)
 
 IMG_PATH = "data/ui/mastering_mixology"
-HEADER = Image.open(f"{IMG_PATH}/orders_header.png")
-AGITATOR = Image.open(f"{IMG_PATH}/actions/agitator_raw.png")
-ALEMBIC = Image.open(f"{IMG_PATH}/actions/alembic_raw.png")
-RETORT = Image.open(f"{IMG_PATH}/actions/retort_raw.png")
-ORDER_DONE = Image.open(f"{IMG_PATH}/order_done.png")
+# template paths; decoded on first use through core.templates
+HEADER = f"{IMG_PATH}/orders_header.png"
+AGITATOR = f"{IMG_PATH}/actions/agitator_raw.png"
+ALEMBIC = f"{IMG_PATH}/actions/alembic_raw.png"
+RETORT = f"{IMG_PATH}/actions/retort_raw.png"
+ORDER_DONE = f"{IMG_PATH}/order_done.png"
 
 POTS_UNFISHISHED = {
     'aaa': 30014,  # Aerial ale
@@ -63,11 +66,11 @@ class Action(Enum):
         Get the image associated with the action.
         """
         if action == Action.AGITATOR:
-            return AGITATOR
+            return templates.get(AGITATOR)
         elif action == Action.ALEMBIC:
-            return ALEMBIC
+            return templates.get(ALEMBIC)
         elif action == Action.RETORT:
-            return RETORT
+            return templates.get(RETORT)
         else:
             raise ValueError(f"Unknown action: {action}")
         
@@ -97,7 +100,7 @@ class Order:
         # only need second half
         match.start_x = match.start_x + (match.width/2)
         sc = self.match.crop_in(sc)
-        m = tools.find_subimage(sc,ORDER_DONE)
+        m = tools.find_subimage(sc, templates.get(ORDER_DONE))
         if m.confidence > .90:
             return True
         return False
@@ -234,14 +237,14 @@ class MasteringMixology():
         """
         Get the UI element for the orders header.
         """
-        m = self.bot.client.find_in_window(HEADER)
+        m = self.bot.client.find_in_window(templates.get(HEADER))
         m.width = 225
         m.end_y = m.start_y + 200
         return m
     
     def get_orders(self, _retry: int = 3) -> List['Order']:
         
-        m = self.bot.client.find_in_window(HEADER)
+        m = self.bot.client.find_in_window(templates.get(HEADER))
         sc = self.bot.client.get_screenshot()
         
         matches: List[tools.MatchResult] = [
@@ -540,8 +543,7 @@ class MasteringMixology():
     
     def _get_station_state(self,order: Order, retries: int = 3) -> int:
         action = order.action
-        sc = self.bot.client.get_filtered_screenshot()
-        sc = self.order_ui.remove_from(sc)
+        sc = self.bot.client.get_filtered_screenshot(filter_out=[self.order_ui])
         ans = 1
         def find_station_tile():
             return tools.find_color_box(sc, self.station_tile, tol=30)
@@ -549,18 +551,18 @@ class MasteringMixology():
         def find_quick_action_tile():
             return tools.find_color_box(sc, self.quick_action_tile, tol=30)
 
-        with ThreadPoolExecutor(max_workers=2) as executor:
-            futures = {
-            executor.submit(find_station_tile): "station_tile",
-            executor.submit(find_quick_action_tile): "quick_action_tile"
-            }
+        executor = self.bot.client.executor
+        futures = {
+            executor.submit(Lane.CV, find_station_tile): "station_tile",
+            executor.submit(Lane.CV, find_quick_action_tile): "quick_action_tile"
+        }
 
-            results = {}
-            for future in as_completed(futures):
-                try:
-                    results[futures[future]] = future.result()
-                except:
-                    pass
+        results = {}
+        for future in as_completed(futures):
+            try:
+                results[futures[future]] = future.result()
+            except:
+                pass
 
         if "station_tile" in results and "quick_action_tile" in results:
             if results["station_tile"].confidence > results["quick_action_tile"].confidence:
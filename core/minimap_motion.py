@@ -0,0 +1,138 @@
+"""
+Movement detection from the minimap, without OCR.
+
+The minimap scrolls smoothly under the player dot while walking or running,
+so two small captures a frame or two apart are enough: the crop is reduced
+to a downsampled grayscale square and the shift between consecutive samples
+is estimated by phase correlation. A confident shift gives the direction
+and speed; a still minimap means the player isn't moving. Camera rotation
+also changes the minimap but doesn't correlate as a shift, so it is
+reported as inconclusive rather than as movement.
+"""
+from __future__ import annotations
+
+import math
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional, Tuple, TYPE_CHECKING
+
+import cv2
+import numpy as np
+
+from core.logger import get_logger
+from core.region_match import MatchResult
+
+if TYPE_CHECKING:
+    from core.osrs_client import RuneLiteClient
+
+DOWNSAMPLE = 2
+# share of the minimap's bounding box kept (the inscribed square of the round map)
+INNER = 0.68
+# mean absolute grayscale difference below which the minimap is considered still
+STILL_DIFF = 1.5
+# shift (downsampled px) and correlation response needed to call it movement;
+# walking scrolls the map about 1 px per 0.15 s at the default zoom
+MIN_SHIFT = 0.25
+MIN_RESPONSE = 0.15
+# rough minimap scale at the default zoom, for tiles/s estimates
+PX_PER_TILE = 4.0
+
+
+@dataclass(frozen=True)
+class MotionSample:
+    """
+    moving: True/False, or None when the minimap changed without a clean
+        shift (camera rotation, dots moving, interface in the way).
+    direction: unit vector of the player's movement on screen (x right, y down);
+        the map scrolls the opposite way.
+    """
+    moving: Optional[bool]
+    direction: Tuple[float, float]
+    speed: float        # minimap px per second (full resolution)
+    response: float     # phase-correlation peak, 0..1
+    diff: float         # mean absolute grayscale difference
+    dt: float
+    timestamp: float
+
+    @property
+    def tiles_per_second(self) -> float:
+        return self.speed / PX_PER_TILE
+
+
+class MinimapMotion:
+    """Estimates player movement by differencing consecutive minimap captures."""
+
+    def __init__(self, client: 'RuneLiteClient'):
+        self.client = client
+        self.log = get_logger('MinimapMotion')
+        self._lock = threading.Lock()
+        self._roi_key = None
+        self._roi: Optional[MatchResult] = None
+        self._window: Optional[np.ndarray] = None
+        self._prev: Optional[Tuple[np.ndarray, float]] = None
+        self.last: Optional[MotionSample] = None
+
+    def _region(self) -> MatchResult:
+        key = self.client.layout_version
+        if self._roi_key != key:
+            m = self.client.minimap.map
+            cx, cy = m.get_center()
+            half = int(min(m.end_x - m.start_x, m.end_y - m.start_y) * INNER / 2)
+            half -= half % DOWNSAMPLE
+            self._roi = MatchResult(cx - half, cy - half, cx + half, cy + half)
+            size = 2 * half // DOWNSAMPLE
+            # taper the edges so the square border doesn't dominate the correlation
+            self._window = cv2.createHanningWindow((size, size), cv2.CV_32F)
+            self._prev = None
+            self._roi_key = key
+        return self._roi
+
+    def _frame(self, roi: MatchResult) -> np.ndarray:
+        rgb = np.asarray(self.client.capture_region(roi), dtype=np.float32)
+        gray = rgb @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+        h, w = gray.shape
+        return gray.reshape(h // DOWNSAMPLE, DOWNSAMPLE, w // DOWNSAMPLE, DOWNSAMPLE).mean(axis=(1, 3))
+
+    def sample(self) -> Optional[MotionSample]:
+        """Compare a fresh capture with the previous one; None on the first call."""
+        with self._lock:
+            roi = self._region()
+            frame, now = self._frame(roi), time.time()
+            prev, self._prev = self._prev, (frame, now)
+            if prev is None or prev[0].shape != frame.shape:
+                return None
+            before, t0 = prev
+            dt = max(now - t0, 1e-3)
+            diff = float(np.abs(frame - before).mean())
+            if diff < STILL_DIFF:
+                sample = MotionSample(False, (0.0, 0.0), 0.0, 1.0, diff, dt, now)
+            else:
+                (sx, sy), response = cv2.phaseCorrelate(before, frame, self._window)
+                shift = math.hypot(sx, sy)
+                if response >= MIN_RESPONSE and shift >= MIN_SHIFT:
+                    # map content moves opposite to the player
+                    direction = (-sx / shift, -sy / shift)
+                    speed = shift * DOWNSAMPLE / dt
+                    sample = MotionSample(True, direction, speed, float(response), diff, dt, now)
+                else:
+                    sample = MotionSample(None, (0.0, 0.0), 0.0, float(response), diff, dt, now)
+            self.last = sample
+            return sample
+
+    def is_moving(self, interval: float = 0.15) -> Optional[bool]:
+        """
+        Two samples `interval` apart (reusing a recent previous capture when there
+        is one). True/False when the minimap says so clearly, None when inconclusive.
+        """
+        prev, now = self._prev, time.time()
+        if prev is None or now - prev[1] > 4 * interval or self._roi_key != self.client.layout_version:
+            self.sample()
+            wait = interval
+        else:
+            # the client needs a frame or two to redraw the minimap
+            wait = interval - (now - prev[1])
+        if wait > 0:
+            time.sleep(wait)
+        sample = self.sample()
+        return sample.moving if sample else None
@@ -9,7 +9,8 @@ from core import tools
 import math
 import json
 import pyperclip
-from typing import List, Dict, Set
+from typing import List, Dict, Set, Tuple, Optional
+from dataclasses import dataclass
 import itertools
 
 GOOD_TILE_COLORS = [
@@ -21,6 +22,38 @@ GOOD_TILE_COLORS = [
 
 ]
 
+# running covers two tiles per 0.6 s game tick
+RUN_TILES_PER_S = 2 / 0.6
+# tiles from the end of a leg at which the next leg's click is issued
+PIPELINE_TILES = 3
+# keep minimap clicks this far inside the map edge (px)
+MINIMAP_EDGE_MARGIN = 12
+MAX_ZOOM = 5
+
+
+@dataclass(frozen=True)
+class CompiledLeg:
+    index: int
+    tile: 'TileValue'
+    dx: int                     # world tiles from the previous waypoint (east +)
+    dy: int                     # (north +); 0 for the first leg
+    distance: int               # Chebyshev distance in tiles
+    expected_s: float           # running time for the leg
+    zoom: int                   # minimap zoom that keeps the leg on the map
+    click_offset: Tuple[int, int]   # px from the minimap centre towards the waypoint
+
+    @property
+    def waypoint(self) -> WaypointParam:
+        return self.tile.waypoint
+
+
+@dataclass(frozen=True)
+class CompiledRoute:
+    legs: Tuple[CompiledLeg, ...]
+    total_distance: int
+    expected_s: float
+
+
 class MovementOrchestrator:
     def __init__(self, client: RuneLiteClient):
         self.log = get_logger('MovementOrchestrator')
@@ -38,6 +71,8 @@ class MovementOrchestrator:
         self.south_west: MatchResult = None
         self.get_minimap_sectors()
         self._zoom_level = 0
+        # route waypoint values -> compiled route
+        self._compiled: Dict[Tuple, CompiledRoute] = {}
 
     def get_minimap_sectors(self):
         m = self.minimap
@@ -309,28 +344,119 @@ class MovementOrchestrator:
                     return self.north
 
 
-    def execute_route(self, route: RouteParam):
+    def _minimap_radius(self) -> float:
+        m = self.minimap
+        return min(m.width, m.height) / 2 - MINIMAP_EDGE_MARGIN
+
+    def leg_click_offset(self, dx: int, dy: int, zoom: int) -> Tuple[int, int]:
+        """
+        Minimap pixel offset (from the centre) towards a point (dx, dy) tiles away.
+        At zoom z the map edge is ~8*z tiles out (the same scale determine_direction
+        zooms by), so legs within that range are clicked on target; longer ones
+        are clicked at the edge in the right direction. Assumes the compass faces north.
+        """
+        dist = max(abs(dx), abs(dy))
+        if not dist:
+            return (0, 0)
+        reach = 8 * max(zoom, 1)
+        scale = self._minimap_radius() / reach
+        if dist > reach:
+            scale *= reach / dist
+        # world y grows north, screen y grows down
+        return (int(round(dx * scale)), int(round(-dy * scale)))
+
+    def compile_route(self, route: RouteParam) -> CompiledRoute:
+        """Legs with distances, expected times and click points; cached per route."""
+        key = tuple((wp.x, wp.y, wp.z, wp.chunk, wp.tolerance) for wp in route.waypoints)
+        compiled = self._compiled.get(key)
+        if compiled is not None:
+            return compiled
+
+        legs = []
+        prev: Optional[WaypointParam] = None
+        for i, waypoint in enumerate(route.waypoints):
+            color = GOOD_TILE_COLORS[i % len(GOOD_TILE_COLORS)]
+            dx = waypoint.x - prev.x if prev else 0
+            dy = waypoint.y - prev.y if prev else 0
+            distance = max(abs(dx), abs(dy))
+            zoom = min(max(math.ceil(distance / 8), 1), MAX_ZOOM)
+            legs.append(CompiledLeg(
+                index=i,
+                tile=TileValue(waypoint, color),
+                dx=dx, dy=dy,
+                distance=distance,
+                expected_s=distance / RUN_TILES_PER_S,
+                zoom=zoom,
+                click_offset=self.leg_click_offset(dx, dy, zoom),
+            ))
+            prev = waypoint
+        compiled = CompiledRoute(
+            legs=tuple(legs),
+            total_distance=sum(leg.distance for leg in legs),
+            expected_s=sum(leg.expected_s for leg in legs),
+        )
+        # ground markers only need importing once per route
+        self.tile_import([leg.tile for leg in legs])
+        self._compiled[key] = compiled
+        self.log.info(
+            f"Compiled route: {len(legs)} legs, {compiled.total_distance} tiles, "
+            f"~{compiled.expected_s:.1f}s running"
+        )
+        return compiled
+
+    def execute_route(self, route: RouteParam) -> bool:
         """
         Executes a route by moving to each waypoint in the route.
+        Returns False if a waypoint couldn't be reached.
         """
         self.log.info(f"Executing route with {len(route.waypoints)} waypoints")
         self.route = route
-        
-        
-        # Convert waypoints to TileValue objects with cycling colors
-        route_tiles = []
-        for i, waypoint in enumerate(route.waypoints):
-            color_index = i % len(GOOD_TILE_COLORS)
-            color = GOOD_TILE_COLORS[color_index]
-            route_tiles.append(TileValue(waypoint, color))
-        
-        self.current_route = route_tiles
-        
-        # Import tiles for the route
-        self.tile_import(route_tiles)
-        
-        # Execute the route
-        self._do_route(route_tiles)
+        compiled = self.compile_route(route)
+        self.current_route = [leg.tile for leg in compiled.legs]
+        return self._run_compiled(compiled)
+
+    def _click_offset(self, offset: Tuple[int, int], zoom: int):
+        if zoom != self._zoom_level:
+            self.set_minimap_zoom(zoom)
+        ox, oy = offset
+        cx, cy = self.minimap.get_center()
+        target = MatchResult(cx + ox - 2, cy + oy - 2, cx + ox + 3, cy + oy + 3, shape=MatchShape.ELIPSE)
+        self.client.click(target)
+
+    def _run_compiled(self, compiled: CompiledRoute):
+        """
+        Walk the legs, clicking the next leg once the player is within
+        PIPELINE_TILES of the current waypoint instead of waiting to stop.
+        Each leg is clicked at its compiled zoom, and at its compiled click
+        point when the player stands where the leg starts; otherwise the point
+        is aimed from the live position. Legs that end short fall back to
+        go_to_waypoint's corrective steering.
+        """
+        tracker = self.client.position
+        last = len(compiled.legs) - 1
+        for leg in compiled.legs:
+            wp = leg.waypoint
+            self.log.info(f"Leg {leg.index + 1}/{last + 1}: {leg.distance} tiles, ~{leg.expected_s:.1f}s")
+            x, y, _ = self.get_position().tile
+            dx, dy = wp.x - x, wp.y - y
+            if max(abs(dx), abs(dy)) > wp.tolerance:
+                if not leg.index:
+                    # the first leg starts wherever the player is
+                    zoom = min(max(math.ceil(max(abs(dx), abs(dy)) / 8), 1), MAX_ZOOM)
+                    self._click_offset(self.leg_click_offset(dx, dy, zoom), zoom)
+                elif max(abs(dx - leg.dx), abs(dy - leg.dy)) <= 1:
+                    self._click_offset(leg.click_offset, leg.zoom)
+                else:
+                    self._click_offset(self.leg_click_offset(dx, dy, leg.zoom), leg.zoom)
+            # the next click can go out a few tiles early; the last leg has to arrive
+            reach = wp.tolerance if leg.index == last else wp.tolerance + PIPELINE_TILES
+            timeout = leg.expected_s * 2 + 3
+            if not tracker.wait_until_within(wp.x, wp.y, reach, timeout=timeout):
+                self.log.warning(f"Leg {leg.index + 1} not reached in {timeout:.1f}s; steering")
+                if not self.go_to_waypoint(leg.tile):
+                    return False
+        self.client.wait_until_stopped()
+        return True
 
     
     def _get_tile_key(self, tile: 'TileValue') -> str:
@@ -338,18 +464,6 @@ class MovementOrchestrator:
         wp = tile.waypoint
         return f"{wp.chunk}:{wp.x}:{wp.y}:{wp.z}"
         
-    def _do_route(self, tiles: List['TileValue']):
-        """
-        Execute a route by visiting each tile in sequence.
-        """
-        self.log.info(f"Executing route with {len(tiles)} tiles")
-        
-        for i, tile in enumerate(tiles):
-            self.log.info(f"Moving to waypoint {i+1}/{len(tiles)}")
-            self.go_to_waypoint(tile)
-            
-        self.log.info("Route execution completed")
-
     def go_to_waypoint(self, tile_value: 'TileValue') -> bool:
         """
         Move to a specific waypoint on the map.
@@ -380,11 +494,12 @@ class MovementOrchestrator:
                         rand_move_chance=0
                     )
 
-                while self.client.is_moving():
-                    time.sleep(0.1)
+                self.client.wait_until_stopped()
                 dx, dy = self.get_tile_diff(waypoint)
                 if abs(dx) >= waypoint.tolerance and abs(dy) >= waypoint.tolerance:
-                    return self.go_to_waypoint(tile_value)  # Retry if still not at waypoint
+                    # overshot while stopping; steer back within the same attempt budget
+                    attempts += 1
+                    continue
                 return True
             
             # If waypoint is very far, log a warning
@@ -405,10 +520,14 @@ class MovementOrchestrator:
                 # Wait for player to start moving
                 time.sleep(random.uniform(0.2, 0.5))
                 
-                # Wait for player to stop moving
+                # Wait until we arrive or stop short of the waypoint
                 start_time = time.time()
                 timeout = random.uniform(7,13)  # seconds
-                while self.client.is_moving():
+                tracker = self.client.position
+                while not tracker.wait_until_within(waypoint.x, waypoint.y, waypoint.tolerance, timeout=0.25):
+                    # movement starts on the next game tick, so don't read "still" as "arrived" too early
+                    if time.time() - start_time > 0.6 and not self.client.is_moving():
+                        break
                     if time.time() - start_time > timeout:
                         self.log.warning("Timeout waiting for player to stop moving")
                         break
@@ -1,2 +1,23 @@
-from .tess import get_number, execute, OcrError,find_string_bounds
-from .enums import FontChoice, TessPsm, TessOem
\ No newline at end of file
+from .enums import FontChoice, TessPsm, TessOem
+
+# Tesseract helpers are resolved on first access so that importing
+# `core.ocr` (e.g. for FontChoice) doesn't pull in pytesseract, cv2 or numpy.
+_LAZY = {
+    'get_number': 'tess',
+    'execute': 'tess',
+    'OcrError': 'tess',
+    'find_string_bounds': 'tess',
+    'read_stack_counts': 'stack_count',
+    'read_stack_count': 'stack_count',
+    'read_number': 'stack_count',
+}
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        import importlib
+        module = importlib.import_module(f'{__name__}.{_LAZY[name]}')
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
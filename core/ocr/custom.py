@@ -7,6 +7,7 @@ from data.fonts.location_numbers import digit_templates
 from core.tools import find_subimages, find_subimage
 from typing import Dict, List, Tuple
 from core.region_match import MatchResult
+from core import tracing
 
 # Cache for digit templates to avoid reloading
 _DIGIT_TEMPLATE_CACHE = None
@@ -72,6 +73,7 @@ def _match_digit(parent: Image.Image, template: Image.Image, digit: str) -> List
         
     return matches
 
+@tracing.traced("ocr.read_location_numbers", cat="ocr")
 def read_location_numbers(image: Image.Image) -> str:
     """
     Extract numerical text from images like coordinate displays.
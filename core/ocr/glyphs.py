@@ -0,0 +1,164 @@
+"""
+Glyph-template decoding for the fixed RuneScape bitmap fonts.
+
+Text is drawn without anti-aliasing, so once a line is reduced to a bool ink
+mask it splits into glyphs at empty columns and each glyph can be compared
+pixel-for-pixel with templates rendered from the game's TTF. Template sets
+are built per (font, charset) on first use; glyphs read by a tesseract
+fallback can be added to a set so later reads don't need it, but only when
+that read agrees with what the templates already recognise.
+"""
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+from core.logger import get_logger
+
+log = get_logger('ocr.glyphs')
+
+FONT_DIR = Path('data/fonts')
+PLAIN_11 = 'RuneScape Plain 11.ttf'
+BOLD_12 = 'RuneScape Bold 12.ttf'
+# the RuneScape TTFs are pixel fonts drawn on a 16px em
+GLYPH_SIZE = 16
+DIGITS = '0123456789'
+TEXT = DIGITS + 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz-/()\'.,:!?&+'
+MIN_GLYPH_SCORE = 0.85
+# empty columns between glyphs that make a space
+SPACE_GAP = 3
+
+Templates = Dict[str, List[np.ndarray]]
+_sets: Dict[Tuple[str, str], Templates] = {}
+_sets_lock = threading.Lock()
+
+
+def trim(glyph: np.ndarray) -> np.ndarray:
+    rows = np.flatnonzero(glyph.any(axis=1))
+    cols = np.flatnonzero(glyph.any(axis=0))
+    if not len(rows):
+        return glyph[:0, :0]
+    return glyph[rows[0]:rows[-1] + 1, cols[0]:cols[-1] + 1]
+
+
+def templates(charset: str, font: str = PLAIN_11) -> Templates:
+    key = (font, charset)
+    found = _sets.get(key)
+    if found is not None:
+        return found
+    with _sets_lock:
+        if key not in _sets:
+            out: Templates = {ch: [] for ch in charset}
+            try:
+                face = ImageFont.truetype(str(FONT_DIR / font), GLYPH_SIZE)
+                for ch in charset:
+                    # mode '1' renders without anti-aliasing
+                    img = Image.new('1', (GLYPH_SIZE * 2, GLYPH_SIZE * 2), 0)
+                    ImageDraw.Draw(img).text((2, 2), ch, font=face, fill=1)
+                    glyph = trim(np.array(img, dtype=bool))
+                    if glyph.size:
+                        out[ch].append(glyph)
+            except OSError as e:
+                log.warning(f'Font {font} unavailable ({e}); glyph templates empty')
+            _sets[key] = out
+    return _sets[key]
+
+
+def score(glyph: np.ndarray, template: np.ndarray) -> float:
+    h, w = max(glyph.shape[0], template.shape[0]), max(glyph.shape[1], template.shape[1])
+    a = np.zeros((h, w), dtype=bool)
+    b = np.zeros((h, w), dtype=bool)
+    a[:glyph.shape[0], :glyph.shape[1]] = glyph
+    b[:template.shape[0], :template.shape[1]] = template
+    return 1.0 - np.count_nonzero(a ^ b) / (h * w)
+
+
+def segments(ink: np.ndarray) -> Tuple[List[np.ndarray], List[int]]:
+    """Split a line mask into glyphs at empty columns; also returns the gap before each glyph."""
+    cols = np.flatnonzero(ink.any(axis=0))
+    if not len(cols):
+        return [], []
+    breaks = np.flatnonzero(np.diff(cols) > 1)
+    starts = np.concatenate(([cols[0]], cols[breaks + 1]))
+    ends = np.concatenate((cols[breaks], [cols[-1]])) + 1
+    gaps = [0] + [int(s - e) for s, e in zip(starts[1:], ends[:-1])]
+    return [trim(ink[:, a:b]) for a, b in zip(starts, ends)], gaps
+
+
+def best(glyph: np.ndarray, table: Templates) -> Tuple[Optional[str], float]:
+    """Character of the best-scoring template for `glyph`, and its score."""
+    found, found_score = None, 0.0
+    for ch, options in table.items():
+        for template in options:
+            s = score(glyph, template)
+            if s > found_score:
+                found, found_score = ch, s
+    return found, found_score
+
+
+def decode(glyphs: List[np.ndarray], charset: str, gaps: Optional[List[int]] = None,
+           font: str = PLAIN_11) -> Optional[str]:
+    """Best template per glyph, or None if any glyph has no good match."""
+    table = templates(charset, font)
+    text = ''
+    for i, glyph in enumerate(glyphs):
+        ch, ch_score = best(glyph, table)
+        if ch is None or ch_score < MIN_GLYPH_SCORE:
+            return None
+        if gaps and i and gaps[i] >= SPACE_GAP:
+            text += ' '
+        text += ch
+    return text
+
+
+def learn(glyphs: List[np.ndarray], text: str, charset: str, font: str = PLAIN_11,
+          max_unknown: Optional[int] = None) -> int:
+    """
+    Keep glyphs of a line read another way (tesseract) as extra templates,
+    only when that read is consistent with the templates we trust:
+
+    - the text lines up with the glyphs one character each;
+    - every glyph that already decodes confidently decodes to the character
+      the text has at its position (otherwise the read or the split is off);
+    - only glyphs without a confident match are added, at most `max_unknown`;
+    - a glyph whose exact pixels already belong to another character (or that
+      shows up twice in the line as different characters) is never added.
+
+    Returns the number of templates added.
+    """
+    text = text.replace(' ', '')
+    if len(glyphs) != len(text):
+        return 0
+    table = templates(charset, font)
+    unknown = []
+    for glyph, ch in zip(glyphs, text):
+        if ch not in table:
+            return 0
+        known, known_score = best(glyph, table)
+        if known is not None and known_score >= MIN_GLYPH_SCORE:
+            if known != ch:
+                return 0
+        else:
+            unknown.append((glyph, ch))
+    if not unknown or (max_unknown is not None and len(unknown) > max_unknown):
+        return 0
+    added = 0
+    with _sets_lock:
+        for glyph, ch in unknown:
+            clash = any(
+                score(glyph, t) == 1.0
+                for other, options in table.items() if other != ch for t in options
+            ) or any(
+                other != ch and score(glyph, g) == 1.0 for g, other in unknown
+            )
+            if clash or any(score(glyph, t) == 1.0 for t in table[ch]):
+                continue
+            table[ch].append(glyph)
+            added += 1
+    if added:
+        log.debug(f'Learned {added} glyph(s) from "{text}"')
+    return added
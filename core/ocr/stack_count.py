@@ -0,0 +1,144 @@
+"""
+Stack-count reader for item slots (inventory, bank, ...), and the small-font
+number reader shared with the minimap orbs.
+
+The count bands of every slot in a frame are gathered and colour-masked in a
+single numpy pass, then each band is split into glyph columns and matched
+against digit templates rendered from the RuneScape Plain 11 font.
+Yellow counts are literal, white ones end in K (100k+) and green ones in
+M (10M+). Bands the templates (core.ocr.glyphs) can't decode fall back to
+tesseract; glyphs of a fallback read that agrees with the templates are kept
+as extra templates (see glyphs.learn).
+"""
+from __future__ import annotations
+
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+from PIL import Image
+
+from core.logger import get_logger
+from core.ocr import glyphs
+from core.region_match import MatchResult
+
+log = get_logger('ocr.stack_count')
+
+CHARSET = glyphs.DIGITS + 'KM'
+
+# band holding the count, relative to the top-left of a 36x32 slot
+BAND_OFFSET = (-1, -2)
+BAND_W, BAND_H = 35, 15
+
+# text colour -> multiplier applied to the decoded number
+COUNT_COLOURS: Tuple[Tuple[Tuple[int, int, int], int], ...] = (
+    ((255, 255, 0), 1),             # < 100k
+    ((255, 255, 255), 1_000),       # 100k .. 10M, drawn as "123K"
+    ((0, 255, 128), 1_000_000),     # >= 10M, drawn as "12M"
+)
+SUFFIX = {1_000: 'K', 1_000_000: 'M'}
+COLOUR_TOLERANCE = 5
+# text is drawn with a black drop shadow one pixel down-right
+SHADOW_MAX = 40
+
+
+def _parse(text: str, multiplier: int) -> Optional[int]:
+    suffix = SUFFIX.get(multiplier, '')
+    if suffix:
+        if not text.endswith(suffix):
+            return None
+        text = text[:-1]
+    if not text.isdigit():
+        return None
+    return int(text) * multiplier
+
+
+def _tesseract(ink: np.ndarray, multiplier: int) -> Optional[int]:
+    from core import ocr
+    img = Image.fromarray(ink.astype(np.uint8) * 255, 'L')
+    try:
+        value = ocr.get_number(img, ocr.FontChoice.RUNESCAPE_PLAIN_11)
+    except Exception as e:
+        log.debug(f'Tesseract could not read stack count: {e}')
+        return None
+    return int(value) * multiplier
+
+
+def read_number(ink: np.ndarray) -> Optional[int]:
+    """
+    Plain number drawn in a bool text mask; templates first, tesseract as fallback.
+    Fallback reads are not learned from: orb values drive eating and prayer
+    flicking, so a misread must not outlive the frame it came from.
+    """
+    if not ink.any():
+        return None
+    found, _ = glyphs.segments(ink)
+    text = glyphs.decode(found, glyphs.DIGITS)
+    if text and text.isdigit():
+        return int(text)
+    return _tesseract(ink, 1)
+
+
+def count_masks(sc: Image.Image, slots: Sequence[MatchResult]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Text masks of every slot's count band, from one frame.
+
+    Returns:
+        ink: (N, BAND_H, BAND_W) bool, pixels drawn in a count colour (shadow-checked)
+        colour: (N,) index into COUNT_COLOURS of each band's dominant text colour
+    """
+    rgb = np.asarray(sc.convert('RGB') if sc.mode != 'RGB' else sc)
+    height, width = rgb.shape[:2]
+    x0 = np.array([s.start_x + BAND_OFFSET[0] for s in slots])
+    y0 = np.array([s.start_y + BAND_OFFSET[1] for s in slots])
+    ys = np.clip(y0[:, None, None] + np.arange(BAND_H)[None, :, None], 0, height - 1)
+    xs = np.clip(x0[:, None, None] + np.arange(BAND_W)[None, None, :], 0, width - 1)
+    bands = rgb[ys, xs].astype(np.int16)
+
+    colours = np.array([c for c, _ in COUNT_COLOURS], dtype=np.int16)
+    # (C, N, H, W): pixel within tolerance of each count colour
+    hits = (np.abs(bands[None] - colours[:, None, None, None]).max(axis=4) <= COLOUR_TOLERANCE)
+    ink = hits.any(axis=0)
+
+    # icons can contain count-coloured pixels; text always has a shadow (or more text) down-right
+    dark = bands.max(axis=3) < SHADOW_MAX
+    shadowed = np.zeros_like(ink)
+    shadowed[:, :-1, :-1] = dark[:, 1:, 1:] | ink[:, 1:, 1:]
+    ink &= shadowed
+    hits &= ink[None]
+    colour = hits.sum(axis=(2, 3)).argmax(axis=0)
+    return ink, colour
+
+
+def read_stack_counts(
+        sc: Image.Image,
+        slots: Sequence[MatchResult],
+        default: Optional[int] = 1
+    ) -> List[Optional[int]]:
+    """
+    Stack count of every slot in `slots` (36x32 slot rectangles, window coordinates).
+
+    Slots with no count drawn get `default` (a stack of one has no number).
+    Slots whose count can't be read by template or tesseract get None.
+    """
+    if not slots:
+        return []
+    ink, colour = count_masks(sc, slots)
+    out: List[Optional[int]] = []
+    for i in range(len(slots)):
+        if not ink[i].any():
+            out.append(default)
+            continue
+        multiplier = COUNT_COLOURS[colour[i]][1]
+        found, _ = glyphs.segments(ink[i])
+        text = glyphs.decode(found, CHARSET)
+        value = _parse(text, multiplier) if text else None
+        if value is None:
+            value = _tesseract(ink[i], multiplier)
+            if value is not None:
+                glyphs.learn(found, str(value // multiplier) + SUFFIX.get(multiplier, ''), CHARSET)
+        out.append(value)
+    return out
+
+
+def read_stack_count(sc: Image.Image, slot: MatchResult, default: Optional[int] = 1) -> Optional[int]:
+    return read_stack_counts(sc, [slot], default)[0]
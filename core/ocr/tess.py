@@ -7,8 +7,8 @@ import sys
 import shutil
 import re
 from typing import List, Tuple, Optional, Dict
-from difflib import SequenceMatcher
 from core.ocr.enums import TessOem, TessPsm, FontChoice
+from core import textmatch, tracing
 
 # Set Tesseract command path per OS
 if sys.platform.startswith('win'):
@@ -29,6 +29,7 @@ def _preprocess(pil_img: Image.Image) -> Image.Image:
 
             
 
+@tracing.traced("ocr.execute", cat="ocr")
 def execute(
         img: Image.Image,
         font: FontChoice = FontChoice.AUTO,
@@ -70,6 +71,7 @@ def execute(
     return ans
 
 
+@tracing.traced("ocr.find_string_bounds", cat="ocr")
 def find_string_bounds(
     img: Image.Image,
     string_to_search: str,
@@ -82,7 +84,7 @@ def find_string_bounds(
 ) -> Optional[Dict[str, float]]:
     """
     Locate the closest match to `string_to_search` in the image,
-    returning its bounding box and a difflib-based “confidence” score
+    returning its bounding box and a similarity “confidence” score
     between 0.0 and 1.0.
     """
     if preprocess:
@@ -114,10 +116,10 @@ def find_string_bounds(
         targ_words = [w.lower() for w in targ_words]
     target_joined = " ".join(targ_words)
 
-    best_score = -1.0
-    best_box = None
-
-    # Scan every line / every window of the right size
+    # Every window of the target's word count on every line, scored in one pass
+    L = len(targ_words)
+    windows: List[List[int]] = []
+    candidates: List[str] = []
     for idxs in lines.values():
         idxs.sort(key=lambda i: data["word_num"][i])
         words = [data["text"][i] for i in idxs]
@@ -125,41 +127,37 @@ def find_string_bounds(
         # strip punctuation for fair comparison
         words_stripped = [re.sub(r"[^\w'-]", "", w) for w in words_cmp]
 
-        L = len(targ_words)
         # if fewer words in line than target, skip
-        if len(words_stripped) < L:
-            continue
-
-        # slide window of length L
         for start in range(len(words_stripped) - L + 1):
-            window = words_stripped[start:start+L]
-            candidate = " ".join(window)
-            score = SequenceMatcher(None, candidate, target_joined).ratio()
-            if score <= best_score:
-                continue
-
-            # compute bounding box for this window
-            xs, ys, xe, ye = [], [], [], []
-            for widx in range(start, start+L):
-                i = idxs[widx]
-                x, y, w, h = data["left"][i], data["top"][i], data["width"][i], data["height"][i]
-                xs.append(x); ys.append(y)
-                xe.append(x + w); ye.append(y + h)
-
-            scale = 3 if preprocess else 1
-            x1 = min(xs)/scale - margin
-            y1 = min(ys)/scale - margin
-            x2 = max(xe)/scale + margin
-            y2 = max(ye)/scale + margin
-
-            best_score = score
-            best_box = {
-                "x1": int(max(x1, 0)),
-                "y1": int(max(y1, 0)),
-                "x2": int(x2),
-                "y2": int(y2),
-                "confidence": float(score),
-            }
+            windows.append(idxs[start:start+L])
+            candidates.append(" ".join(words_stripped[start:start+L]))
+
+    best_box = None
+    if candidates:
+        scores = textmatch.ratios(candidates, target_joined)
+        best = int(scores.argmax())
+        score = float(scores[best])
+
+        # compute bounding box for the best window
+        xs, ys, xe, ye = [], [], [], []
+        for i in windows[best]:
+            x, y, w, h = data["left"][i], data["top"][i], data["width"][i], data["height"][i]
+            xs.append(x); ys.append(y)
+            xe.append(x + w); ye.append(y + h)
+
+        scale = 3 if preprocess else 1
+        x1 = min(xs)/scale - margin
+        y1 = min(ys)/scale - margin
+        x2 = max(xe)/scale + margin
+        y2 = max(ye)/scale + margin
+
+        best_box = {
+            "x1": int(max(x1, 0)),
+            "y1": int(max(y1, 0)),
+            "x2": int(x2),
+            "y2": int(y2),
+            "confidence": score,
+        }
 
     print(f"best_box: {best_box}")
     return best_box
@@ -3,39 +3,47 @@ import time
 from PIL import Image
 import io
 from core.tools import (
-    find_subimage, MatchResult, MatchShape, timeit, write_text_to_image,
-    find_color_box, seconds_to_hms, find_subimages
+    find_subimage, MatchResult, MatchShape, timeit,
+    find_color_box, seconds_to_hms, ShapeResult
 )
 from core.input.mouse_control import click_in_match, move_to, ClickType, click
 from core import ocr
-from typing import Tuple, List, Optional, Dict, Any
+from typing import Tuple, List, Optional, Dict, Any, Iterable
 import threading
-import cv2
 import numpy as np
 from dataclasses import field
 from core.item_db import ItemLookup, Item
 from enum import Enum
 import random
 from pathlib import Path
-import keyboard
 from dataclasses import dataclass
-from concurrent.futures import ThreadPoolExecutor, wait, FIRST_EXCEPTION, TimeoutError, as_completed
+from concurrent.futures import as_completed
 
 from core import tools
+from core import templates
+from core import textmatch
 from core.control import ScriptControl
-import os
 import sys
 import pyautogui
 from core.window_manager import WindowManager
+from core.executor import ExecutorService, Lane
+from core.perception import PerceptionState
+from core.layout_cache import LayoutCache, restore_context
+from core.inventory import InventoryOccupancy, InventoryReader, InventorySnapshot
+from core.vitals import Vitals, VitalsSampler
+from core.position import PlayerPosition, PositionTracker, STILL_FOR
+from core.minimap_motion import MinimapMotion
+from core.hover_text import HoverTextReader
+from core.context_menu import ContextMenu, MenuOption
+from core.chat import ChatReader
+from core.skilling_state import SkillingStateReader
+from core.toolplane_state import ToolplaneTracker, best_tab, strip_bounds, tab_rects, tab_scores
 from PIL import ImageFilter
-from core.ocr.custom import read_location_numbers
 from core.logger import get_logger
 
 # Constants
-MAXTHREAD = os.cpu_count()
 control = ScriptControl()
-POSITION_STATE = Image.open('data/ui/player-position-state.png')
-ACTION_HOVER = Image.open('data/ui/action-hover.png')
+# template paths; decoded on first use through core.templates
 
 # Centralized randomness configuration for user interaction behavior
 @dataclass
@@ -82,6 +90,9 @@ class MinimapElement(Enum):
 
 class GenericWindow:
     """Represents a generic window with functionality to interact with it."""
+    # how long a positive focus check is trusted when the window can't report focus events
+    FOCUS_TTL = 1.0
+
     def __init__(self, window_title: str, randomness: InteractionRandomness | None = None):
         """
         Initialize the GenericWindow instance.
@@ -95,10 +106,22 @@ class GenericWindow:
         self.window_title = window_title
         self.window = None
         self._last_screenshot: Image.Image = None
+        # per-thread mss handle for capture_region
+        self._capture_local = threading.local()
+        # window-relative point of the last right click; context menus open there
+        self.last_right_click: Optional[Tuple[int, int]] = None
+        # bumped on every click; cached UI state (e.g. the active tab) checks it
+        self.click_count = 0
         self.window_manager = WindowManager.create()
         self.update_window()
         # Default/random behavior settings
         self.randomness: InteractionRandomness = randomness or InteractionRandomness()
+        # wall time of the first click, used to report time-to-first-action
+        self.first_action_at: float | None = None
+        self._focus_confirmed_at = 0.0
+        # checks: focus queried from the OS, cached: answered without a query,
+        # refocused: window actually had to be brought to the front
+        self.focus_stats: Dict[str, int] = {'checks': 0, 'cached': 0, 'refocused': 0}
 
     def update_window(self):
         """
@@ -114,13 +137,55 @@ class GenericWindow:
         self.window = windows[0] if windows else None
         return self.window
 
-    def start_resize_watch_polling(self, on_resize=None, interval=0.5):
+    def start_resize_watch(self, on_resize=None, interval=0.5):
+        """
+        Calls the resize handler as soon as the window moves or resizes.
+
+        Uses window-manager events when the platform window supports them
+        (see LinuxWindow.watch) and falls back to polling otherwise, including
+        when the event watcher stops later (window destroyed, X error). Changes
+        that arrive while the handler runs are coalesced into one more call.
+
+        Args:
+            on_resize (callable, optional): Callback function for resize events.
+            interval (float, optional): Polling interval used by the fallback.
+
+        Returns:
+            threading.Event: Event to stop the watcher.
+        """
+        changed = threading.Event()
+        window = self.window
+        watch = getattr(window, 'watch', None)
+        if not (watch and watch(lambda _geometry: changed.set())):
+            return self.start_resize_watch_polling(on_resize, interval)
+
+        def _loop():
+            while not stop_evt.is_set():
+                # timed wait so stop_evt is honoured without a change
+                if not changed.wait(interval):
+                    if not window.watching:
+                        self.log.warning('Window watcher stopped; polling for resizes instead')
+                        self.start_resize_watch_polling(on_resize, interval, stop_evt)
+                        return
+                    continue
+                changed.clear()
+                if on_resize:
+                    on_resize()
+                else:
+                    self.on_resize()
+
+        stop_evt = threading.Event()
+        threading.Thread(target=_loop, name='window-watch', daemon=True).start()
+        return stop_evt
+
+    def start_resize_watch_polling(self, on_resize=None, interval=0.5, stop_evt=None):
         """
         Starts a thread to monitor window resizing.
 
         Args:
             on_resize (callable, optional): Callback function for resize events.
             interval (float, optional): Polling interval in seconds.
+            stop_evt (threading.Event, optional): Existing stop event to honour.
 
         Returns:
             threading.Event: Event to stop the polling.
@@ -143,7 +208,7 @@ class GenericWindow:
                             self.on_resize()
                 stop_evt.wait(interval)
 
-        stop_evt = threading.Event()
+        stop_evt = stop_evt or threading.Event()
         threading.Thread(target=_loop, daemon=True).start()
         return stop_evt  # Caller can call .set() to stop
 
@@ -221,10 +286,34 @@ class GenericWindow:
     def bring_to_focus(self):
         """
         Brings the RuneLite window to the foreground using platform-specific window manager.
+        Does nothing if the window is known to still have focus.
         """
-        if self.is_open:
-            # Use the platform-specific implementation from the window manager
-            self.window.bring_to_focus()
+        if not self.is_open or self.has_focus():
+            return
+        self.focus_stats['refocused'] += 1
+        # Use the platform-specific implementation from the window manager
+        self.window.bring_to_focus()
+        self._focus_confirmed_at = 0.0
+
+    def has_focus(self) -> bool:
+        """
+        Whether the window has focus, without an OS round trip when possible.
+
+        Windows that track focus from events (LinuxWindow.watch) answer from
+        their cache; otherwise a positive check is trusted for FOCUS_TTL seconds.
+        """
+        if getattr(self.window, 'focus_tracked', False):
+            self.focus_stats['cached'] += 1
+            return self.window.is_focused()
+        now = time.time()
+        if now - self._focus_confirmed_at < self.FOCUS_TTL:
+            self.focus_stats['cached'] += 1
+            return True
+        self.focus_stats['checks'] += 1
+        focused = self.window.is_focused()
+        if focused:
+            self._focus_confirmed_at = now
+        return focused
 
     def move_off_window(self, offset: int | None = None):
         """
@@ -280,13 +369,29 @@ class GenericWindow:
             raise RuntimeError(f'Window {self.window_title} is not open.')
 
         with mss.mss(with_cursor=True) as sct:
-            bbox = (self.window.left, self.window.top, self.window.left + self.window.width, self.window.top + self.window.height)
+            # one snapshot when the window tracks its geometry from events
+            geom = getattr(self.window, 'geometry', None) or self.window
+            bbox = (geom.left, geom.top, geom.left + geom.width, geom.top + geom.height)
             sct_img = sct.grab(bbox)
             img = Image.frombytes('RGB', sct_img.size, sct_img.rgb)
 
         self._last_screenshot = img
         return self._last_screenshot
 
+    def capture_region(self, match: MatchResult) -> Image.Image:
+        """
+        Capture just `match` (window coordinates), without focusing the window
+        or replacing the cached full screenshot. Meant for small, frequently
+        sampled areas; each calling thread keeps its own mss handle.
+        """
+        sct = getattr(self._capture_local, 'sct', None)
+        if sct is None:
+            sct = self._capture_local.sct = mss.mss()
+        geom = getattr(self.window, 'geometry', None) or self.window
+        shot = sct.grab((geom.left + match.start_x, geom.top + match.start_y,
+                         geom.left + match.end_x, geom.top + match.end_y))
+        return Image.frombytes('RGB', shot.size, shot.rgb)
+
     def save_screenshot(self, filename="runelite_screenshot.png") -> str | None:
         """
         Saves a screenshot of the RuneLite window to a file.
@@ -384,6 +489,8 @@ class GenericWindow:
             click_type=ClickType.LEFT, parent_sectors: List[MatchResult]=[],
             rand_move_chance: float | None = None, after_click_settle_chance: float | None = None):
         """Clicks on the center of the matched area."""
+        if self.first_action_at is None:
+            self.first_action_at = time.time()
 
         # subimage in subimage, revert back to sc match
 
@@ -410,6 +517,9 @@ class GenericWindow:
         )
 
         self.move_to((x,y),rand_move_chance, translated=True) 
+        if click_type == ClickType.RIGHT:
+            self.last_right_click = (x - self.window.left, y - self.window.top)
+        self.click_count += 1
         click(
             -1,-1,
             click_type=click_type,
@@ -431,23 +541,49 @@ class RuneLiteClient(GenericWindow):
         super().__init__(f'RuneLite - {username}', randomness=randomness)
         self.log = get_logger('RLClient')
         self.log.info('Initializing RuneLite client...')
+        self.username = username
+        self.layout_cache = LayoutCache()
         
         self.minimap = MinimapContext()
         self.toolplane = ToolplaneContext()
-        self.item_db = ItemLookup()
+        self._item_db: ItemLookup | None = None
         self.sectors: UISectors = UISectors()
-
-        self.ui_type: UIType = self.get_ui_type()
-        self.log.info(f'UI Type detected: {self.ui_type.value}')
+        self.executor = ExecutorService()
+        # latest perception results, readable without capturing (see /api/state)
+        self.state = PerceptionState()
+
+        # bumped by on_resize; geometry derived from the layout is keyed on it
+        self.layout_version = 0
+        # UI exclusion masks per (layout_version, size, parts)
+        self._exclusion_masks: Dict[Tuple, np.ndarray] = {}
+        self.inventory = InventoryReader(self)
+        self.vitals = VitalsSampler(self)
+        self.position = PositionTracker(self)
+        self.minimap_motion = MinimapMotion(self)
+        self.hover = HoverTextReader(self)
+        self.context_menu = ContextMenu(self)
+        self.chat = ChatReader(self)
+        self.skilling = SkillingStateReader(self)
+        self.toolplane_state = ToolplaneTracker(self)
+
+        # detected lazily by calibrate() unless a cached layout validates
+        self.ui_type: UIType = None
         self.log.debug('Finding UI sectors...')
         
         self.on_resize()
-        self.start_resize_watch_polling()
+        self.start_resize_watch()
         elapsed = seconds_to_hms(time.time() - start_time)
         self.log.info(f'Client initialized successfully in {elapsed}')
         
 
     
+    @property
+    def item_db(self) -> ItemLookup:
+        """Item database, loaded on first use so calibration doesn't wait on it."""
+        if self._item_db is None:
+            self._item_db = ItemLookup()
+        return self._item_db
+
     @timeit
     def click_minimap(self, element: MinimapElement, click_cnt:int=1):
         match: MatchResult = getattr(self.minimap, element.value)
@@ -458,15 +594,25 @@ class RuneLiteClient(GenericWindow):
 
     
     @timeit    
-    def click_toolplane(self, tab: ToolplaneTab,reload_on_tab_change:bool=True):
+    def active_tab(self, sc: Image.Image = None) -> str | None:
+        """Name of the active toolplane tab (see ToolplaneTracker)."""
+        return self.toolplane_state.active(sc)
+
+    @timeit
+    def click_toolplane(self, tab: ToolplaneTab,reload_on_tab_change:bool=False):
         match = getattr(self.toolplane, tab.value)
 
-        if self.toolplane.get_active_tab(self.screenshot) != tab.value:
+        active = self.toolplane_state.active()
+        if active != tab.value:
             self.click(match)
             time.sleep(random.uniform(.05, .1))
+            self.toolplane_state.assume(tab.value)
             if reload_on_tab_change: 
-                # necessary for getting active tab
                 self.get_screenshot()
+            active = tab.value
+        last = self.state.get('active_tab')
+        if last is None or last.value != active:
+            self.state.publish('active_tab', active)
 
     def mouse_position(self) -> Tuple[int, int]:
         """
@@ -475,26 +621,13 @@ class RuneLiteClient(GenericWindow):
         x, y = pyautogui.position()
         return (x - self.window.left, y - self.window.top)
 
+    def get_vitals(self, sc: Image.Image = None, quick_prayer: bool = True) -> Vitals:
+        """Every minimap orb value (and quick-prayer state) from one frame."""
+        return self.vitals.sample(sc, quick_prayer)
+
     @timeit
     def get_minimap_stat(self, element: MinimapElement) -> int:
-        self.get_screenshot()
-        match = getattr(self.minimap, element.value)
-        try:
-            stat = self.minimap.get_minimap_stat(match, self.screenshot)
-        except ocr.OcrError as e:
-            sc = self.get_screenshot()
-            sc = self.debug_minimap(sc)
-
-            write_text_to_image(
-                sc,
-                f"Error: {e}",
-                color="red",
-                font_size=20
-            ).show()
-            raise e
-        if stat:
-            return int(stat)
-        return None
+        return getattr(self.get_vitals(quick_prayer=False), element.value)
     
     def find_item(
             self,
@@ -507,6 +640,13 @@ class RuneLiteClient(GenericWindow):
         self.click_toolplane(tab)
         sc = screenshot or self.get_screenshot()
 
+        if tab == ToolplaneTab.INVENTORY and not crop:
+            slots = self.read_inventory(
+                sc, [item_identifier], read_counts=False, min_confidence=min_confidence
+            ).find(item_identifier)
+            if slots:
+                return slots[0].match.copy()
+
         if isinstance(item_identifier, str):
             item = self.item_db.get_item_by_name(item_identifier)
         elif isinstance(item_identifier, int):
@@ -625,7 +765,7 @@ class RuneLiteClient(GenericWindow):
                 parent_match.start_y
             )
         if ignore_count:
-            ans.start_x -= count_pixels
+            ans.start_y -= count_pixels
         
         return ans
             
@@ -638,36 +778,18 @@ class RuneLiteClient(GenericWindow):
             min_confidence=0.97
         ):
         """the count of the item in a single slot"""
-        self.get_screenshot()
-        top_crop = 13
-        match = self.find_item(
-            item_identifier,
-            tab,
-            min_confidence,
-            crop=(0,top_crop,0,0) # crop top off
-        )
-        match.start_y = match.start_y - 5
-        match.start_x = match.start_x - 3
-        match.end_y = match.start_y + 15
-        match.end_x = match.start_x + 35
-
-        sc = match.crop_in(self.screenshot)
-        num_img = tools.mask_colors(sc, [
-            (255, 255, 0), # < 100k
-            # TODO: actually handle these
-            # (255,255,255), # > 100k
-            # (0, 255, 128)  # > 10M
-        ], tolerance=5)
-
-        try:
-            return ocr.get_number(
-                num_img,
-                ocr.FontChoice.RUNESCAPE_PLAIN_11,
-            )
-        except Exception as e:
-            self.log.error(f'Failed to get count for item: {item_identifier} - {str(e)}')
-            match.debug_draw(self.screenshot).show()
-            return 0
+        self.click_toolplane(tab)
+        sc = self.get_screenshot()
+        if tab == ToolplaneTab.INVENTORY:
+            slots = self.read_inventory(
+                sc, [item_identifier], min_confidence=min_confidence
+            ).find(item_identifier)
+            if not slots:
+                raise ValueError(f"Item {item_identifier} not found in inventory.")
+            return slots[0].count
+
+        match = self.find_item(item_identifier, tab, min_confidence, screenshot=sc)
+        return self.item_db.get_item(item_identifier).get_count(match, sc)
          
     
             
@@ -697,63 +819,10 @@ class RuneLiteClient(GenericWindow):
             min_click_interval=min_click_interval,
         )
 
-    def get_right_click_menu(self, sc:Image.Image=None) -> MatchResult:
-        sc = sc or self.get_screenshot()
-        right_click_header = Image.open('data/ui/right-click-header.png')
-        right_click_menu_end = Image.open('data/ui/right-click-menu-end.png')
-        top_left = self.find_in_window(
-            right_click_header,
-            sc,
-            min_scale=1,
-            max_scale=1
-        )
-        bottom_right = self.find_in_window(
-            right_click_menu_end,
-            sc,
-            min_scale=1,
-            max_scale=1
-        )
-        menu_match = MatchResult(
-            start_x=top_left.start_x,
-            start_y=top_left.start_y,
-            end_x=bottom_right.end_x,
-            end_y=bottom_right.end_y,
-        )
-        return menu_match
-
-
-    def choose_right_click_opt(
-            self,
-            option: str
-    ):
-        sc = self.get_screenshot()
-        menu_match = self.get_right_click_menu(sc)
-
-        menu = menu_match.crop_in(sc)
-        menu = tools.mask_above_color_value(menu, 150)
-        
-
-        ocr_match = ocr.find_string_bounds(
-            menu,
-            option,
-            lang=ocr.FontChoice.RUNESCAPE_BOLD_12.value
-        )
-        match = MatchResult(
-            ocr_match['x1'],
-            ocr_match['y1'],
-            ocr_match['x2'],
-            ocr_match['y2'],
-            confidence=ocr_match['confidence']
-        )
-        match = match.transform(
-            menu_match.start_x,
-            menu_match.start_y
-        )
-        
-        self.click(match,rand_move_chance=0)
-        
+    def choose_right_click_opt(self, option: str) -> MenuOption:
+        """Click `option` in the right-click menu that was just opened."""
+        return self.context_menu.choose(option)
 
-    
     def debug_minimap(self,screenshot: Image.Image = None):
         if not screenshot:
             screenshot = self.get_screenshot()
@@ -762,7 +831,7 @@ class RuneLiteClient(GenericWindow):
         self.minimap.prayer.debug_draw(self.screenshot, color=(0, 0, 255))
         self.minimap.run.debug_draw(self.screenshot, color=(255, 0, 0))
         self.minimap.spec.debug_draw(self.screenshot, color=(255, 255, 0))
-        find_subimage(self.screenshot, Image.open("data/ui/map.webp")).debug_draw(self.screenshot, color=(255, 255, 255))
+        find_subimage(self.screenshot, templates.get('data/ui/map.webp')).debug_draw(self.screenshot, color=(255, 255, 255))
         self.minimap.get_minimap_match(self.minimap.health,screenshot).debug_draw(self.screenshot,color=(255,255,255))
         self.minimap.get_minimap_match(self.minimap.run,screenshot).debug_draw(self.screenshot,color=(255,255,255))
         # health_val = self.minimap.get_minimap_stat(self.minimap.health, self.screenshot)
@@ -790,7 +859,7 @@ class RuneLiteClient(GenericWindow):
         #self.screenshot.show()
 
     def get_hover_image(self) -> Image.Image:
-        logo = Image.open('data/ui/rl-window-logo.png')
+        logo = templates.get('data/ui/rl-window-logo.png')
         match = self.find_in_window(
             logo,min_scale=1,max_scale=1,min_confidence=0.95
         )
@@ -799,6 +868,7 @@ class RuneLiteClient(GenericWindow):
         return match.crop_in(self.get_screenshot())
 
 
+    @timeit
     def get_hover_text(self):
         """not gonna lie, this kinda sucks"""
         hover_info = self.get_hover_image()
@@ -852,146 +922,107 @@ class RuneLiteClient(GenericWindow):
         return False
     
     def get_skilling_state(self, substring: str) -> bool:
-        state_box = Image.open('data/ui/skilling-state.png')
-        sc = self.get_screenshot()
-        matches = find_subimages(
-            sc,state_box,
-            min_scale=1, max_scale=1,
-            min_confidence=0.98
-            )
-        skill_match = None
-        for match in matches:
-            skill_img = tools.mask_colors(
-                match.crop_in(sc),
-                [[255,255,255], # white
-                [255,0,0], # red
-                [0,255,0]] # green
-            )
-            text = ocr.execute(
-                skill_img,
-                font=ocr.FontChoice.RUNESCAPE_PLAIN_12,
-                psm=ocr.TessPsm.SPARSE_TEXT,
-                raise_on_blank=False,
-            )
-
-            if substring.lower() in text.lower():
-                skill_match = match
-                
-                break
-        
-        if skill_match is None:
-            raise ValueError(f"Could not find skilling state for substring: {substring}")
-        
-        img = skill_match.crop_in(sc)
-        # find red pixel in the image
-        red_pixel = np.array(img) == [255, 0, 0]
-        green_pixel = np.array(img) == [0, 255, 0]
-        
-        # if more green than red, return True
-        if np.any(red_pixel) or np.any(green_pixel):
-            if np.sum(green_pixel) > np.sum(red_pixel):
-                return True
-            else:
-                return False
-
-        raise ValueError(f"Could not determine skilling state for substring: {substring}. No red or green pixels found in {img.size} image.")
+        """Whether the skilling-status box labeled with `substring` shows green."""
+        return self.skilling.is_active(substring)
         
+    @timeit
     @control.guard
-    def is_moving(self, sleep_between=.8, retry_cnt=2) -> bool:
+    def is_moving(self, still_for: float = STILL_FOR) -> bool:
         """
-        Checks if the player is moving by comparing the 
-        player's position at two different times.
+        Whether the player is moving. The minimap scroll answers in a few frames;
+        only when it is inconclusive (e.g. the camera is rotating) does this fall
+        back to whether the tile changed within the last `still_for` seconds.
         """
-        # Use a list to store position results from threads
-        positions: List[PlayerPosition] = [None, None]
-        
-        def get_pos_and_store(index):
-            positions[index] = self.get_position(retry_cnt)
-        
-        # Get first position
-        t1 = threading.Thread(target=get_pos_and_store, args=(0,))
-        t2 = threading.Thread(target=get_pos_and_store, args=(1,))
-        t1.start()
-        
-        time.sleep(sleep_between)
-        
-        
-        t2.start()
-        
-        t1.join()
-        t2.join()
-        
-        # Ensure we got valid position data
-        if None in positions or not all(hasattr(p, 'tile') for p in positions if p is not None):
+        moving = self.minimap_motion.is_moving()
+        if moving is not None:
+            return moving
+        try:
+            return self.position.is_moving(still_for)
+        except RuntimeError:
+            # no World Location panel to fall back on
             return False
-            
-        # Compare positions to determine movement
-        return positions[0].tile != positions[1].tile
-    
+
+    def wait_until_stopped(self, timeout: float = 10, still_for: float = STILL_FOR) -> bool:
+        return self.position.wait_until_stopped(timeout, still_for)
+
     @timeit
     def get_position(self,retry_cnt=0) -> 'PlayerPosition':
-        def do_ocr(match: MatchResult, sc: Image.Image) -> str:
-            return read_location_numbers(match.crop_in(sc))
-        sc = self.get_screenshot()
-        position_container = POSITION_STATE
-        match = self.find_in_window(
-            position_container,sc,
-            min_scale=1,max_scale=1
-        )
-
-        
-        
-        if match.confidence < 0.98:
-            if retry_cnt > 0:
+        """Current position; the latest tracker sample if it is fresh, otherwise a new read."""
+        tracker = self.position
+        if tracker.running and tracker.latest and time.time() - tracker.last_sample_at < 2 * tracker.interval + 0.1:
+            return tracker.latest
+        for attempt in range(retry_cnt + 1):
+            try:
+                position = tracker.read(self.get_screenshot())
+            except RuntimeError:
+                # panel not found
+                if attempt == retry_cnt:
+                    raise
+                position = None
+            if position is not None:
+                return position
+            if attempt < retry_cnt:
+                self.log.warning(f"Failed to read position, retrying: {retry_cnt - attempt} attempts left")
                 time.sleep(1)
-                self.log.info(f"Retrying position detection: {retry_cnt} attempts remaining")
-                return self.get_position(retry_cnt=retry_cnt-1)
-            raise RuntimeError('Missing plugin: "World Location" please install & enable "Grid Location" with "Grid Info Type" == "UniqueID"')
-    
-        
-        sc = match.crop_in(sc)
-        sc = tools.mask_colors(sc,[(255,255,255)])
-        
-        def process_ocr(match: MatchResult):
-            return do_ocr(match, sc)
+        raise RuntimeError('Could not read the World Location panel')
 
-        matches = {
-            "tile": MatchResult(40, 6, 128, 21),
-            "chunk": MatchResult(75, 22, 127, 37),
-            "region": MatchResult(85, 38, 127, 53),
-        }
+    def read_inventory(
+            self,
+            sc: Image.Image = None,
+            candidates: List[str | int] = (),
+            read_counts: bool = True,
+            min_confidence: float = 0.97
+        ) -> InventorySnapshot:
+        """
+        Snapshot of all 28 inventory slots (item, stack count, confidence).
+        Assumes the inventory tab is open; see InventoryReader.read.
+        """
+        return self.inventory.read(sc, candidates, read_counts, min_confidence)
 
-        with ThreadPoolExecutor(max_workers=len(matches)) as executor:
-            results = {key: executor.submit(process_ocr, match) for key, match in matches.items()}
-
-        tile_val = results["tile"].result()
-        if not tile_val and retry_cnt > 0:
-            time.sleep(1)
-            self.log.warning(f"Failed to read tile position, retrying: {retry_cnt} attempts left")
-            return self.get_position(retry_cnt=retry_cnt-1)
-        tile_ans = tuple(int(t.strip()) for t in tile_val.split(',') if t.isdigit())
-
-        chunk_val = results["chunk"].result()
-        if not chunk_val and retry_cnt > 0:
-            time.sleep(1)
-            self.log.warning(f"Failed to read chunk position, retrying: {retry_cnt} attempts left")
-            return self.get_position(retry_cnt=retry_cnt-1)
-        chunk_ans = int(chunk_val.strip())
-
-        region_val = results["region"].result()
-        if not region_val and retry_cnt > 0:
-            time.sleep(1)
-            self.log.warning(f"Failed to read region position, retrying: {retry_cnt} attempts left")
-            return self.get_position(retry_cnt=retry_cnt-1)
-        region_ans = int(region_val.strip())
-
-        return PlayerPosition(
-            tile=tile_ans, 
-            chunk=chunk_ans, 
-            region=region_ans
-        )
-        
+    def inventory_occupancy(self, sc: Image.Image = None, verify_tab: bool = False) -> InventoryOccupancy:
+        """
+        Which inventory slots are filled, without identifying items (well under a
+        millisecond on a captured frame). Publishes 'inventory.occupancy' when it changes.
+        """
+        if verify_tab:
+            self.click_toolplane(ToolplaneTab.INVENTORY)
+        occupancy = self.inventory.occupancy(sc)
+        last = self.state.get('inventory.occupancy')
+        if last is None or last.value['mask'] != occupancy.mask:
+            self.state.publish('inventory.occupancy', {'mask': occupancy.mask, 'free': occupancy.free})
+        return occupancy
+
+    def count_free_slots(self, verify_tab: bool = True) -> int:
+        return self.inventory_occupancy(verify_tab=verify_tab).free
+
+    def wait_for_inventory_change(
+            self,
+            timeout: float = 10,
+            slots: Iterable[int] = None,
+            baseline: InventoryOccupancy = None,
+            interval: float = 0.05
+        ) -> List[int]:
+        """
+        Poll the inventory until any of `slots` (default: all) differs from `baseline`
+        (default: the inventory as it is now). Returns the changed slot indices, or []
+        on timeout. The cursor is part of the capture, so moving it over the
+        inventory counts as a change.
+        """
+        baseline = baseline or self.inventory_occupancy()
+        watch = set(slots) if slots is not None else None
+        deadline = time.time() + timeout
+        while True:
+            changed = baseline.changed_slots(self.inventory_occupancy())
+            if watch is not None:
+                changed = [i for i in changed if i in watch]
+            if changed:
+                return changed
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return []
+            time.sleep(min(interval, remaining))
 
+    @timeit
     def get_inv_items(self, 
             items: List[str | int],min_confidence=0.97,
             x_sort: bool = None,
@@ -1001,22 +1032,19 @@ class RuneLiteClient(GenericWindow):
         ) -> List[MatchResult]:
         if verify_tab:
             self.click_toolplane(ToolplaneTab.INVENTORY)
-        sc = self.get_screenshot()
-        tp = self.sectors.toolplane
-        sc = tp.crop_in(sc)
+        snapshot = self.read_inventory(
+            candidates=items, read_counts=False, min_confidence=min_confidence
+        )
         matches: List[tools.MatchResult] = []
+        counts: Dict[str, int] = {}
         for item in items:
             itm = self.item_db.get_item(item)
             if not itm:
                 raise RuntimeError(f"Item '{item}' not found in database.")
-                
-            item_icon = itm.icon
-            if not item_icon:
-                self.log.warning(f"Item icon for '{item}' not found.")
-                continue
-            matches += tools.find_subimages(
-                sc, item_icon, min_confidence=min_confidence
-            )
+            found = [slot.match.copy() for slot in snapshot.find(itm.id)]
+            counts[itm.name] = len(found)
+            matches += found
+        self.state.publish('inventory', {'items': counts, 'slots_matched': len(matches)})
         if not matches:
             return []
 
@@ -1031,7 +1059,6 @@ class RuneLiteClient(GenericWindow):
                 key=lambda x: x.start_y,
                 reverse=y_sort
             )
-        matches = [m.transform(tp.start_x,tp.start_y) for m in matches]
         return matches
 
     def follow_tile(
@@ -1043,16 +1070,14 @@ class RuneLiteClient(GenericWindow):
         stop = threading.Event()
         def _loop_find():
             while not stop.is_set():
-                sc = self.get_filtered_screenshot() if filter_ui else self.get_screenshot()
+                sc = self.get_screenshot()
                 t = None
-                if filter_out:
-                    for match in filter_out:
-                        sc = match.remove_from(sc)
                 try:
                     m = tools.find_color_box(
                         sc,
                         tile_color,
                         tol=40,
+                        exclude=self.exclusion_mask(sc.size, filter_out, ui=filter_ui),
                     )
                     
                     x,y = m.get_center()
@@ -1067,8 +1092,7 @@ class RuneLiteClient(GenericWindow):
             
         t = threading.Thread(target=_loop_find, daemon=True)
         t.start()
-        while self.is_moving():
-            continue
+        self.wait_until_stopped(timeout=120)
         time.sleep(0.2)  # Give it a moment to settle
         stop.set()
 
@@ -1084,16 +1108,15 @@ class RuneLiteClient(GenericWindow):
         ):
         for mult in range(retry_match):
             time.sleep(3*mult) # 0 on first try
-            sc = self.get_screenshot(filter_ui)
-            if filter_out:
-                for match in filter_out:
-                    sc = match.remove_from(sc)
+            sc = self.get_screenshot()
+            exclude = self.exclusion_mask(sc.size, filter_out, ui=filter_ui)
             if mult + 1 >= retry_match and retry_match > 1:
                 self.move_off_window()
             try:
                 match = find_color_box(
                     sc,tile_color,
-                    tol=40+(10*mult)
+                    tol=40+(10*mult),
+                    exclude=exclude
                 )
                 self.smart_click_match(
                     match,
@@ -1106,6 +1129,7 @@ class RuneLiteClient(GenericWindow):
                 if (mult+1) == retry_match:
                     raise e
             
+    @timeit
     def smart_click_match(
             self,
             match: MatchResult,
@@ -1143,49 +1167,23 @@ class RuneLiteClient(GenericWindow):
                         return
         raise RuntimeError(f'[SmartClick] cant find match {hover_texts}. Hover text: "{ans}"')
 
+    @timeit
     @control.guard
     def get_hover_texts(self):
-        if sys.platform.startswith('linux'):
-            # TODO linux bullshit
-            return [self.get_action_hover() or '']
-        
-
-        
-        def safe(fn, label):
-            try:
-                return fn() or ''
-            except Exception as e:
-                self.log.error("[%s] %s", label, e, exc_info=True)
-                return ''
-
-        ex = ThreadPoolExecutor(max_workers=2, thread_name_prefix="hover")
-        futures = [
-            ex.submit(safe, self.get_hover_text,     "hover_text"),
-            ex.submit(safe, self.get_action_hover,   "action_hover"),
-        ]
+        """
+        Hover text candidates. The cursor-local tooltip read is tried first;
+        the RuneLite-logo based read (not available on Linux) only runs when
+        that finds nothing.
+        """
+        text = self.get_action_hover()
+        if text or sys.platform.startswith('linux'):
+            return [text or '']
         try:
-            done, not_done = wait(futures, timeout=5, return_when=FIRST_EXCEPTION)
-
-            # collect whatever finished
-            results = [f.result() for f in done]
-
-            # anything still running after 5 s is probably wedged
-            for f in not_done:
-                f.cancel()
-
-            # pad so we always return two strings
-            while len(results) < 2:
-                results.append('')
-            return results
-
-        except TimeoutError:
-            self.log.warning("Timed-out waiting for hover text")
+            return ['', self.get_hover_text() or '']
+        except Exception as e:
+            self.log.error("[hover_text] %s", e, exc_info=True)
             return ['', '']
 
-        finally:
-            # don’t block—just shoot lingering threads
-            ex.shutdown(wait=False, cancel_futures=True)
-
     def compare_hover_match(self, target: str) -> float:
         """
         Compares the hover text with a target string.
@@ -1196,68 +1194,234 @@ class RuneLiteClient(GenericWindow):
         Returns:
             bool: True if the hover text matches the target, False otherwise.
         """
-        hover_text = self.get_hover_texts()
-        max_match = 0
-        for text in hover_text:
-            match = tools.text_similarity(text, target)
-            if match > max_match:
-                max_match = match
-        return max_match
+        hover_text = [text or '' for text in self.get_hover_texts()]
+        return textmatch.best_match(hover_text, target)[1]
     
+    @timeit
     def on_resize(self):
         """
         Handles the window resize event by recalculating UI sectors and components.
+        Uses the persisted layout for this window size when it still validates.
         """
         self.log.debug("Window resize detected - recalculating UI elements")
         sc = self.get_screenshot()
+        if not self.restore_layout(sc):
+            self.calibrate(sc)
+        self.layout_version += 1
+        self._exclusion_masks.clear()
+
+    @timeit
+    def calibrate(self, sc: Image.Image = None):
+        """
+        Full template search for the UI type, minimap, toolplane and chat,
+        then persists the result to the layout cache.
+        """
+        sc = sc or self.get_screenshot()
+        if self.ui_type is None:
+            self.ui_type = self.get_ui_type()
+            self.log.info(f'UI Type detected: {self.ui_type.value}')
 
         match_jobs = [
             (self.minimap.find_matches, (sc,), {}),
-            (self.toolplane.find_matches, (sc,), {}),
             (self.sectors.find_matches, (sc, self.ui_type), {}),
             # (other_component.find_matches, (sc, ...), {}),
         ]
 
-        with ThreadPoolExecutor(max_workers=min(MAXTHREAD, len(match_jobs))) as pool:
-            futures = [pool.submit(fn, *args, **kwargs) for fn, args, kwargs in match_jobs]
-            for f in futures:
-                f.result()
+        futures = [self.executor.submit(Lane.CV, fn, *args, **kwargs) for fn, args, kwargs in match_jobs]
+        # toolplane fans out its own icon searches onto the CV lane
+        self.toolplane.find_matches(sc, self.executor)
+        for f in futures:
+            f.result()
+
+        self.layout_cache.store(
+            self.username, sc.size, self.ui_type.value,
+            self.minimap, self.toolplane, self.sectors
+        )
+
+    @timeit
+    def restore_layout(self, sc: Image.Image) -> bool:
+        """
+        Load the cached layout for this window size and accept it only if
+        spot checks against the cached regions pass.
+
+        Returns:
+            bool: True if a cached layout was applied.
+        """
+        for entry in self.layout_cache.candidates(self.username, sc.size):
+            ui_type = UIType(entry['ui_type'])
+            if self.ui_type is not None and ui_type != self.ui_type:
+                continue
+            minimap, toolplane, sectors = MinimapContext(), ToolplaneContext(), UISectors()
+            try:
+                restore_context(minimap, entry['minimap'])
+                restore_context(toolplane, entry['toolplane'])
+                restore_context(sectors, entry['sectors'])
+            except (TypeError, KeyError) as e:
+                self.log.warning(f'Malformed layout cache entry: {e}')
+                continue
+
+            if not self._validate_layout(sc, ui_type, minimap, toolplane, sectors):
+                self.log.info(f'Cached {ui_type.value} layout failed validation, recalibrating')
+                self.layout_cache.invalidate(self.username, sc.size, ui_type.value)
+                continue
+
+            restore_context(self.minimap, entry['minimap'])
+            restore_context(self.toolplane, entry['toolplane'])
+            restore_context(self.sectors, entry['sectors'])
+            self.ui_type = ui_type
+            self.log.info(f'Restored cached {ui_type.value} layout for {sc.size[0]}x{sc.size[1]}')
+            return True
+        return False
+
+    def _validate_layout(
+            self, sc: Image.Image, ui_type: 'UIType',
+            minimap: 'MinimapContext', toolplane: 'ToolplaneContext', sectors: 'UISectors'
+        ) -> bool:
+        """Cheap checks: each template must still match inside its cached region."""
+        if not (minimap.globe and toolplane.inventory and sectors.toolplane and sectors.chat):
+            return False
+        tp_template = templates.get(
+            'data/ui/toolplane-modern.png' if ui_type == UIType.MODERN else 'data/ui/toolplane-classic.png'
+        )
+        chat_tl = templates.get('data/ui/chat-top-left.png')
+        chat_corner = MatchResult(
+            sectors.chat.start_x, sectors.chat.start_y,
+            sectors.chat.start_x + chat_tl.width, sectors.chat.start_y + chat_tl.height
+        )
+        checks = [
+            (tp_template, sectors.toolplane),
+            (templates.get('data/ui/map.webp'), minimap.globe),
+            (self.toolplane._TEMPLATE_CACHE['inventory'], toolplane.inventory),
+            (chat_tl, chat_corner),
+        ]
+        return all(self._spot_check(sc, tpl, region) for tpl, region in checks)
+
+    @staticmethod
+    def _spot_check(
+            sc: Image.Image, template: Image.Image, region: MatchResult,
+            pad: int = 6, min_confidence: float = 0.9
+        ) -> bool:
+        area = region.scale_px(pad)
+        if area.start_x < 0 or area.start_y < 0 or area.end_x > sc.width or area.end_y > sc.height:
+            return False
+        try:
+            match = find_subimage(
+                area.crop_in(sc), template,
+                min_scale=region.scale, max_scale=region.scale
+            )
+        except ValueError:
+            return False
+        return match.confidence >= min_confidence
 
     def get_ui_type(self) -> 'UIType':
-        modern_toolplane = Image.open('data/ui/toolplane-modern.png')
-        classic_coolplane = Image.open('data/ui/toolplane-classic.png')
+        modern_toolplane = templates.get('data/ui/toolplane-modern.png')
+        classic_coolplane = templates.get('data/ui/toolplane-classic.png')
 
         modern = self.find_in_window(modern_toolplane,self.screenshot)
         classic = self.find_in_window(classic_coolplane,self.screenshot)
 
         return UIType.CLASSIC if classic.confidence > modern.confidence else UIType.MODERN
     
-    def get_filtered_screenshot(
+    @staticmethod
+    def _mask_region(mask: np.ndarray, region: MatchResult | ShapeResult):
+        """Mark a region's bounding box (inclusive, like remove_from) in `mask`."""
+        sx, sy, ex, ey = (int(v) for v in region.bounding_box)
+        if ex <= sx or ey <= sy:
+            return
+        mask[max(sy, 0):ey + 1, max(sx, 0):ex + 1] = True
+
+    def _ui_mask(
             self,
+            size: Tuple[int, int],
             toolplane: bool = True,
             chat: bool = True,
             minimap: bool = True,
             sidebar: bool = True
-        ) -> Image.Image:
-        sc = self.get_screenshot()
+        ) -> np.ndarray:
+        """
+        Boolean (h, w) mask of the UI parts to ignore, True = excluded.
+        Built once per window size and layout; do not modify the result.
+        """
+        key = (self.layout_version, size, toolplane, chat, minimap, sidebar)
+        mask = self._exclusion_masks.get(key)
+        if mask is not None:
+            return mask
+
+        w, h = size
+        mask = np.zeros((h, w), dtype=bool)
         if toolplane:
-            sc = self.sectors.toolplane.remove_from(sc)
+            self._mask_region(mask, self.sectors.toolplane)
             for variable in vars(self.toolplane):
                 match = getattr(self.toolplane, variable)
                 if isinstance(match, MatchResult):
-                    sc = match.remove_from(sc)
+                    self._mask_region(mask, match)
         if chat:
             m = self.sectors.chat.copy()
             m.end_y = m.end_y + 25
-            sc = m.remove_from(sc)
+            self._mask_region(mask, m)
         if minimap:
             m = self.minimap.map.scale_px(30)
             m = m.transform(-20,20)
-            sc = m.remove_from(sc)
+            self._mask_region(mask, m)
         if sidebar:
-            end_tp = self.sectors.toolplane.end_x
-            sc = sc.crop((0,0,end_tp+5,sc.height))
-        return sc
+            mask[:, self.sectors.toolplane.end_x + 5:] = True
+        mask.flags.writeable = False
+        self._exclusion_masks[key] = mask
+        return mask
+
+    def exclusion_mask(
+            self,
+            size: Tuple[int, int],
+            filter_out: List[MatchResult] = None,
+            ui: bool = True
+        ) -> np.ndarray | None:
+        """
+        Mask of pixels to ignore in a full-window search, for use as
+        `find_color_box(..., exclude=mask)`.
+
+        Args:
+            size: Screenshot size (width, height).
+            filter_out: Extra regions to exclude for this call only.
+            ui: Exclude the toolplane, chat, minimap and sidebar.
+
+        Returns:
+            np.ndarray | None: None when nothing is excluded.
+        """
+        if not ui and not filter_out:
+            return None
+        base = self._ui_mask(size) if ui else np.zeros((size[1], size[0]), dtype=bool)
+        if not filter_out:
+            return base
+        mask = base.copy()
+        for match in filter_out:
+            self._mask_region(mask, match)
+        return mask
+
+    def get_filtered_screenshot(
+            self,
+            toolplane: bool = True,
+            chat: bool = True,
+            minimap: bool = True,
+            sidebar: bool = True,
+            filter_out: List[MatchResult] = None
+        ) -> Image.Image:
+        """
+        Screenshot with the selected UI parts (and `filter_out` regions) blacked out,
+        cropped to the game view when `sidebar` is set. The exclusion mask is
+        precomputed per layout, so this is one array operation on the frame.
+        """
+        sc = self.get_screenshot()
+        mask = self._ui_mask(sc.size, toolplane, chat, minimap, sidebar)
+        if filter_out:
+            mask = mask.copy()
+            for match in filter_out:
+                self._mask_region(mask, match)
+
+        arr = np.asarray(sc)
+        if sidebar:
+            width = min(sc.width, self.sectors.toolplane.end_x + 5)
+            arr, mask = arr[:, :width], mask[:, :width]
+        return Image.fromarray(np.where(mask[..., None], np.uint8(0), arr))
 
     def get_screenshot(self, filtered=False) -> Image.Image:
         if filtered:
@@ -1285,95 +1449,23 @@ class RuneLiteClient(GenericWindow):
         )
         return match.transform(chat.start_x,chat.start_y)
     
+    @timeit
     def get_chat_text(self) -> str:
-        chat = self.sectors.chat
-
-        sc = self.get_screenshot()
-        sc = chat.crop_in(sc)
-
-        return ocr.execute(
-            sc,
-            font=ocr.FontChoice.RUNESCAPE_PLAIN_12,
-            psm=ocr.TessPsm.SPARSE_TEXT,
-            raise_on_blank=False,
-            preprocess=True
-        )
+        """Visible chat lines, newline separated (only changed lines are OCR'd)."""
+        return '\n'.join(self.chat.visible())
     
+    @timeit
     @control.guard
     def get_action_hover(self) -> str:
         """
         Gets the hover text from the action bar below the cursor.
         """
         try:
-            h_start = ACTION_HOVER.crop((
-                0, 0, 
-                10, ACTION_HOVER.height
-            ))
-            h_end = ACTION_HOVER.crop((
-                ACTION_HOVER.width - 10, 0, 
-                ACTION_HOVER.width, ACTION_HOVER.height
-            ))
-
-            c_x, c_y = self.mouse_position()
-            sc = self.get_screenshot()
-
-            hover_box = MatchResult(
-                c_x - 45, c_y - 20, 
-                c_x + 20, c_y + 45
-            )
-            sc = hover_box.debug_draw(sc, color=(255, 0, 0))
-
-            start = self.find_in_window(
-                h_start,
-                sub_match=hover_box,
-                min_scale=1, max_scale=1,
-                min_confidence=0.95
-            )
-            
-
-            end_x = min(self.window_match.end_x , start.start_x + 350)
-            end_y = min(self.window_match.end_y, start.start_y + 25)
-
-            hover_box = MatchResult(
-                start.start_x, start.start_y,
-                end_x, end_y
-            )
-            
-            end = self.find_in_window(
-                h_end,
-                sub_match=hover_box,
-                min_scale=1, max_scale=1,
-                min_confidence=0.95
-            )
-
-            action = MatchResult(
-                start.start_x, start.start_y,
-                end.end_x, end.end_y
-            )
-            action_img = action.crop_in(self.get_screenshot())
-            action_txt = tools.mask_above_color_value(
-                action_img,
-                threshold=150
-            )
-            ans = ocr.execute(
-                action_txt,
-                font=ocr.FontChoice.RUNESCAPE_PLAIN_11,
-                psm=ocr.TessPsm.SINGLE_LINE,
-                raise_on_blank=False,
-                preprocess=False
-            )
-            return ans
+            return self.hover.read()
         except Exception as e:
+            self.log.debug(f"Hover text read failed: {e}")
             return None
 
-
-
-
-        
-        
-
-
-        
     def click_chat_text(self,text):
         match = self.find_chat_text(text)
         self.click(match)
@@ -1383,36 +1475,16 @@ class RuneLiteClient(GenericWindow):
         Checks if the given text is present in the RuneLite chat.
         tip: use a full line of text for best results.
         """
-        text = text.lower()
-        chat_text = self.get_chat_text().lower()
-        for line in chat_text.splitlines():
-            similar = tools.text_similarity(line, text)
-            if similar >= confidence:
-                self.log.debug(f'Text match in chat with similarity: {similar:.2f}')
-                return True
-        return False
+        line = self.chat.contains(text, confidence)
+        if line is not None:
+            self.log.debug(f'Text match in chat: {line}')
+        return line is not None
 
     @property
     def quick_prayer_active(self) -> bool:
         """Checks if the quick prayer is active in the RuneLite window."""
-        qp_disabled = Image.open("data/ui/quick-prayer-disabled.png")
-        qp_enabled = Image.open("data/ui/quick-prayer-enabled.png")
-
-        self.get_screenshot()
-        
-        disabled_match = self.find_in_window(qp_disabled, self.screenshot)
-        enabled_match = self.find_in_window(qp_enabled, self.screenshot)
-        
-        if enabled_match.confidence > disabled_match.confidence:
-            return True
-        return False
+        return bool(self.get_vitals().quick_prayer_active)
     
-@dataclass
-class PlayerPosition:
-    tile: Tuple[int,int,int]
-    chunk: int
-    region: int
-
     
 class UIArea(Enum):
     TOOLPLANE = 'toolplane'
@@ -1439,9 +1511,9 @@ class UISectors:
         """
         # Determine the toolplane template based on the UI type
         if uitype == UIType.MODERN:
-            toolplane = Image.open('data/ui/toolplane-modern.png')
+            toolplane = templates.get('data/ui/toolplane-modern.png')
         else:
-            toolplane = Image.open('data/ui/toolplane-classic.png')
+            toolplane = templates.get('data/ui/toolplane-classic.png')
         
         # Find the toolplane match
         self.toolplane = find_subimage(
@@ -1450,8 +1522,8 @@ class UISectors:
         )
 
         # Find the chat area matches
-        chat_bottom_right = Image.open('data/ui/chat-bottom-right.png')
-        chat_top_left = Image.open('data/ui/chat-top-left.png')
+        chat_bottom_right = templates.get('data/ui/chat-bottom-right.png')
+        chat_top_left = templates.get('data/ui/chat-top-left.png')
 
         match_br = find_subimage(
             sc, chat_bottom_right,
@@ -1501,13 +1573,14 @@ class ToolplaneContext:
             "music":     Path("data/ui/music.webp"),
             # progress / groups / friends omitted for now
         }
-        self._TEMPLATE_CACHE = {k: Image.open(p) for k, p in self._TEMPLATE_PATHS.items()}
+        self._TEMPLATE_CACHE = {k: templates.get(p.as_posix()) for k, p in self._TEMPLATE_PATHS.items()}
 
 
     @timeit
-    def find_matches(self, screenshot: Image.Image, max_workers: int | None = 10):
+    def find_matches(self, screenshot: Image.Image, executor: ExecutorService | None = None):
         """
-        Locate all tool-plane icons in *screenshot* concurrently.
+        Locate all tool-plane icons in *screenshot* concurrently on the
+        executor's CV lane (sequentially if no executor is given).
         Results are assigned to the matching attributes (self.combat, …).
         """
         def _worker(name_img):
@@ -1516,14 +1589,16 @@ class ToolplaneContext:
                 screenshot, tpl_img, min_scale=0.9, max_scale=1.1
             )
 
-        # ThreadPoolExecutor is ideal here because find_subimage is
-        # largely I/O / C-extension work, not pure Python CPU.
+        # threads are fine here because find_subimage is
+        # largely C-extension work, not pure Python CPU.
         template_items = self._template_items()
-        with ThreadPoolExecutor(max_workers=min(MAXTHREAD, len(template_items))) as pool:
-            futures = (pool.submit(_worker, item) for item in template_items)
-            for fut in as_completed(futures):
-                name, match = fut.result()
-                setattr(self, name, match)
+        if executor is None:
+            results = (_worker(item) for item in template_items)
+        else:
+            futures = [executor.submit(Lane.CV, _worker, item) for item in template_items]
+            results = (fut.result() for fut in as_completed(futures))
+        for name, match in results:
+            setattr(self, name, match)
 
     # ────────────────────────────────────────────────────────────────
     # helper: iterator of (name, template-image) pairs
@@ -1531,56 +1606,18 @@ class ToolplaneContext:
     def _template_items(self):
         return self._TEMPLATES.items() if "_TEMPLATES" in globals() else self._TEMPLATE_CACHE.items()
 
-    def _is_tab_active(self,
-            screenshot: Image.Image,
-            match: MatchResult,
-            pad: int = 4,
-        ) -> float:
-        """
-        Returns the fraction of pixels in the padded match box
-        that fall into the 'red' HSV range.
-        """
-        # Crop with padding
-        x1 = max(match.start_x - pad, 0)
-        y1 = max(match.start_y - pad, 0)
-        x2 = min(match.end_x + pad, screenshot.width)
-        y2 = min(match.end_y + pad, screenshot.height)
-        patch = screenshot.crop((x1, y1, x2, y2)).convert("RGB")
-        arr   = np.array(patch)
-
-        # Convert to HSV
-        hsv = cv2.cvtColor(arr, cv2.COLOR_RGB2HSV)
-        # Two red hue ranges
-        lo1, hi1 = np.array([0, 50, 50]),  np.array([10, 255, 255])
-        lo2, hi2 = np.array([160, 50, 50]), np.array([180, 255, 255])
-        m1 = cv2.inRange(hsv, lo1, hi1)
-        m2 = cv2.inRange(hsv, lo2, hi2)
-        red_mask = cv2.bitwise_or(m1, m2)
-
-        # Fraction of red pixels
-        return red_mask.mean() / 255.0
-
     @timeit
     def get_active_tab(self, screenshot: Image.Image) -> str | None:
         """
-        Returns the name of the active tab (highest red‐ratio),
-        or None if no tab exceeds the threshold.
+        Returns the name of the active tab (highest red ratio), or None if no
+        tab shows any. Clients should prefer RuneLiteClient.active_tab(),
+        which avoids re-scoring an unchanged strip.
         """
-        best_tab = None
-        best_score = 0.0
-        for variable in vars(self):
-            match = getattr(self, variable)
-            if not isinstance(match, MatchResult):
-                continue
-            score = self._is_tab_active(screenshot, match)
-            if score > best_score:
-                best_score = score
-                best_tab = variable
-
-            
-
-        # you can choose to only return if best_score > some threshold
-        return best_tab
+        rects = tab_rects(self)
+        if not rects:
+            return None
+        strip = strip_bounds(rects)
+        return best_tab(tab_scores(strip.crop_in(screenshot), rects, strip))
     
 
 class MinimapContext:
@@ -1609,7 +1646,7 @@ class MinimapContext:
     def find_matches(self, screenshot: Image.Image):
         """Finds and sets the matches for health, prayer, run, and spec."""
 
-        map = find_subimage(screenshot, Image.open("data/ui/map.webp"))
+        map = find_subimage(screenshot, templates.get("data/ui/map.webp"))
         map.shape = MatchShape.ELIPSE
         self.map = map.transform(-63, -60).scale_px(60)
         self.health = map.transform(-152, -76)
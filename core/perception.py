@@ -0,0 +1,97 @@
+"""
+Published perception state.
+
+RuneLiteClient pushes the results of reads it has already done (position,
+vitals, active tab, inventory) into a PerceptionState. Readers such as the
+API get the latest values without triggering a capture or OCR pass.
+
+Each publish swaps in a new immutable snapshot, so readers never take a
+lock; only writers serialize among themselves.
+"""
+import threading
+import time
+from dataclasses import dataclass, asdict, is_dataclass
+from enum import Enum
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional
+
+
+@dataclass(frozen=True)
+class StampedValue:
+    value: Any
+    timestamp: float
+    version: int
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.timestamp
+
+
+def _jsonable(value: Any) -> Any:
+    if is_dataclass(value):
+        return asdict(value)
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, dict):
+        return {str(k): _jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    return value
+
+
+class PerceptionState:
+    """Latest timestamped value per key (e.g. 'position', 'vitals.health')."""
+
+    def __init__(self):
+        # (version, values) swapped as one reference so readers see a consistent pair
+        self._state: tuple[int, Mapping[str, StampedValue]] = (0, MappingProxyType({}))
+        self._write_lock = threading.Lock()
+        self._changed = threading.Condition()
+
+    @property
+    def version(self) -> int:
+        return self._state[0]
+
+    def publish(self, key: str, value: Any):
+        """Record `value` for `key`; never blocks readers."""
+        with self._write_lock:
+            version, values = self._state
+            version += 1
+            snap = dict(values)
+            snap[key] = StampedValue(value, time.time(), version)
+            self._state = (version, MappingProxyType(snap))
+        with self._changed:
+            self._changed.notify_all()
+
+    def get(self, key: str) -> Optional[StampedValue]:
+        return self._state[1].get(key)
+
+    def snapshot(self) -> Mapping[str, StampedValue]:
+        """Current immutable snapshot."""
+        return self._state[1]
+
+    def wait_for_change(self, since_version: int, timeout: float) -> bool:
+        """Block until the version moves past `since_version`; False on timeout."""
+        deadline = time.time() + timeout
+        with self._changed:
+            while self._state[0] <= since_version:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return False
+                self._changed.wait(remaining)
+        return True
+
+    def to_dict(self) -> Dict[str, Any]:
+        version, snap = self._state
+        return {
+            "version": version,
+            "values": {
+                key: {
+                    "value": _jsonable(sv.value),
+                    "timestamp": sv.timestamp,
+                    "age": round(sv.age, 3),
+                    "version": sv.version,
+                }
+                for key, sv in snap.items()
+            },
+        }
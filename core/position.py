@@ -0,0 +1,238 @@
+"""
+Player position from the RuneLite World Location panel.
+
+The panel is located once per window layout; afterwards only its rectangle
+is grabbed, and the tile/chunk/region fields are OCR'd only when their pixels
+change. PositionTracker runs that read on a background thread and publishes
+every change, so movement checks answer from the latest sample instead of
+two reads taken most of a second apart.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple, TYPE_CHECKING
+
+from PIL import Image
+
+from core import templates, tools
+from core.logger import get_logger
+from core.ocr.custom import read_location_numbers
+from core.region_match import MatchResult
+
+if TYPE_CHECKING:
+    from core.osrs_client import RuneLiteClient
+
+POSITION_STATE = 'data/ui/player-position-state.png'
+
+# fields of the panel, relative to the POSITION_STATE match
+FIELDS: Dict[str, MatchResult] = {
+    "tile": MatchResult(40, 6, 128, 21),
+    "chunk": MatchResult(75, 22, 127, 37),
+    "region": MatchResult(85, 38, 127, 53),
+}
+# the player moves at most once per game tick (0.6 s); unchanged for longer means stopped
+STILL_FOR = 0.75
+# consecutive unreadable samples before the panel is searched for again
+MAX_MISSES = 5
+# after a failed search the background loop waits this long (or for a layout change)
+LOCATE_BACKOFF = 5.0
+
+
+@dataclass
+class PlayerPosition:
+    tile: Tuple[int,int,int]
+    chunk: int
+    region: int
+    # when this position was first seen (wall time); not part of equality
+    timestamp: float = field(default=0.0, compare=False)
+
+
+class PositionTracker:
+    """Samples the World Location panel of a RuneLiteClient and publishes 'position'."""
+
+    def __init__(self, client: 'RuneLiteClient', interval: float = 0.05):
+        self.client = client
+        self.interval = interval
+        self.log = get_logger('PositionTracker')
+        self.latest: Optional[PlayerPosition] = None
+        # when the position last changed / the tracker last produced a sample
+        self.last_change_at = 0.0
+        self.last_sample_at = 0.0
+        self.started_at = 0.0
+        self._roi_key = None
+        self._roi: Optional[MatchResult] = None
+        self._digest = None
+        self._misses = 0
+        # (layout_version, time) of the last failed background search
+        self._locate_failed: Optional[Tuple[int, float]] = None
+        self._lock = threading.Lock()
+        self._changed = threading.Condition()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # ---- reading -----------------------------------------------------
+    def locate(self, sc: Image.Image = None) -> MatchResult:
+        """Full-window search for the panel; cached until the layout changes."""
+        if self._roi is not None and self._roi_key == self.client.layout_version:
+            return self._roi
+        sc = sc or self.client.get_screenshot()
+        match = self.client.find_in_window(
+            templates.get(POSITION_STATE), sc, min_scale=1, max_scale=1, min_confidence=0
+        )
+        if match.confidence < 0.98:
+            raise RuntimeError('Missing plugin: "World Location" please install & enable "Grid Location" with "Grid Info Type" == "UniqueID"')
+        self._roi = match
+        self._roi_key = self.client.layout_version
+        self._digest = None
+        return match
+
+    @staticmethod
+    def parse(panel: Image.Image) -> Optional[PlayerPosition]:
+        """Read the panel fields; None when any field is unreadable."""
+        panel = tools.mask_colors(panel, [(255, 255, 255)])
+        try:
+            tile_val = read_location_numbers(FIELDS['tile'].crop_in(panel))
+            tile = tuple(int(t.strip()) for t in tile_val.split(',') if t.isdigit())
+            chunk = int(read_location_numbers(FIELDS['chunk'].crop_in(panel)).strip())
+            region = int(read_location_numbers(FIELDS['region'].crop_in(panel)).strip())
+        except ValueError:
+            return None
+        if not tile:
+            return None
+        return PlayerPosition(tile=tile, chunk=chunk, region=region)
+
+    def read(self, sc: Image.Image = None) -> Optional[PlayerPosition]:
+        """
+        One sample. With `sc` the panel is cropped from it, otherwise only the
+        panel rectangle is captured. Unchanged pixels reuse the last position.
+        """
+        roi = self.locate(sc)
+        panel = roi.crop_in(sc) if sc is not None else self.client.capture_region(roi)
+        now = time.time()
+        with self._lock:
+            digest = hash(panel.tobytes())
+            if digest == self._digest and self.latest is not None:
+                self.last_sample_at = now
+                return self.latest
+            position = self.parse(panel)
+            if position is None:
+                self._misses += 1
+                if self._misses >= MAX_MISSES:
+                    # panel moved or got covered; find it again on the next read
+                    self._roi = None
+                    self._misses = 0
+                return None
+            self._misses = 0
+            self._digest = digest
+            self.last_sample_at = now
+            if position != self.latest:
+                position.timestamp = now
+                if self.latest is not None:
+                    # the first sample is where the player is, not a move
+                    self.last_change_at = now
+                self.latest = position
+                self.client.state.publish('position', position)
+                with self._changed:
+                    self._changed.notify_all()
+            return self.latest
+
+    # ---- background sampling ----------------------------------------
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start sampling in the background. Idempotent."""
+        if self.running:
+            return
+        self.locate()
+        self._stop.clear()
+        self.started_at = time.time()
+        self._thread = threading.Thread(target=self._loop, name='position-tracker', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _needs_locate(self) -> bool:
+        return self._roi is None or self._roi_key != self.client.layout_version
+
+    def _backing_off(self) -> bool:
+        failed = self._locate_failed
+        return failed is not None and failed[0] == self.client.layout_version \
+            and time.time() - failed[1] < LOCATE_BACKOFF
+
+    def _window_frame(self) -> Image.Image:
+        """Whole window through capture_region: no focusing, cached screenshot left alone."""
+        geom = getattr(self.client.window, 'geometry', None) or self.client.window
+        return self.client.capture_region(MatchResult(0, 0, geom.width, geom.height))
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                # don't sample whatever is covering the client
+                if self.client.has_focus():
+                    if not self._needs_locate():
+                        self.read()
+                    elif not self._backing_off():
+                        try:
+                            self.locate(self._window_frame())
+                            self._locate_failed = None
+                        except Exception:
+                            self._locate_failed = (self.client.layout_version, time.time())
+                            raise
+                        self.read()
+            except Exception as e:
+                self.log.debug(f'Position sample failed: {e}')
+            self._stop.wait(self.interval)
+
+    # ---- queries -----------------------------------------------------
+    def _wait_for_history(self, still_for: float):
+        """Movement answers need `still_for` seconds of samples."""
+        self.start()
+        remaining = self.started_at + still_for - time.time()
+        if remaining > 0:
+            time.sleep(remaining)
+
+    def is_moving(self, still_for: float = STILL_FOR) -> bool:
+        """True when the position changed within the last `still_for` seconds."""
+        self._wait_for_history(still_for)
+        return time.time() - self.last_change_at < still_for
+
+    def wait_until_stopped(self, timeout: float = 10, still_for: float = STILL_FOR) -> bool:
+        """Block until the position has been unchanged for `still_for` seconds; False on timeout."""
+        deadline = time.time() + timeout
+        self._wait_for_history(still_for)
+        while True:
+            idle = time.time() - self.last_change_at
+            if idle >= still_for:
+                return True
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return False
+            time.sleep(min(still_for - idle, remaining, self.interval))
+
+    def wait_until_within(
+            self,
+            x: int, y: int,
+            tolerance: int = 0,
+            timeout: float = 10
+        ) -> bool:
+        """
+        Block until the player's tile is within `tolerance` of (x, y);
+        wakes on each published position change. False on timeout.
+        """
+        self.start()
+        deadline = time.time() + timeout
+        with self._changed:
+            while True:
+                pos = self.latest
+                if pos is not None and len(pos.tile) >= 2 and \
+                        abs(pos.tile[0] - x) <= tolerance and abs(pos.tile[1] - y) <= tolerance:
+                    return True
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return False
+                self._changed.wait(remaining)
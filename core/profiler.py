@@ -0,0 +1,144 @@
+"""
+On-demand sampling profiler.
+
+Walks every thread's stack via `sys._current_frames()` at a fixed interval,
+so it can be pointed at a running bot without restarting it or attaching an
+external tool. Output is collapsed-stack text (flamegraph.pl / speedscope
+input) plus a self-time table.
+"""
+import sys
+import os
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+MAX_SECONDS = 120
+_profile_lock = threading.Lock()
+
+# Thread roles, checked in order. Name prefixes win over stack contents so a
+# bot thread that happens to be inside tesseract is still billed to the bot.
+_NAME_ROLES: List[Tuple[str, str]] = [
+    ("MainThread", "bot"),
+    ("logger", "logger"),
+    ("api", "api"),
+    ("cvdebug", "cv_debug"),
+    ("control", "control"),
+    ("rl-cv", "cv"),
+    ("rl-ocr", "ocr"),
+    ("rl-io", "io"),
+    ("x11-watch", "window"),
+    ("window-watch", "window"),
+    ("position-tracker", "perception"),
+]
+_STACK_ROLES: List[Tuple[str, str]] = [
+    ("pytesseract", "ocr"),
+    (os.path.join("core", "ocr"), "ocr"),
+    ("mss", "capture"),
+    ("get_screenshot", "capture"),
+    ("logging", "logger"),
+    ("websockets", "logger"),
+]
+
+
+@dataclass
+class ProfileResult:
+    seconds: float
+    interval: float
+    samples: int = 0
+    stacks: Counter = field(default_factory=Counter)
+    self_time: Counter = field(default_factory=Counter)
+    total_time: Counter = field(default_factory=Counter)
+    roles: Counter = field(default_factory=Counter)
+
+    def collapsed(self) -> str:
+        """Brendan Gregg collapsed format: `frame;frame;frame count` per line."""
+        return "\n".join(f"{stack} {cnt}" for stack, cnt in self.stacks.most_common())
+
+    def top(self, n: int = 25) -> List[Dict]:
+        """Functions with the most self samples."""
+        rows = []
+        for frame, cnt in self.self_time.most_common(n):
+            rows.append({
+                "frame": frame,
+                "self_samples": cnt,
+                "self_pct": round(100 * cnt / max(self.samples, 1), 2),
+                "total_samples": self.total_time[frame],
+                "self_ms": round(cnt * self.interval * 1000, 1),
+            })
+        return rows
+
+    def to_dict(self, top_n: int = 25) -> Dict:
+        return {
+            "seconds": self.seconds,
+            "interval": self.interval,
+            "samples": self.samples,
+            "roles": dict(self.roles),
+            "top": self.top(top_n),
+            "collapsed": self.collapsed(),
+        }
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _thread_role(name: str, files: List[str], funcs: List[str]) -> str:
+    for prefix, role in _NAME_ROLES:
+        if name.startswith(prefix):
+            return role
+    for needle, role in _STACK_ROLES:
+        if any(needle in f for f in files) or needle in funcs:
+            return role
+    return "worker"
+
+
+def sample(seconds: float = 5, interval: float = 0.005) -> ProfileResult:
+    """
+    Sample all thread stacks for `seconds`.
+
+    Args:
+        seconds: how long to sample (capped at MAX_SECONDS).
+        interval: delay between samples in seconds.
+
+    Returns:
+        ProfileResult with collapsed stacks, self/total counts and per-role sample counts.
+    """
+    seconds = max(0.1, min(float(seconds), MAX_SECONDS))
+    interval = max(0.001, float(interval))
+    if not _profile_lock.acquire(blocking=False):
+        raise RuntimeError("A profile is already running")
+
+    result = ProfileResult(seconds=seconds, interval=interval)
+    me = threading.get_ident()
+    try:
+        end = time.perf_counter() + seconds
+        while time.perf_counter() < end:
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for tid, frame in sys._current_frames().items():
+                if tid == me:
+                    continue
+                labels, files, funcs = [], [], []
+                while frame is not None:
+                    labels.append(_frame_label(frame))
+                    files.append(frame.f_code.co_filename)
+                    funcs.append(frame.f_code.co_name)
+                    frame = frame.f_back
+                if not labels:
+                    continue
+                name = names.get(tid, f"thread-{tid}")
+                role = _thread_role(name, files, funcs)
+
+                result.samples += 1
+                result.roles[role] += 1
+                result.self_time[labels[0]] += 1
+                for label in set(labels):
+                    result.total_time[label] += 1
+                labels.reverse()
+                result.stacks[";".join([f"{role}:{name}"] + labels)] += 1
+            time.sleep(interval)
+    finally:
+        _profile_lock.release()
+    return result
@@ -0,0 +1,151 @@
+"""
+Skilling-status boxes (the RuneLite "Mining" / "NOT fishing" overlays).
+
+Finding the boxes means a full-window template search plus an OCR pass per
+box to tell which skill each one belongs to, so that is done once: every box
+found is labeled and remembered until the layout changes. Later checks grab
+only the remembered box, confirm it is still the same skill's box (one
+template comparison, plus the digest of its title line's text shape, since
+when one overlay disappears the box below moves up into its place), and count
+its red and green text pixels. The counters below the title change all the
+time and are left out of the digest. A title not seen before in that box
+(the skill flipping between "Mining" and "NOT mining") is OCR'd once in
+place; only a box that moved, disappeared or now belongs to another skill
+triggers a fresh search.
+"""
+from __future__ import annotations
+
+import threading
+from typing import Dict, List, Optional, Set, Tuple, TYPE_CHECKING
+
+import numpy as np
+from PIL import Image
+
+from core import ocr, templates, tools
+from core.logger import get_logger
+from core.region_match import MatchResult
+from core.tools import find_subimage, find_subimages, timeit
+
+if TYPE_CHECKING:
+    from core.osrs_client import RuneLiteClient
+
+SKILLING_STATE = 'data/ui/skilling-state.png'
+MIN_CONFIDENCE = 0.98
+RED = (255, 0, 0)
+GREEN = (0, 255, 0)
+WHITE = (255, 255, 255)
+# rows of the box holding the title line (panel border, then one line of text)
+TITLE_ROWS = slice(2, 20)
+
+
+def status_pixels(img: Image.Image) -> Tuple[int, int]:
+    """(red, green) pure-colour pixel counts."""
+    rgb = np.asarray(img.convert('RGB'))
+    red = np.count_nonzero((rgb == RED).all(axis=2))
+    green = np.count_nonzero((rgb == GREEN).all(axis=2))
+    return red, green
+
+
+def label_digest(img: Image.Image) -> int:
+    """Digest of the text shape (white, red or green pixels) of a box's title line."""
+    rgb = np.asarray(img.convert('RGB'))[TITLE_ROWS]
+    text = np.zeros(rgb.shape[:2], dtype=bool)
+    for colour in (WHITE, RED, GREEN):
+        text |= (rgb == colour).all(axis=2)
+    return hash(np.packbits(text).tobytes())
+
+
+class SkillingStateReader:
+    """Remembers where each skilling-status box of a RuneLiteClient is and reads its colour."""
+
+    def __init__(self, client: 'RuneLiteClient'):
+        self.client = client
+        self.log = get_logger('SkillingStateReader')
+        self._lock = threading.Lock()
+        self._key = None
+        # (label, box, label digest) for every status box found by the last search
+        self._boxes: List[Tuple[str, MatchResult, int]] = []
+        # substring -> (box, title digests seen in it while it showed that skill)
+        self._rois: Dict[str, Tuple[MatchResult, Set[int]]] = {}
+        self.stats = {'checks': 0, 'rescans': 0, 'ocr': 0}
+
+    def _label(self, box: Image.Image) -> str:
+        self.stats['ocr'] += 1
+        masked = tools.mask_colors(box, [list(WHITE), list(RED), list(GREEN)])
+        return ocr.execute(
+            masked,
+            font=ocr.FontChoice.RUNESCAPE_PLAIN_12,
+            psm=ocr.TessPsm.SPARSE_TEXT,
+            raise_on_blank=False,
+        ).lower()
+
+    def rescan(self, sc: Image.Image = None) -> List[Tuple[str, MatchResult, int]]:
+        """Search the whole window for status boxes and label each one."""
+        self.stats['rescans'] += 1
+        sc = sc or self.client.get_screenshot()
+        matches = find_subimages(
+            sc, templates.get(SKILLING_STATE),
+            min_scale=1, max_scale=1,
+            min_confidence=MIN_CONFIDENCE
+        )
+        crops = [(m, m.crop_in(sc)) for m in matches]
+        self._boxes = [(self._label(crop), m, label_digest(crop)) for m, crop in crops]
+        self._rois.clear()
+        self._key = self.client.layout_version
+        return self._boxes
+
+    def _still_there(self, crop: Image.Image, substring: str, digests: Set[int]) -> bool:
+        template = templates.get(SKILLING_STATE)
+        if crop.size != template.size:
+            return False
+        if find_subimage(crop, template, min_scale=1, max_scale=1).confidence < MIN_CONFIDENCE:
+            return False
+        digest = label_digest(crop)
+        if digest in digests:
+            return True
+        # new title in the same place: the state flipped, or another box moved up
+        if substring not in self._label(crop):
+            return False
+        digests.add(digest)
+        return True
+
+    def _locate(self, substring: str) -> Optional[Tuple[MatchResult, Set[int]]]:
+        if self._key != self.client.layout_version:
+            self._boxes, self._rois = [], {}
+        roi = self._rois.get(substring)
+        if roi is not None:
+            return roi
+        for label, box, digest in self._boxes:
+            if substring in label:
+                self._rois[substring] = (box, {digest})
+                return self._rois[substring]
+        return None
+
+    @timeit
+    def is_active(self, substring: str, sc: Image.Image = None) -> bool:
+        """
+        True when the status box whose label contains `substring` shows green.
+        ValueError when there is no such box or it shows neither colour.
+        """
+        substring = substring.lower()
+        with self._lock:
+            self.stats['checks'] += 1
+            crop = None
+            found = self._locate(substring)
+            if found is not None:
+                roi, digests = found
+                crop = roi.crop_in(sc) if sc is not None else self.client.capture_region(roi)
+                if not self._still_there(crop, substring, digests):
+                    crop = None
+            if crop is None:
+                # moved, gone, relabeled or never seen: search again
+                sc = sc or self.client.get_screenshot()
+                self.rescan(sc)
+                found = self._locate(substring)
+                if found is None:
+                    raise ValueError(f"Could not find skilling state for substring: {substring}")
+                crop = found[0].crop_in(sc)
+        red, green = status_pixels(crop)
+        if red or green:
+            return green > red
+        raise ValueError(f"Could not determine skilling state for substring: {substring}. No red or green pixels found in {crop.size} image.")
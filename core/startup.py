@@ -0,0 +1,114 @@
+"""
+Staged, parallel startup.
+
+Each stage is a callable with explicit dependencies; stages whose
+dependencies are done run concurrently. A stage is called with the
+results of its dependencies, in the order they were declared:
+
+    graph = StartupGraph('Bot')
+    graph.add('itemdb', ItemLookup)
+    graph.add('client', RuneLiteClient)
+    graph.add('bank', BankInterface, deps=('client', 'itemdb'))
+    results = graph.run()
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, Future, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Tuple
+
+from core.logger import get_logger
+
+
+@dataclass
+class StartupStage:
+    name: str
+    fn: Callable
+    deps: Tuple[str, ...] = ()
+    started_at: float | None = None
+    finished_at: float | None = None
+
+    @property
+    def duration(self) -> float | None:
+        if self.started_at is None or self.finished_at is None:
+            return None
+        return self.finished_at - self.started_at
+
+
+@dataclass
+class StartupGraph:
+    name: str = 'startup'
+    max_workers: int = 4
+    stages: Dict[str, StartupStage] = field(default_factory=dict)
+    results: Dict[str, Any] = field(default_factory=dict)
+    started_at: float | None = None
+    finished_at: float | None = None
+
+    def __post_init__(self):
+        self.log = get_logger(f'{self.name}.startup')
+
+    def add(self, name: str, fn: Callable, deps: Tuple[str, ...] = ()) -> 'StartupGraph':
+        for dep in deps:
+            if dep not in self.stages:
+                raise ValueError(f"Stage '{name}' depends on unknown stage '{dep}'")
+        self.stages[name] = StartupStage(name, fn, tuple(deps))
+        return self
+
+    def _run_stage(self, stage: StartupStage) -> Any:
+        stage.started_at = time.time()
+        try:
+            return stage.fn(*(self.results[d] for d in stage.deps))
+        finally:
+            stage.finished_at = time.time()
+            self.log.debug(f"Stage '{stage.name}' finished in {stage.duration:.3f}s")
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Run every stage once its dependencies are done.
+        The first stage failure is re-raised after in-flight stages settle.
+        """
+        self.started_at = time.time()
+        pending = dict(self.stages)
+        running: Dict[Future, StartupStage] = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=f'{self.name}-startup') as pool:
+            while pending or running:
+                for name, stage in list(pending.items()):
+                    if all(d in self.results for d in stage.deps):
+                        running[pool.submit(self._run_stage, stage)] = stage
+                        del pending[name]
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    stage = running.pop(fut)
+                    try:
+                        self.results[stage.name] = fut.result()
+                    except Exception as e:
+                        self.log.error(f"Startup stage '{stage.name}' failed: {e}")
+                        for other in running:
+                            other.cancel()
+                        wait(running)
+                        raise
+
+        self.finished_at = time.time()
+        self.log.info(f'Startup finished in {self.finished_at - self.started_at:.2f}s ({self._summary()})')
+        return self.results
+
+    def _summary(self) -> str:
+        return ', '.join(
+            f'{s.name}={s.duration:.2f}s' for s in self.stages.values() if s.duration is not None
+        )
+
+    def report(self) -> Dict[str, Any]:
+        """Per-stage timings relative to the start of the run."""
+        base = self.started_at or 0
+        return {
+            'total': (self.finished_at - base) if self.finished_at else None,
+            'stages': {
+                s.name: {
+                    'deps': list(s.deps),
+                    'start': (s.started_at - base) if s.started_at else None,
+                    'duration': s.duration,
+                }
+                for s in self.stages.values()
+            },
+        }
@@ -0,0 +1,54 @@
+"""
+Shared cache of UI template images.
+
+Templates are decoded once and shared; `preload()` lets startup decode
+the common set on a worker thread before the first search needs them.
+"""
+import threading
+from typing import Dict, Iterable
+
+from PIL import Image
+
+_lock = threading.Lock()
+_cache: Dict[str, Image.Image] = {}
+
+# Templates needed for UI calibration and the most common per-action reads
+UI_TEMPLATES = (
+    'data/ui/toolplane-modern.png',
+    'data/ui/toolplane-classic.png',
+    'data/ui/map.webp',
+    'data/ui/chat-top-left.png',
+    'data/ui/chat-bottom-right.png',
+    'data/ui/player-position-state.png',
+    'data/ui/action-hover.png',
+    'data/ui/combat.webp',
+    'data/ui/stats.webp',
+    'data/ui/inventory.webp',
+    'data/ui/equipment.webp',
+    'data/ui/prayer.webp',
+    'data/ui/spellbook.webp',
+    'data/ui/account.webp',
+    'data/ui/logout.webp',
+    'data/ui/settings.webp',
+    'data/ui/emotes.webp',
+    'data/ui/music.webp',
+)
+
+
+def get(path: str) -> Image.Image:
+    """Return the decoded template at `path`, loading it on first use."""
+    img = _cache.get(path)
+    if img is not None:
+        return img
+    loaded = Image.open(path)
+    loaded.load()
+    with _lock:
+        # another thread may have won the race; keep the first one
+        return _cache.setdefault(path, loaded)
+
+
+def preload(paths: Iterable[str] = UI_TEMPLATES) -> int:
+    """Decode `paths` into the cache. Returns the number of templates loaded."""
+    for path in paths:
+        get(path)
+    return len(_cache)
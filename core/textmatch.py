@@ -0,0 +1,173 @@
+"""
+Bit-parallel fuzzy string matching for comparing OCR output.
+
+Similarity is the indel ratio 2 * LCS / (len(a) + len(b)), the quantity
+difflib's SequenceMatcher.ratio() approximates, so existing thresholds keep
+their meaning (it is never lower than difflib's score for the same pair).
+The LCS is computed with the bit-vector recurrence of Allison-Dix/Hyyrö: one
+machine word holds the whole pattern and each text character costs a few
+word operations. When many strings are compared against one pattern (every
+window of every OCR line, every chat line), each string is a lane of a
+uint64 array and all lanes advance together, one text column per step.
+Levenshtein distance (Myers/Hyyrö) is provided for callers that need edits
+rather than similarity.
+"""
+from __future__ import annotations
+
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+# patterns up to this length fit one uint64 lane
+WORD = 64
+
+
+def _masks(pattern: str) -> Dict[str, int]:
+    """Per character, the bit positions where it occurs in `pattern`."""
+    pm: Dict[str, int] = {}
+    for i, ch in enumerate(pattern):
+        pm[ch] = pm.get(ch, 0) | (1 << i)
+    return pm
+
+
+def lcs(a: str, b: str) -> int:
+    """Length of the longest common subsequence of `a` and `b`."""
+    if len(a) > len(b):
+        a, b = b, a
+    if not a:
+        return 0
+    pm = _masks(a)
+    full = (1 << len(a)) - 1
+    v = full
+    for ch in b:
+        u = v & pm.get(ch, 0)
+        v = ((v + u) | (v - u)) & full
+    return len(a) - bin(v).count('1')
+
+
+def levenshtein(a: str, b: str) -> int:
+    """Edit distance (insert/delete/substitute) between `a` and `b`, Myers/Hyyrö."""
+    if len(a) > len(b):
+        a, b = b, a
+    m = len(a)
+    if not m:
+        return len(b)
+    pm = _masks(a)
+    full = (1 << m) - 1
+    last = 1 << (m - 1)
+    pv, mv, score = full, 0, m
+    for ch in b:
+        eq = pm.get(ch, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & full)
+        mh = pv & xh
+        if ph & last:
+            score += 1
+        elif mh & last:
+            score -= 1
+        ph = ((ph << 1) | 1) & full
+        mh = (mh << 1) & full
+        pv = mh | (~(xv | ph) & full)
+        mv = ph & xv
+    return score
+
+
+def ratio(a: str, b: str) -> float:
+    """Similarity 0..1 of the whole strings (1.0 for two empty strings)."""
+    total = len(a) + len(b)
+    if not total:
+        return 1.0
+    return 2.0 * lcs(a, b) / total
+
+
+# ---- many strings against one pattern ----------------------------------
+def _lut(pattern: str) -> Tuple[Dict[str, int], np.ndarray]:
+    """Character codes for `pattern`'s alphabet (0 = any other char / padding) and their masks."""
+    masks = _masks(pattern)
+    lut = {ch: i + 1 for i, ch in enumerate(masks)}
+    pm = np.zeros(len(lut) + 1, dtype=np.uint64)
+    for ch, code in lut.items():
+        pm[code] = np.uint64(masks[ch])
+    return lut, pm
+
+
+def _encode(text: str, lut: Dict[str, int], width: int) -> np.ndarray:
+    codes = np.zeros(max(width, len(text)), dtype=np.intp)
+    codes[:len(text)] = [lut.get(ch, 0) for ch in text]
+    return codes
+
+
+def _lcs_lanes(codes: np.ndarray, pm: np.ndarray, m: int) -> np.ndarray:
+    """LCS of an m-char pattern (m <= WORD) against every row of `codes`."""
+    full = np.uint64((1 << m) - 1)
+    v = np.full(codes.shape[0], full, dtype=np.uint64)
+    for col in codes.T:
+        u = v & pm[col]
+        # uint64 addition wraps; carries past bit m are masked off anyway
+        v = ((v + u) | (v - u)) & full
+    ones = np.unpackbits(v.view(np.uint8)).reshape(-1, 64).sum(axis=1)
+    return m - ones.astype(np.int64)
+
+
+def ratios(candidates: Sequence[str], pattern: str) -> np.ndarray:
+    """ratio(c, pattern) for every candidate, computed in one pass."""
+    m = len(pattern)
+    if not candidates:
+        return np.zeros(0)
+    if not m or m > WORD:
+        return np.array([ratio(c, pattern) for c in candidates])
+    lut, pm = _lut(pattern)
+    width = max(len(c) for c in candidates)
+    codes = np.stack([_encode(c, lut, width) for c in candidates])
+    lengths = np.array([len(c) for c in candidates])
+    return 2.0 * _lcs_lanes(codes, pm, m) / (lengths + m)
+
+
+def partial_ratios(texts: Sequence[str], pattern: str) -> np.ndarray:
+    """
+    For each text, how well `pattern` matches its best-matching part: 1.0 when
+    it is a substring, otherwise the best ratio over every window of the
+    pattern's length, and 0.0 for a text shorter than the pattern. Patterns of
+    three chars or fewer are compared with the whole text, where a window says
+    too little.
+    """
+    m = len(pattern)
+    scores = np.zeros(len(texts))
+    windows: List[np.ndarray] = []
+    owners: List[int] = []
+    lut = pm = None
+    for i, text in enumerate(texts):
+        if pattern in text:
+            scores[i] = 1.0
+        elif m <= 3:
+            scores[i] = ratio(text, pattern)
+        elif len(text) < m:
+            # no full-length window; a truncated read must not pass as a match
+            continue
+        elif m > WORD:
+            scores[i] = max(ratio(text[j:j + m], pattern) for j in range(len(text) - m + 1))
+        else:
+            if lut is None:
+                lut, pm = _lut(pattern)
+            rows = np.lib.stride_tricks.sliding_window_view(_encode(text, lut, m), m)
+            windows.append(rows)
+            owners.extend([i] * len(rows))
+    if windows:
+        found = 2.0 * _lcs_lanes(np.concatenate(windows), pm, m) / (2 * m)
+        np.maximum.at(scores, np.array(owners), found)
+    return scores
+
+
+def partial_ratio(text: str, pattern: str) -> float:
+    """partial_ratios for a single text."""
+    return float(partial_ratios([text], pattern)[0])
+
+
+def best_match(texts: Sequence[str], pattern: str) -> Tuple[int, float]:
+    """Index and score of the text `pattern` matches best (-1, 0.0 when `texts` is empty)."""
+    if not texts:
+        return -1, 0.0
+    scores = partial_ratios(texts, pattern)
+    i = int(np.argmax(scores))
+    return i, float(scores[i])
@@ -0,0 +1,144 @@
+"""
+Active toolplane tab, without a per-click scan.
+
+The active tab is the one with the most red highlight. All tab icons lie in
+one strip, so the strip is converted to HSV once and every tab's red
+fraction is read off the same mask. The result is then trusted until the
+client clicks something (clicks are what switch tabs, including the game
+switching after a spell cast) or a short while passes; after that the strip
+is captured again and only re-scored when its pixels changed.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from typing import Dict, Optional, TYPE_CHECKING
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from core.logger import get_logger
+from core.region_match import MatchResult
+from core.tools import timeit
+
+if TYPE_CHECKING:
+    from core.osrs_client import RuneLiteClient, ToolplaneContext
+
+PAD = 4
+# two red hue ranges of the active-tab highlight
+RED_RANGES = (
+    (np.array([0, 50, 50]), np.array([10, 255, 255])),
+    (np.array([160, 50, 50]), np.array([180, 255, 255])),
+)
+# how long a known tab is trusted without looking, when nothing was clicked
+TRUST_FOR = 2.0
+
+
+def tab_rects(toolplane: 'ToolplaneContext') -> Dict[str, MatchResult]:
+    """Padded rectangle of every located tab icon."""
+    rects = {}
+    for name, match in vars(toolplane).items():
+        if isinstance(match, MatchResult):
+            rects[name] = MatchResult(
+                max(match.start_x - PAD, 0), max(match.start_y - PAD, 0),
+                match.end_x + PAD, match.end_y + PAD
+            )
+    return rects
+
+
+def strip_bounds(rects: Dict[str, MatchResult]) -> MatchResult:
+    return MatchResult(
+        min(r.start_x for r in rects.values()), min(r.start_y for r in rects.values()),
+        max(r.end_x for r in rects.values()), max(r.end_y for r in rects.values())
+    )
+
+
+def tab_scores(strip: Image.Image, rects: Dict[str, MatchResult], origin: MatchResult) -> Dict[str, float]:
+    """Red fraction per tab, from one HSV conversion of `strip` (which starts at `origin`)."""
+    hsv = cv2.cvtColor(np.asarray(strip.convert('RGB')), cv2.COLOR_RGB2HSV)
+    red = np.zeros(hsv.shape[:2], dtype=bool)
+    for lo, hi in RED_RANGES:
+        red |= cv2.inRange(hsv, lo, hi) > 0
+    scores = {}
+    for name, r in rects.items():
+        patch = red[r.start_y - origin.start_y:r.end_y - origin.start_y,
+                    r.start_x - origin.start_x:r.end_x - origin.start_x]
+        scores[name] = float(patch.mean()) if patch.size else 0.0
+    return scores
+
+
+def best_tab(scores: Dict[str, float]) -> Optional[str]:
+    best, best_score = None, 0.0
+    for name, score in scores.items():
+        if score > best_score:
+            best, best_score = name, score
+    return best
+
+
+class ToolplaneTracker:
+    """Knows the active toolplane tab of a RuneLiteClient, looking only when it may have changed."""
+
+    def __init__(self, client: 'RuneLiteClient'):
+        self.client = client
+        self.log = get_logger('ToolplaneTracker')
+        self._lock = threading.Lock()
+        self._key = None
+        self._rects: Dict[str, MatchResult] = {}
+        self._strip: Optional[MatchResult] = None
+        self._digest = None
+        self.known: Optional[str] = None
+        self._clicks_seen = -1
+        self._verified_at = 0.0
+        self.stats = {'trusted': 0, 'unchanged': 0, 'scored': 0}
+
+    def _layout(self) -> Optional[MatchResult]:
+        key = self.client.layout_version
+        if self._key != key:
+            self._rects = tab_rects(self.client.toolplane)
+            self._strip = strip_bounds(self._rects) if self._rects else None
+            self._digest = None
+            self.known = None
+            self._key = key
+        return self._strip
+
+    @timeit
+    def active(self, sc: Image.Image = None) -> Optional[str]:
+        """
+        Name of the active tab. Answers from the known state while no click
+        happened in the last TRUST_FOR seconds; otherwise looks at the strip
+        (cropped from `sc` or captured) and re-scores it only if it changed.
+        """
+        with self._lock:
+            strip = self._layout()
+            if strip is None:
+                return None
+            now = time.time()
+            clicks = self.client.click_count
+            if sc is None and self.known is not None and clicks == self._clicks_seen \
+                    and now - self._verified_at < TRUST_FOR:
+                self.stats['trusted'] += 1
+                return self.known
+            img = strip.crop_in(sc) if sc is not None else self.client.capture_region(strip)
+            digest = hash(img.tobytes())
+            if digest == self._digest:
+                self.stats['unchanged'] += 1
+            else:
+                self.stats['scored'] += 1
+                self.known = best_tab(tab_scores(img, self._rects, strip))
+                self._digest = digest
+            self._clicks_seen = clicks
+            self._verified_at = now
+            return self.known
+
+    def assume(self, tab: str):
+        """
+        Record a tab we just clicked. Trusted like a read until the next click;
+        the first look after that re-scores, since the highlight may not have
+        been redrawn yet.
+        """
+        with self._lock:
+            self.known = tab
+            self._digest = None
+            self._clicks_seen = self.client.click_count
+            self._verified_at = time.time()
@@ -1,6 +1,6 @@
 import cv2
 import numpy as np
-from PIL import Image, ImageDraw, ImageEnhance, ImageFilter, ImageChops
+from PIL import Image, ImageDraw, ImageEnhance, ImageFilter
 from dataclasses import dataclass
 from enum import Enum
 from core import ocr
@@ -9,6 +9,8 @@ from core.region_match import MatchResult, ShapeResult, MatchShape
 from functools import wraps
 # Add this import (safe even if not enabled; enqueue is a no-op until enable() is called)
 from core import cv_debug
+from core import tracing
+from core import textmatch
 from io import BytesIO
 import base64
 
@@ -137,29 +139,12 @@ def mask_colors(
     The mask will be a new image where pixels matching the specified colors
     are set to white, and all other pixels are set to black.
     """
-    mask = Image.new("L", image.size, 0)  # Create a black mask
-
+    rgb = np.asarray(image.convert("RGB"), dtype=np.int16)
+    mask = np.zeros(rgb.shape[:2], dtype=bool)
     for color in colors:
-        # Create a color range for the mask
-        r, g, b = color
-        lower_bound = (max(0, r - tolerance), max(0, g - tolerance), max(0, b - tolerance))
-        upper_bound = (min(255, r + tolerance), min(255, g + tolerance), min(255, b + tolerance))
-
-        # Create a temporary image to find the matching pixels
-        temp_image = image.convert("RGB")
-        temp_mask = Image.new("L", image.size, 0)
-
-        for x in range(temp_image.width):
-            for y in range(temp_image.height):
-                pixel = temp_image.getpixel((x, y))
-                if (lower_bound[0] <= pixel[0] <= upper_bound[0] and
-                    lower_bound[1] <= pixel[1] <= upper_bound[1] and
-                    lower_bound[2] <= pixel[2] <= upper_bound[2]):
-                    temp_mask.putpixel((x, y), 255)
-
-        # Combine the temporary mask with the main mask for each color
-        mask = ImageChops.lighter(mask, temp_mask)
-    return mask.convert("L")  # Convert to binary mask (black and white)
+        # per-channel distance within tolerance, all colors in one array op each
+        mask |= (np.abs(rgb - np.array(color, dtype=np.int16)) <= tolerance).all(axis=2)
+    return Image.fromarray(mask.astype(np.uint8) * 255, "L")
     
 
 
@@ -232,16 +217,20 @@ def find_color_box(
     pil_img: Image.Image,
     target_rgb: Tuple[int, int, int],
     tol: int = 40,
+    exclude: Optional[np.ndarray] = None,
 ) -> ShapeResult:
     """
     Locate the largest rectangular outline drawn in `target_rgb` (± `tol`)
     and return a ShapeResult whose four vertices sit *inside* that border.
     Works for both axis‑aligned and rotated rectangles.
+    `exclude` is an optional (h, w) bool mask of pixels to ignore (True = ignored).
     """
     # 1. colour mask ────────────────────────────────────────────────────
     arr = np.asarray(pil_img.convert("RGB"))
     diff = np.abs(arr - np.array(target_rgb))
     mask = np.all(diff <= tol, axis=2) if tol else np.all(arr == target_rgb, axis=2)
+    if exclude is not None:
+        mask &= ~exclude
 
     # 2. connected components – grab largest blob ──────────────────────
     num, labels = cv2.connectedComponents(mask.astype(np.uint8), connectivity=4)
@@ -312,16 +301,9 @@ def mask_above_color_value(
     Create a mask for pixels in the image that have a color value above the specified threshold.
     The mask will be a new image where pixels above the threshold are set to white, and all other pixels are set to black.
     """
-    # Create a binary mask based on the threshold for RGB channels
-    mask = Image.new("L", image.size, 0)  # Create a black mask
-
-    for x in range(image.width):
-        for y in range(image.height):
-            r, g, b = image.getpixel((x, y))
-            if r > threshold or g > threshold or b > threshold:
-                mask.putpixel((x, y), 255)
-
-    return mask.convert("L")
+    rgb = np.asarray(image.convert("RGB"))
+    mask = (rgb > threshold).any(axis=2)
+    return Image.fromarray(mask.astype(np.uint8) * 255, "L")
 
 
 from functools import wraps
@@ -329,14 +311,14 @@ import time
 import inspect
 from PIL import ImageFont
 import re
-from difflib import SequenceMatcher
 
 def text_similarity(basetext: str, subtext: str) -> float:
     """
     Calculate similarity for a potential substring match.
     
     For exact substring matches, returns 1.0.
-    Otherwise, finds the best matching segment within basetext.
+    Otherwise, finds the best matching segment within basetext
+    (see core.textmatch.partial_ratio).
     
     Args:
         basetext (str): The full text to search within.
@@ -345,29 +327,13 @@ def text_similarity(basetext: str, subtext: str) -> float:
     Returns:
         float: The similarity ratio (0.0 to 1.0), with 1.0 indicating exact substring match.
     """
-    # Fast path for exact substring
-    if subtext in basetext:
-        return 1.0
-    
-    # Otherwise find best matching segment
-    best_ratio = 0.0
-    subtext_len = len(subtext)
-    
-    # For very short subtexts, revert to general similarity
-    if subtext_len <= 3:
-        return SequenceMatcher(None, basetext, subtext).ratio()
-    
-    # Slide a window of subtext length through basetext
-    for i in range(len(basetext) - subtext_len + 1):
-        window = basetext[i:i+subtext_len]
-        ratio = SequenceMatcher(None, window, subtext).ratio()
-        best_ratio = max(best_ratio, ratio)
-    
-    return best_ratio
+    return textmatch.partial_ratio(basetext, subtext)
 
 def timeit(func):
     """Improved decorator that shows ClassName.method only when the call
-    truly originates from that class (instance or @classmethod)."""
+    truly originates from that class (instance or @classmethod).
+    Each call is also recorded as a tracing span."""
+    span_name  = func.__qualname__
     qual_parts = func.__qualname__.split(".")
     cls_name   = qual_parts[-2] if len(qual_parts) > 1 else None
     cls_obj    = None                     # resolved lazily
@@ -383,7 +349,8 @@ def timeit(func):
 
         start = time.time()
         try:
-            return func(*args, **kwargs)
+            with tracing.span(span_name):
+                return func(*args, **kwargs)
         finally:
             dur   = time.time() - start
             first = args[0] if args else None
@@ -0,0 +1,219 @@
+"""
+Lightweight, thread-aware span tracer.
+
+Spans are kept in a ring buffer and can be exported in the Chrome trace
+event format (open in chrome://tracing or https://ui.perfetto.dev).
+
+Usage:
+    with tracing.span("tick", tick=12):
+        client.smart_click_match(...)   # @timeit methods open child spans
+
+Work handed to another thread keeps its parent by wrapping the callable:
+    pool.submit(tracing.propagate(fn), *args)
+"""
+import os
+import threading
+import time
+import itertools
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import wraps
+from typing import Any, Callable, Dict, List, Optional
+
+
+# Runtime state
+_enabled = True
+_lock = threading.Lock()
+
+# Ring buffer of finished spans
+_MAX_SPANS = 20000
+_spans: deque['Span'] = deque(maxlen=_MAX_SPANS)
+
+_ids = itertools.count(1)
+_local = threading.local()
+_PID = os.getpid()
+_EPOCH_NS = time.perf_counter_ns()
+_EPOCH_WALL = time.time()
+
+
+@dataclass
+class Span:
+    """A single timed region of work on one thread."""
+    id: int
+    name: str
+    cat: str
+    tid: int
+    thread_name: str
+    start_ns: int
+    parent_id: Optional[int] = None
+    parent_tid: Optional[int] = None
+    end_ns: Optional[int] = None
+    args: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end_ns if self.end_ns is not None else time.perf_counter_ns()
+        return (end - self.start_ns) / 1e6
+
+
+def _stack() -> List[Span]:
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+def current() -> Optional[Span]:
+    """Returns the innermost open span of this thread (or the inherited parent)."""
+    stack = _stack()
+    if stack:
+        return stack[-1]
+    return getattr(_local, "inherited", None)
+
+
+@contextmanager
+def span(name: str, cat: str = "client", **args):
+    """
+    Open a span for the duration of the `with` block.
+    Parent is the innermost open span of this thread, or the span that was
+    current when the work was handed over via `propagate`.
+    """
+    if not _enabled:
+        yield None
+        return
+
+    parent = current()
+    thread = threading.current_thread()
+    sp = Span(
+        id=next(_ids),
+        name=name,
+        cat=cat,
+        tid=thread.ident,
+        thread_name=thread.name,
+        start_ns=time.perf_counter_ns(),
+        parent_id=parent.id if parent else None,
+        parent_tid=parent.tid if parent else None,
+        args=args,
+    )
+    stack = _stack()
+    stack.append(sp)
+    try:
+        yield sp
+    except BaseException as e:
+        sp.args["error"] = type(e).__name__
+        raise
+    finally:
+        sp.end_ns = time.perf_counter_ns()
+        stack.pop()
+        with _lock:
+            _spans.append(sp)
+
+
+def traced(name: str | None = None, cat: str = "client"):
+    """Decorator form of `span`; defaults to the function's qualified name."""
+    def deco(func):
+        label = name or func.__qualname__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(label, cat=cat):
+                return func(*args, **kwargs)
+        return wrapper
+    return deco
+
+
+def propagate(fn: Callable) -> Callable:
+    """
+    Bind the current span to `fn` so spans opened while it runs on a worker
+    thread are attributed to the submitting call.
+    """
+    parent = current()
+    if parent is None or not _enabled:
+        return fn
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        prev = getattr(_local, "inherited", None)
+        _local.inherited = parent
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _local.inherited = prev
+    return wrapper
+
+
+def enable() -> None:
+    global _enabled
+    _enabled = True
+
+
+def disable() -> None:
+    """Stop recording new spans; the buffer is kept until `clear()`."""
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def clear() -> None:
+    with _lock:
+        _spans.clear()
+
+
+def get_spans(seconds: float | None = None) -> List[Span]:
+    """Returns finished spans, optionally only those that ended in the last `seconds`."""
+    with _lock:
+        spans = list(_spans)
+    if seconds is not None:
+        cutoff = time.perf_counter_ns() - int(seconds * 1e9)
+        spans = [s for s in spans if s.end_ns >= cutoff]
+    return spans
+
+
+def _us(ns: int) -> float:
+    return (ns - _EPOCH_NS) / 1000.0
+
+
+def export_chrome(seconds: float | None = None) -> Dict[str, Any]:
+    """
+    Export recorded spans as a Chrome trace event document.
+
+    Each span becomes a complete ("X") event on its thread's track.
+    Spans whose parent lives on another thread get a flow arrow from the
+    parent's track so fan-out to worker threads stays readable.
+    """
+    spans = get_spans(seconds)
+    events: List[Dict[str, Any]] = []
+    threads: Dict[int, str] = {}
+
+    for s in spans:
+        threads[s.tid] = s.thread_name
+        events.append({
+            "name": s.name,
+            "cat": s.cat,
+            "ph": "X",
+            "pid": _PID,
+            "tid": s.tid,
+            "ts": _us(s.start_ns),
+            "dur": (s.end_ns - s.start_ns) / 1000.0,
+            "args": {"span_id": s.id, "parent_id": s.parent_id, **s.args},
+        })
+        if s.parent_tid is not None and s.parent_tid != s.tid:
+            flow = {"name": "handoff", "cat": "flow", "id": s.id, "pid": _PID}
+            events.append({**flow, "ph": "s", "tid": s.parent_tid, "ts": _us(s.start_ns)})
+            events.append({**flow, "ph": "f", "bp": "e", "tid": s.tid, "ts": _us(s.start_ns)})
+
+    for tid, tname in threads.items():
+        events.append({
+            "name": "thread_name", "ph": "M", "pid": _PID, "tid": tid,
+            "args": {"name": tname},
+        })
+
+    return {
+        "traceEvents": events,
+        "displayTimeUnit": "ms",
+        "otherData": {"epoch": _EPOCH_WALL, "span_count": len(spans)},
+    }
@@ -0,0 +1,137 @@
+"""
+Single-frame reader for the minimap orbs (health, prayer, run, special attack).
+
+All four value boxes come from the calibrated MinimapContext, so one capture
+answers every orb. Each box is digested first and only re-decoded when its
+pixels changed; decoding uses the fixed-font digit templates shared with the
+stack-count reader. Quick-prayer state is read from the same frame by
+comparing the prayer orb against the enabled/disabled templates at their
+known position.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple, TYPE_CHECKING
+
+import numpy as np
+from PIL import Image
+
+from core import ocr, templates
+from core.logger import get_logger
+from core.region_match import MatchResult
+from core.tools import find_subimage, timeit
+
+if TYPE_CHECKING:
+    from core.osrs_client import RuneLiteClient
+
+ORBS = ('health', 'prayer', 'run', 'spec')
+QUICK_PRAYER_ENABLED = 'data/ui/quick-prayer-enabled.png'
+QUICK_PRAYER_DISABLED = 'data/ui/quick-prayer-disabled.png'
+
+# orb numbers shade from green through yellow to red: bright red/green, little blue
+TEXT_MIN = 180
+TEXT_MAX_BLUE = 80
+SHADOW_MAX = 40
+# mean per-channel difference above which the quick-prayer location is searched again
+QUICK_PRAYER_RESEARCH = 40
+
+
+@dataclass(frozen=True)
+class Vitals:
+    health: Optional[int]
+    prayer: Optional[int]
+    run: Optional[int]
+    spec: Optional[int]
+    quick_prayer_active: Optional[bool]
+    timestamp: float
+
+
+def _text_mask(rgb: np.ndarray) -> np.ndarray:
+    rgb = rgb.astype(np.int16)
+    ink = (np.maximum(rgb[..., 0], rgb[..., 1]) >= TEXT_MIN) & (rgb[..., 2] <= TEXT_MAX_BLUE)
+    # orb numbers have a black drop shadow one pixel down-right
+    dark = rgb.max(axis=2) < SHADOW_MAX
+    shadowed = np.zeros_like(ink)
+    shadowed[:-1, :-1] = dark[1:, 1:] | ink[1:, 1:]
+    return ink & shadowed
+
+
+class VitalsSampler:
+    """Reads all minimap orb values of a RuneLiteClient from one frame."""
+
+    def __init__(self, client: 'RuneLiteClient'):
+        self.client = client
+        self.log = get_logger('VitalsSampler')
+        self._lock = threading.Lock()
+        self._roi_key = None
+        self._rois: Dict[str, MatchResult] = {}
+        # orb -> (digest of its value box, decoded value)
+        self._values: Dict[str, Tuple[int, Optional[int]]] = {}
+        self._qp_key = None
+        self._qp_box: Optional[Tuple[int, int, int, int]] = None
+        self.stats: Dict[str, int] = {'decoded': 0, 'reused': 0}
+
+    def _value_boxes(self) -> Dict[str, MatchResult]:
+        key = self.client.layout_version
+        if self._roi_key != key:
+            minimap = self.client.minimap
+            self._rois = {
+                orb: minimap.get_minimap_value_match(getattr(minimap, orb))
+                for orb in ORBS if getattr(minimap, orb, None) is not None
+            }
+            self._values.clear()
+            self._roi_key = key
+        return self._rois
+
+    def _read_orb(self, rgb: np.ndarray, orb: str, box: MatchResult) -> Optional[int]:
+        crop = rgb[max(0, box.start_y):box.end_y, max(0, box.start_x):box.end_x]
+        digest = hash(crop.tobytes())
+        cached = self._values.get(orb)
+        if cached is not None and cached[0] == digest:
+            self.stats['reused'] += 1
+            return cached[1]
+        value = ocr.read_number(_text_mask(crop))
+        self.stats['decoded'] += 1
+        self._values[orb] = (digest, value)
+        return value
+
+    def _quick_prayer(self, sc: Image.Image, rgb: np.ndarray) -> Optional[bool]:
+        enabled = templates.get(QUICK_PRAYER_ENABLED)
+        disabled = templates.get(QUICK_PRAYER_DISABLED)
+        if self._qp_key == self.client.layout_version and self._qp_box is not None:
+            x0, y0, x1, y1 = self._qp_box
+            crop = rgb[y0:y1, x0:x1].astype(np.int16)
+            if crop.shape[:2] == (enabled.height, enabled.width):
+                on = np.abs(crop - np.asarray(enabled.convert('RGB'), dtype=np.int16)).mean()
+                off = np.abs(crop - np.asarray(disabled.convert('RGB'), dtype=np.int16)).mean()
+                if min(on, off) <= QUICK_PRAYER_RESEARCH:
+                    return bool(on < off)
+
+        # first use (or the orb moved): full search, then remember where it is
+        on = find_subimage(sc, enabled, min_scale=1, max_scale=1)
+        off = find_subimage(sc, disabled, min_scale=1, max_scale=1)
+        best = on if on.confidence > off.confidence else off
+        self._qp_box = (best.start_x, best.start_y, best.start_x + enabled.width, best.start_y + enabled.height)
+        self._qp_key = self.client.layout_version
+        return on.confidence > off.confidence
+
+    @timeit
+    def sample(self, sc: Image.Image = None, quick_prayer: bool = True) -> Vitals:
+        """All four orb values (None where unreadable) and quick-prayer state from one frame."""
+        sc = sc or self.client.get_screenshot()
+        rgb = np.asarray(sc.convert('RGB') if sc.mode != 'RGB' else sc)
+        with self._lock:
+            values = {orb: self._read_orb(rgb, orb, box) for orb, box in self._value_boxes().items()}
+            qp = self._quick_prayer(sc, rgb) if quick_prayer else None
+        vitals = Vitals(
+            values.get('health'), values.get('prayer'), values.get('run'), values.get('spec'),
+            qp, time.time()
+        )
+        state = self.client.state
+        for orb in ORBS:
+            last = state.get(f'vitals.{orb}')
+            if last is None or last.value != values.get(orb):
+                state.publish(f'vitals.{orb}', values.get(orb))
+        return vitals
@@ -4,11 +4,14 @@ Provides window manipulation functionality across Windows, macOS, and Linux.
 """
 
 import sys
-from turtle import title
+import select
+import threading
 import pyautogui
 import time
 import keyboard
 import importlib
+from dataclasses import dataclass
+from typing import Callable, List, Optional
 from core.logger import get_logger
 
 # Platform detection
@@ -304,6 +307,15 @@ class MacWindow:
         except Exception:
             return False
 
+@dataclass(frozen=True)
+class WindowGeometry:
+    """Absolute window position and size, swapped as a single snapshot."""
+    left: int
+    top: int
+    width: int
+    height: int
+
+
 class LinuxWindowManager:
     """Linux-specific window management using Xlib"""
     
@@ -358,6 +370,143 @@ class LinuxWindow:
         self.display = display
         self.Xlib = Xlib  # Store Xlib module reference
         self.root = self.display.screen().root
+        # Populated by watch(); while set, geometry/focus reads make no X calls
+        self._geometry: Optional[WindowGeometry] = None
+        self._active: Optional[bool] = None
+        self._listeners: List[Callable[[WindowGeometry], None]] = []
+        self._watcher: Optional[threading.Thread] = None
+        self._stop_watch = threading.Event()
+
+    def watch(self, on_change: Callable[[WindowGeometry], None] | None = None) -> bool:
+        """
+        Track geometry and focus from X events instead of querying on every read.
+
+        Opens a second display connection (Xlib connections are not thread-safe),
+        selects ConfigureNotify/focus events on the window and _NET_ACTIVE_WINDOW
+        changes on the root, and keeps a cached WindowGeometry up to date.
+        `on_change` is called from the watcher thread with each geometry change
+        after the one read when watching starts.
+
+        Returns:
+            bool: False if events are unavailable; callers should fall back to polling.
+        """
+        if self._stop_watch.is_set() and self._watcher is not None:
+            # a stopped watcher can take one select timeout to exit
+            self._watcher.join(1.0)
+        if self.watching:
+            if on_change:
+                self._listeners.append(on_change)
+            return True
+        if not self.Xlib:
+            return False
+
+        try:
+            import Xlib.display
+            X = self.Xlib.X
+            conn = Xlib.display.Display(self.display.get_display_name())
+            win = conn.create_resource_object('window', self.window.id)
+            root = conn.screen().root
+            win.change_attributes(event_mask=X.StructureNotifyMask | X.FocusChangeMask)
+            root.change_attributes(event_mask=X.PropertyChangeMask)
+            net_active = conn.intern_atom('_NET_ACTIVE_WINDOW')
+            self._refresh_geometry(conn, win, root)
+            self._refresh_focus(conn)
+        except Exception as e:
+            log.warning(f"X11 event tracking unavailable, falling back to polling: {e}")
+            self._geometry = None
+            self._active = None
+            return False
+
+        # registered after the first refresh: the starting geometry is not a change
+        if on_change:
+            self._listeners.append(on_change)
+        self._stop_watch.clear()
+        self._watcher = threading.Thread(
+            target=self._watch_loop, args=(conn, win, root, net_active),
+            name='x11-watch', daemon=True
+        )
+        self._watcher.start()
+        return True
+
+    def stop_watching(self):
+        """Stop the watcher; reads go back to querying X directly."""
+        self._stop_watch.set()
+
+    @property
+    def watching(self) -> bool:
+        """True while the watcher thread is running."""
+        return self._watcher is not None and self._watcher.is_alive()
+
+    def _watch_loop(self, conn, win, root, net_active):
+        X = self.Xlib.X
+        try:
+            while not self._stop_watch.is_set():
+                if not conn.pending_events():
+                    # wake periodically to honour stop_watching()
+                    select.select([conn], [], [], 0.5)
+                    continue
+                event = conn.next_event()
+                if event.type == X.ConfigureNotify:
+                    # drain a burst (e.g. while dragging) into a single refresh
+                    while conn.pending_events():
+                        nxt = conn.next_event()
+                        if nxt.type != X.ConfigureNotify:
+                            self._handle_other(conn, nxt, net_active)
+                    self._refresh_geometry(conn, win, root)
+                elif event.type == X.DestroyNotify:
+                    log.warning("Tracked window was destroyed")
+                    break
+                else:
+                    self._handle_other(conn, event, net_active)
+        except Exception as e:
+            log.error(f"X11 watcher stopped: {e}")
+        finally:
+            self._geometry = None
+            self._active = None
+            self._watcher = None
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    def _handle_other(self, conn, event, net_active):
+        X = self.Xlib.X
+        if event.type in (X.FocusIn, X.FocusOut):
+            self._refresh_focus(conn)
+        elif event.type == X.PropertyNotify and event.atom == net_active:
+            self._refresh_focus(conn)
+
+    def _refresh_geometry(self, conn, win, root):
+        geom = win.get_geometry()
+        origin = root.translate_coords(win, 0, 0)
+        screen = conn.screen()
+        new = WindowGeometry(
+            left=max(0, min(screen.width_in_pixels - 1, origin.x)),
+            top=max(0, min(screen.height_in_pixels - 1, origin.y)),
+            width=geom.width,
+            height=geom.height,
+        )
+        if new == self._geometry:
+            return
+        self._geometry = new
+        for listener in list(self._listeners):
+            try:
+                listener(new)
+            except Exception as e:
+                log.error(f"Geometry listener failed: {e}")
+
+    def _refresh_focus(self, conn):
+        self._active = conn.get_input_focus().focus.id == self.window.id
+
+    @property
+    def focus_tracked(self) -> bool:
+        """True while focus changes are followed from X events."""
+        return self._active is not None
+
+    @property
+    def geometry(self) -> Optional[WindowGeometry]:
+        """Cached geometry snapshot while watched, otherwise None."""
+        return self._geometry
     
     @property
     def title(self):
@@ -367,6 +516,8 @@ class LinuxWindow:
     @property
     def width(self):
         """Return the width of the window"""
+        if self._geometry:
+            return self._geometry.width
         try:
             geom = self.window.get_geometry()
             return geom.width
@@ -377,6 +528,8 @@ class LinuxWindow:
     @property
     def height(self):
         """Return the height of the window"""
+        if self._geometry:
+            return self._geometry.height
         try:
             geom = self.window.get_geometry()
             return geom.height
@@ -387,6 +540,8 @@ class LinuxWindow:
     @property
     def left(self):
         """Return the left coordinate of the window"""
+        if self._geometry:
+            return self._geometry.left
         try:
             # Try translate_coords first
             x, y, _ = self.window.translate_coords(self.root, 0, 0)
@@ -398,6 +553,8 @@ class LinuxWindow:
     @property
     def top(self):
         """Return the top coordinate of the window"""
+        if self._geometry:
+            return self._geometry.top
         try:
             # Try translate_coords first
             x, y, _ = self.window.translate_coords(self.root, 0, 0)
@@ -459,6 +616,8 @@ class LinuxWindow:
     
     def _is_active(self):
         """Check if the window is active"""
+        if self._active is not None:
+            return self._active
         try:
             active_window_id = self.display.get_input_focus().focus.id
             return active_window_id == self.window.id
@@ -1,8 +1,7 @@
-from core.osrs_client import RuneLiteClient, ToolplaneTab
+from core.osrs_client import RuneLiteClient
 from core.item_db import ItemLookup
 from core import ocr
 from typing import List
-from core import tools
 import random
 import keyboard
 import threading
@@ -63,35 +62,14 @@ def listen_for_escape():
         time.sleep(0.1)
 
 def drop_items(items:List[str]):
-    client.click_toolplane(ToolplaneTab.INVENTORY)
-    sc = client.get_screenshot()
-    tp = client.sectors.toolplane
-    sc = tp.crop_in(sc)
-    matches: List[tools.MatchResult] = []
-    for item in items:
-        item_icon = db.get_item_by_name(item).icon
-        if not item_icon:
-            print(f"Item icon for '{item}' not found.")
-            continue
-        matches += tools.find_subimages(
-            sc, item_icon, min_confidence=.99
-        )
-    matches.sort(
-        key=lambda x: x.start_x, 
-        reverse=random.choice([True, False])
-    )
-    matches.sort(
-        key=lambda x: x.start_y, 
-        reverse=random.choice([True, False])
-    )
+    matches = client.get_inv_items(items, min_confidence=.99)
     keyboard.press('shift')
     try:
         for match in matches:
             client.click(
                 match, 
                 after_click_settle_chance=0,
-                rand_move_chance=0,
-                parent_sectors=[tp]
+                rand_move_chance=0
             )
     finally:
         keyboard.release('shift')
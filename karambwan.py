@@ -42,8 +42,7 @@ def main():
         
             
 def get_fish_cnt():
-    current = bot.client.toolplane.get_active_tab(bot.client.get_screenshot())
-    if current != ToolplaneTab.INVENTORY.value:
+    if bot.client.active_tab() != ToolplaneTab.INVENTORY.value:
         bot.client.click_toolplane(ToolplaneTab.INVENTORY)
         bot.client.move_off_window()
     return len(bot.client.get_inv_items(['Raw karambwan']))   
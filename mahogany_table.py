@@ -178,7 +178,8 @@ def chat_text_clicker(text,wait_msg,wait=.5,tries=8):
     for _ in range(tries):
         if terminate: break
         try:
-            time.sleep(wait)
+            # only look again once the chat box has actually changed
+            client.chat.wait_for_change(wait)
             client.click_chat_text(text)
             done = True
             break
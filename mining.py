@@ -130,8 +130,7 @@ def empty_coal_bag():
 def is_inventory_full():
     """Check if the inventory is full."""
     try:
-        full_match = client.find_chat_text('too full')
-        if full_match.confidence > 0.84:
+        if client.is_text_in_chat('too full', 0.84):
             print("Inventory is full.")
             return True
     except:
@@ -0,0 +1,80 @@
+"""
+Import-time budget check for lightweight core modules.
+
+Runs `python -X importtime -c "import <module>"` in a fresh interpreter for
+each budgeted module, and fails (exit code 1) when the cumulative import
+time goes over budget or a module drags in a dependency it shouldn't.
+
+    python standalone/import_budget.py
+    python standalone/import_budget.py --scale 2   # slower machine / CI
+"""
+import argparse
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# module -> cumulative import budget in milliseconds
+BUDGETS_MS = {
+    'core.tools': 600,
+    'core.item_db': 80,
+}
+
+# heavy or side-effecting modules that must not load as part of the import
+FORBIDDEN = {
+    'core.tools': ('pytesseract', 'websockets', 'flask', 'click', 'keyboard', 'pyautogui', 'mss'),
+    'core.item_db': ('PIL', 'cv2', 'numpy', 'pytesseract', 'websockets', 'flask', 'keyboard', 'pyautogui', 'mss'),
+}
+
+# "import time:      self [us] |  cumulative | imported package"
+_LINE = re.compile(r'import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+
+def measure(module: str) -> dict:
+    """Cumulative import time (us) of every module loaded by `import module`."""
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f'import {module} failed:\n{proc.stderr[-2000:]}')
+    times = {}
+    for line in proc.stderr.splitlines():
+        m = _LINE.match(line)
+        if m:
+            times[m.group(4)] = int(m.group(2))
+    return times
+
+
+def check(scale: float = 1.0) -> bool:
+    ok = True
+    for module, budget in BUDGETS_MS.items():
+        times = measure(module)
+        took_ms = times.get(module, 0) / 1000
+        limit = budget * scale
+        status = 'ok' if took_ms <= limit else 'OVER BUDGET'
+        print(f'{module:<16} {took_ms:8.1f} ms  (budget {limit:.0f} ms)  {status}')
+        if took_ms > limit:
+            ok = False
+            slowest = sorted(
+                ((t, name) for name, t in times.items() if name != module),
+                reverse=True,
+            )[:5]
+            for t, name in slowest:
+                print(f'    {name:<30} {t / 1000:8.1f} ms')
+
+        loaded = [name for name in FORBIDDEN.get(module, ()) if name in times]
+        if loaded:
+            ok = False
+            print(f'    imports forbidden dependencies: {", ".join(loaded)}')
+    return ok
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scale', type=float, default=1.0,
+                        help='multiply every budget (for slow machines)')
+    args = parser.parse_args()
+    sys.exit(0 if check(args.scale) else 1)
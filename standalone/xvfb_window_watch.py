@@ -0,0 +1,123 @@
+"""
+Headless check of the X11 window watcher (core.window_manager.LinuxWindow.watch).
+
+Starts an Xvfb server (or uses the current DISPLAY with --no-server), creates
+a bare X window and checks that:
+
+- watching starts without notifying the initial geometry,
+- a resize and a move are each reported with the new geometry,
+- watch() works again after stop_watching(),
+- destroying the window stops the watcher (`watching` goes False, which is
+  what makes GenericWindow.start_resize_watch fall back to polling).
+
+Exits with code 1 on the first failed check.
+
+    python standalone/xvfb_window_watch.py
+    python standalone/xvfb_window_watch.py --no-server   # DISPLAY already set
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+TITLE = 'RuneLite - watch-check'
+
+
+def wait_until(predicate, timeout: float = 2.0) -> bool:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return predicate()
+
+
+def check(ok: bool, what: str):
+    print(f"{'ok  ' if ok else 'FAIL'} {what}")
+    if not ok:
+        sys.exit(1)
+
+
+def run():
+    sys.path.insert(0, str(ROOT))
+    import Xlib
+    import Xlib.X
+    import Xlib.display
+    from core.window_manager import LinuxWindow, WindowGeometry
+
+    display = Xlib.display.Display()
+    root = display.screen().root
+    win = root.create_window(10, 20, 200, 150, 0, display.screen().root_depth)
+    win.set_wm_name(TITLE)
+    win.map()
+    display.sync()
+
+    window = LinuxWindow(win, TITLE, display, Xlib)
+    seen = []
+    changed = threading.Event()
+
+    def on_change(geometry: WindowGeometry):
+        seen.append(geometry)
+        changed.set()
+
+    check(window.watch(on_change), 'watch() starts')
+    check(window.watching, 'watcher thread running')
+    check(not changed.wait(0.5), 'no notification for the starting geometry')
+
+    win.configure(width=320, height=240)
+    display.sync()
+    check(changed.wait(2.0), 'resize is notified')
+    check(wait_until(lambda: window.geometry and window.geometry.width == 320), 'geometry follows the resize')
+
+    changed.clear()
+    win.configure(x=60, y=70)
+    display.sync()
+    check(changed.wait(2.0), 'move is notified')
+    check(wait_until(lambda: window.geometry and (window.geometry.left, window.geometry.top) == (60, 70)),
+          'geometry follows the move')
+
+    window.stop_watching()
+    check(wait_until(lambda: not window.watching), 'stop_watching() stops the thread')
+    changed.clear()
+    check(window.watch(on_change), 'watch() starts again after stop_watching()')
+    check(window.watching, 'watcher thread running again')
+    win.configure(width=400)
+    display.sync()
+    check(changed.wait(2.0), 'resize is notified after restarting')
+
+    win.destroy()
+    display.sync()
+    check(wait_until(lambda: not window.watching), 'destroying the window stops the watcher')
+    check(window.geometry is None, 'cached geometry dropped once unwatched')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--display', default=':99', help='display number for the Xvfb server')
+    parser.add_argument('--no-server', action='store_true', help='use the current DISPLAY')
+    args = parser.parse_args()
+
+    server = None
+    if not args.no_server:
+        if not shutil.which('Xvfb'):
+            print('Xvfb not found; install it or pass --no-server with DISPLAY set')
+            sys.exit(2)
+        server = subprocess.Popen(['Xvfb', args.display, '-screen', '0', '1024x768x24'],
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        os.environ['DISPLAY'] = args.display
+        time.sleep(0.5)
+    try:
+        run()
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -47,8 +47,7 @@ def count_open_slots() -> int:
     return OPEN_SLOTS - len(matches)
 
 def count_free_slots() -> int:
-    matches = client.get_inv_items(DROP+KEEP,min_confidence=.97)
-    return OPEN_SLOTS - len(matches)
+    return client.count_free_slots()
 
 def steal():
     """Steal from the stall."""